@@ -23,6 +23,13 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = models.Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+	"""Skip the columns and indexes created by the migrations that aren't mapped
+	in the models, the autogenerate would drop them."""
+	return not (reflected and compare_to is None and name in models.UNMAPPED_SCHEMA)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +60,7 @@ def run_migrations_offline() -> None:
 	context.configure(
 		url=url,
 		target_metadata=target_metadata,
+		include_object=include_object,
 		literal_binds=True,
 		dialect_opts={"paramstyle": "named"},
 	)
@@ -62,7 +70,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-	context.configure(connection=connection, target_metadata=target_metadata)
+	context.configure(
+		connection=connection,
+		target_metadata=target_metadata,
+		include_object=include_object,
+	)
 
 	with context.begin_transaction():
 		context.run_migrations()
@@ -0,0 +1,62 @@
+"""add tasks search vector
+
+The stored generated column rewrites the table (ACCESS EXCLUSIVE lock), the
+GIN index is built concurrently afterwards so it doesn't block the writes.
+
+Revision ID: 5c2b8f6a1d3e
+Revises: 304eabd534a4
+Create Date: 2026-10-17 10:12:31.482107
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2b8f6a1d3e"
+down_revision: str | Sequence[str] | None = "304eabd534a4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# The title weighs more (A) than the description (B) in the rank.
+	op.add_column(
+		"tasks",
+		sa.Column(
+			"search_vector",
+			postgresql.TSVECTOR(),
+			sa.Computed(
+				"setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+				"setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+				persisted=True,
+			),
+			nullable=True,
+		),
+	)
+	with op.get_context().autocommit_block():
+		op.create_index(
+			"ix_tasks_search_vector",
+			"tasks",
+			["search_vector"],
+			unique=False,
+			postgresql_using="gin",
+			postgresql_concurrently=True,
+			if_not_exists=True,
+		)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	with op.get_context().autocommit_block():
+		op.drop_index(
+			"ix_tasks_search_vector",
+			table_name="tasks",
+			postgresql_concurrently=True,
+			if_exists=True,
+		)
+	op.drop_column("tasks", "search_vector")
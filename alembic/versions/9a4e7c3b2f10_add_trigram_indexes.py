@@ -0,0 +1,53 @@
+"""add trigram indexes
+
+Revision ID: 9a4e7c3b2f10
+Revises: 5c2b8f6a1d3e
+Create Date: 2026-10-17 11:03:54.613298
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4e7c3b2f10"
+down_revision: str | Sequence[str] | None = "5c2b8f6a1d3e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGRAM_INDEXES = (
+	("tasks", "title"),
+	("tasks", "description"),
+	("task_list", "name"),
+)
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+	with op.get_context().autocommit_block():
+		for table, column in TRIGRAM_INDEXES:
+			op.create_index(
+				f"ix_{table}_{column}_trgm",
+				table,
+				[column],
+				unique=False,
+				postgresql_using="gin",
+				postgresql_ops={column: "gin_trgm_ops"},
+				postgresql_concurrently=True,
+				if_not_exists=True,
+			)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	# The pg_trgm extension is kept, other objects of the database may use it.
+	with op.get_context().autocommit_block():
+		for table, column in TRIGRAM_INDEXES:
+			op.drop_index(
+				f"ix_{table}_{column}_trgm",
+				table_name=table,
+				postgresql_concurrently=True,
+				if_exists=True,
+			)
@@ -0,0 +1,67 @@
+"""add composite indexes
+
+Revision ID: b7d1e4f9a2c6
+Revises: 9a4e7c3b2f10
+Create Date: 2026-10-17 12:20:41.208516
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d1e4f9a2c6"
+down_revision: str | Sequence[str] | None = "9a4e7c3b2f10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The access paths of the GraphQL layer, see models.models.Tasks.
+COMPOSITE_INDEXES = {
+	# Tasks of the lists (loaders, detach/move/delete of a list), in id order.
+	"ix_tasks_task_list_id_id": ["task_list_id", "id"],
+	# Tasks of a user by status, paginated by id.
+	"ix_tasks_user_status_id": ["user", "status", "id"],
+	# Tasks by status and priority, sorted by creation.
+	"ix_tasks_status_priority_created_at": ["status", "priority", "created_at"],
+}
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# CONCURRENTLY doesn't lock the writes of the table but can't run in a
+	# transaction.
+	with op.get_context().autocommit_block():
+		for name, columns in COMPOSITE_INDEXES.items():
+			op.create_index(
+				name,
+				"tasks",
+				columns,
+				unique=False,
+				postgresql_concurrently=True,
+				if_not_exists=True,
+			)
+		# ix_tasks_status is a prefix of ix_tasks_status_priority_created_at.
+		op.drop_index(
+			"ix_tasks_status",
+			table_name="tasks",
+			postgresql_concurrently=True,
+			if_exists=True,
+		)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	with op.get_context().autocommit_block():
+		op.create_index(
+			"ix_tasks_status",
+			"tasks",
+			["status"],
+			unique=False,
+			postgresql_concurrently=True,
+			if_not_exists=True,
+		)
+		for name in COMPOSITE_INDEXES:
+			op.drop_index(
+				name, table_name="tasks", postgresql_concurrently=True, if_exists=True
+			)
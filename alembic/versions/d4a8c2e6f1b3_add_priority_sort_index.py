@@ -0,0 +1,42 @@
+"""add priority sort index
+
+Revision ID: d4a8c2e6f1b3
+Revises: b7d1e4f9a2c6
+Create Date: 2026-10-17 13:42:08.775104
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8c2e6f1b3"
+down_revision: str | Sequence[str] | None = "b7d1e4f9a2c6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# The sort by priority of the lists, with the id as tiebreaker.
+	with op.get_context().autocommit_block():
+		op.create_index(
+			"ix_tasks_priority_id",
+			"tasks",
+			["priority", "id"],
+			unique=False,
+			postgresql_concurrently=True,
+			if_not_exists=True,
+		)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	with op.get_context().autocommit_block():
+		op.drop_index(
+			"ix_tasks_priority_id",
+			table_name="tasks",
+			postgresql_concurrently=True,
+			if_exists=True,
+		)
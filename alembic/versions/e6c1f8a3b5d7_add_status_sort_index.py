@@ -0,0 +1,42 @@
+"""add status sort index
+
+Revision ID: e6c1f8a3b5d7
+Revises: d4a8c2e6f1b3
+Create Date: 2026-10-17 16:21:37.402915
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6c1f8a3b5d7"
+down_revision: str | Sequence[str] | None = "d4a8c2e6f1b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+	"""Upgrade schema."""
+	# The sort by status of the lists, with the id as tiebreaker.
+	with op.get_context().autocommit_block():
+		op.create_index(
+			"ix_tasks_status_id",
+			"tasks",
+			["status", "id"],
+			unique=False,
+			postgresql_concurrently=True,
+			if_not_exists=True,
+		)
+
+
+def downgrade() -> None:
+	"""Downgrade schema."""
+	with op.get_context().autocommit_block():
+		op.drop_index(
+			"ix_tasks_status_id",
+			table_name="tasks",
+			postgresql_concurrently=True,
+			if_exists=True,
+		)
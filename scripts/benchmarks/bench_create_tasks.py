@@ -0,0 +1,73 @@
+"""Throughput of the single row path (``create_entity``) against the bulk path
+(``create_entities``) when creating tasks.
+
+It needs the database of the ``.env`` file with the migrations applied, the
+created tasks are deleted at the end.
+
+.. code-block:: bash
+
+	PYTHONPATH=src python scripts/benchmarks/bench_create_tasks.py --rows 5000
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from sqlalchemy import delete
+
+from models.models import Tasks
+from repository.tasks import tasks_repository
+from schema.tasks import Tasks as TaskSchema
+from utils.db.async_db_conf import sessionmanager
+
+TITLE_PREFIX = "bench-"
+
+
+def build_schemas(rows: int) -> list[TaskSchema]:
+	return [
+		TaskSchema(title=f"{TITLE_PREFIX}{number}", description="Benchmark task")
+		for number in range(rows)
+	]
+
+
+async def single_row(rows: int) -> float:
+	async with sessionmanager.async_session() as session:
+		start = perf_counter()
+		for entity_schema in build_schemas(rows):
+			await tasks_repository.create_entity(entity_schema=entity_schema, db=session)
+		return perf_counter() - start
+
+
+async def bulk(rows: int, chunk_size: int) -> float:
+	async with sessionmanager.async_session() as session:
+		start = perf_counter()
+		await tasks_repository.create_entities(
+			entity_schemas=build_schemas(rows), db=session, chunk_size=chunk_size
+		)
+		return perf_counter() - start
+
+
+async def clean() -> None:
+	async with sessionmanager.async_session() as session:
+		await session.execute(delete(Tasks).where(Tasks.title.startswith(TITLE_PREFIX)))
+		await session.commit()
+
+
+async def main(rows: int, chunk_size: int) -> None:
+	try:
+		for name, elapsed in (
+			("single row", await single_row(rows)),
+			(f"bulk (chunk {chunk_size})", await bulk(rows, chunk_size)),
+		):
+			print(f"{name:<20} {rows} rows in {elapsed:.3f}s, {rows / elapsed:,.0f} rows/s")
+	finally:
+		await clean()
+		await sessionmanager.async_close()
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--rows", type=int, default=1000)
+	parser.add_argument("--chunk-size", type=int, default=1000)
+	args = parser.parse_args()
+	asyncio.run(main(args.rows, args.chunk_size))
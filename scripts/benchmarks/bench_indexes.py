@@ -0,0 +1,141 @@
+"""Latency of the query shapes of the GraphQL layer before and after the
+composite indexes of the migration ``add composite indexes``.
+
+It needs the database of the ``.env`` file with the migrations applied. The
+dataset is seeded with a fixed random seed, so two runs with the same
+``--rows`` compare the same data, and deleted at the end. The "before" plans
+run in a transaction that drops the composite indexes and the sort indexes
+of ``add priority sort index`` and ``add status sort index`` (and recreates
+``ix_tasks_status``) and is rolled back, so it locks the ``tasks`` table
+while it runs: don't use it against a shared database.
+
+.. code-block:: bash
+
+	PYTHONPATH=src python scripts/benchmarks/bench_indexes.py --rows 100000
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime, timedelta
+from random import Random
+from statistics import median
+from uuid import uuid4
+
+from sqlalchemy import Select, delete, insert, select, text
+
+from models.models import TaskList, Tasks
+from schema.tasks import Priority, Status
+from utils.db.async_db_conf import sessionmanager
+
+TITLE_PREFIX = "bench-"
+
+COMPOSITE_INDEXES = (
+	"ix_tasks_task_list_id_id",
+	"ix_tasks_user_status_id",
+	"ix_tasks_status_priority_created_at",
+)
+# Added after the composite indexes, the "before" plans could use them too.
+SORT_INDEXES = ("ix_tasks_priority_id", "ix_tasks_status_id")
+
+
+async def seed_tasks(rows: int, lists: int, users: int, chunk_size: int = 5000) -> dict:
+	random = Random(rows)
+	list_ids = [uuid4() for _ in range(lists)]
+	user_ids = [uuid4() for _ in range(users)]
+	now = datetime.now(UTC)
+	async with sessionmanager.async_session() as session:
+		await session.execute(
+			insert(TaskList),
+			[
+				{"id": list_id, "name": f"{TITLE_PREFIX}{number}", "created_at": now}
+				for number, list_id in enumerate(list_ids)
+			],
+		)
+		for start in range(0, rows, chunk_size):
+			await session.execute(
+				insert(Tasks),
+				[
+					{
+						"title": f"{TITLE_PREFIX}{number}",
+						"description": "Benchmark task",
+						"status": random.choice(list(Status)),
+						"priority": random.choice(list(Priority)),
+						"user": random.choice(user_ids),
+						"task_list_id": random.choice(list_ids),
+						"created_at": now - timedelta(minutes=number),
+					}
+					for number in range(start, min(start + chunk_size, rows))
+				],
+			)
+		await session.commit()
+		await session.execute(text("ANALYZE tasks"))
+	return {"list_ids": list_ids, "user_id": user_ids[0]}
+
+
+def query_shapes(seeded: dict) -> dict[str, Select]:
+	"""The statements of the GraphQL layer for each access path."""
+	return {
+		# Tasks of a page of task_list (TaskLoader).
+		"tasks of 10 lists": select(Tasks).where(Tasks.task_list_id.in_(seeded["list_ids"][:10])),
+		# tasks(filter: user = ... and status = ...), first page by id.
+		"user + status by id": select(Tasks)
+		.where(Tasks.user == seeded["user_id"], Tasks.status == Status.ACTIVE)
+		.order_by(Tasks.id)
+		.limit(10),
+		# tasks_connection(filter: status and priority, sort: created_at).
+		"status + priority by date": select(Tasks)
+		.where(Tasks.status == Status.NEW, Tasks.priority == Priority.HIGH)
+		.order_by(Tasks.created_at.desc(), Tasks.id.desc())
+		.limit(10),
+	}
+
+
+async def execution_time(stmt: Select, indexed: bool, repeat: int) -> tuple[str, float]:
+	compiled = stmt.compile(
+		dialect=sessionmanager.engine.dialect,  # type: ignore
+		compile_kwargs={"literal_binds": True},
+	)
+	async with sessionmanager.async_session() as session:
+		if not indexed:
+			for name in (*COMPOSITE_INDEXES, *SORT_INDEXES):
+				await session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+			await session.execute(text("CREATE INDEX ix_tasks_status ON tasks (status)"))
+		timings = []
+		for _ in range(repeat):
+			result = await session.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}"))
+			(plan,) = result.scalar_one()
+			timings.append(plan["Execution Time"])
+		await session.rollback()
+	return plan["Plan"]["Node Type"], median(timings)
+
+
+async def clean() -> None:
+	async with sessionmanager.async_session() as session:
+		await session.execute(delete(Tasks).where(Tasks.title.startswith(TITLE_PREFIX)))
+		await session.execute(delete(TaskList).where(TaskList.name.startswith(TITLE_PREFIX)))
+		await session.commit()
+
+
+async def main(rows: int, lists: int, users: int, repeat: int) -> None:
+	try:
+		seeded = await seed_tasks(rows, lists, users)
+		for name, stmt in query_shapes(seeded).items():
+			before = await execution_time(stmt, False, repeat)
+			after = await execution_time(stmt, True, repeat)
+			print(
+				f"{name:<28} before {before[1]:>9,.2f}ms ({before[0]}),"
+				f" after {after[1]:>9,.2f}ms ({after[0]})"
+			)
+	finally:
+		await clean()
+		await sessionmanager.async_close()
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--rows", type=int, default=20000)
+	parser.add_argument("--lists", type=int, default=200)
+	parser.add_argument("--users", type=int, default=50)
+	parser.add_argument("--repeat", type=int, default=5, help="runs of each plan, the median is shown")
+	args = parser.parse_args()
+	asyncio.run(main(args.rows, args.lists, args.users, args.repeat))
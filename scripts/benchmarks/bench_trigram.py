@@ -0,0 +1,95 @@
+"""Plans of the ``like``/``ilike``/``similar`` filters with and without the
+pg_trgm indexes of the migration ``add trigram indexes``.
+
+It needs the database of the ``.env`` file with the migrations applied, the
+seeded tasks are deleted at the end. The plans without index disable the
+bitmap and index scans of the transaction, so the same query runs as a
+sequential scan.
+
+.. code-block:: bash
+
+	PYTHONPATH=src python scripts/benchmarks/bench_trigram.py --rows 50000
+"""
+
+import argparse
+import asyncio
+import json
+from random import choice, seed
+
+from sqlalchemy import delete, insert, select, text
+
+from models.models import Tasks
+from utils.db.async_db_conf import sessionmanager
+from utils.db.dynamic_filter import get_filters
+
+TITLE_PREFIX = "bench-"
+
+WORDS = ("database", "migration", "frontend", "invoice", "release", "backup", "login", "report")
+
+FILTERS = {
+	"like '%migr%'": [["title", "like", "%migr%"]],
+	"ilike '%INVOICE%'": [["description", "ilike", "%INVOICE%"]],
+	"similar 'relase'": [["title", "similar", "relase"]],
+}
+
+
+async def seed_tasks(rows: int, chunk_size: int = 5000) -> None:
+	seed(rows)
+	async with sessionmanager.async_session() as session:
+		for start in range(0, rows, chunk_size):
+			await session.execute(
+				insert(Tasks),
+				[
+					{
+						"title": f"{TITLE_PREFIX}{number} {choice(WORDS)} {choice(WORDS)}",
+						"description": f"{choice(WORDS)} {choice(WORDS)} {choice(WORDS)}",
+					}
+					for number in range(start, min(start + chunk_size, rows))
+				],
+			)
+		await session.commit()
+		await session.execute(text("ANALYZE tasks"))
+
+
+async def explain(filter_: list, indexed: bool) -> tuple[str, float]:
+	stmt = select(Tasks.id).where(*get_filters(json.dumps(filter_), Tasks))
+	compiled = stmt.compile(
+		dialect=sessionmanager.engine.dialect,  # type: ignore
+		compile_kwargs={"literal_binds": True},
+	)
+	async with sessionmanager.async_session() as session:
+		if not indexed:
+			await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+			await session.execute(text("SET LOCAL enable_indexscan = off"))
+		result = await session.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}"))
+		(plan,) = result.scalar_one()
+		await session.rollback()
+	node = plan["Plan"]
+	while node.get("Plans") and node["Node Type"] not in ("Seq Scan", "Bitmap Heap Scan"):
+		node = node["Plans"][0]
+	return node["Node Type"], plan["Execution Time"]
+
+
+async def clean() -> None:
+	async with sessionmanager.async_session() as session:
+		await session.execute(delete(Tasks).where(Tasks.title.startswith(TITLE_PREFIX)))
+		await session.commit()
+
+
+async def main(rows: int) -> None:
+	try:
+		await seed_tasks(rows)
+		for name, filter_ in FILTERS.items():
+			for label, indexed in (("trigram", True), ("no index", False)):
+				node_type, elapsed = await explain(filter_, indexed)
+				print(f"{name:<20} {label:<10} {node_type:<18} {elapsed:,.2f}ms")
+	finally:
+		await clean()
+		await sessionmanager.async_close()
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--rows", type=int, default=10000)
+	args = parser.parse_args()
+	asyncio.run(main(args.rows))
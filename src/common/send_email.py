@@ -1,3 +1,6 @@
+import asyncio
+from collections.abc import Iterable
+
 from fastapi_mail import MessageSchema, MessageType
 from pydantic import EmailStr
 
@@ -30,3 +33,26 @@ async def send_email_for_task(user: EmailStr, task: Tasks) -> None:
 	)
 	fm.config.SUPPRESS_SEND = 1
 	await fm.send_message(message=email_message)
+
+
+EMAIL_CONCURRENCY = 10
+
+
+async def send_emails_for_tasks(
+	emails: Iterable[tuple[EmailStr, Tasks]], concurrency: int = EMAIL_CONCURRENCY
+) -> None:
+	"""
+	Send the emails of many tasks, at most ``concurrency`` at the same time so a
+	bulk mutation doesn't open one SMTP connection per row.
+
+	Args:
+		emails (Iterable[tuple[EmailStr, Tasks]]): The recipient and the task of each email.
+		concurrency (int): Emails sent at the same time. Defaults to :data:`EMAIL_CONCURRENCY`.
+	"""
+	semaphore = asyncio.Semaphore(concurrency)
+
+	async def send(user: EmailStr, task: Tasks) -> None:
+		async with semaphore:
+			await send_email_for_task(user=user, task=task)
+
+	await asyncio.gather(*(send(user, task) for user, task in emails))
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import strawberry
@@ -11,8 +12,11 @@ from exception.handler_exception import CreateHandlerExceptions
 from routes.graphql_route import Mutation, Query
 from routes.user import router
 from schema.schemas import HealthCheck
+from utils.cache.redis_cache import listen_invalidations
+from utils.cache.redis_cache import settings as cache_settings
 from utils.dependencies.graphql_fastapi import get_context
 from utils.fastapi.observability.metrics import PrometheusMetrics
+from utils.graphql.extensions import ExplainExtension
 
 schema = strawberry.Schema(
 	query=Query,
@@ -20,6 +24,7 @@ schema = strawberry.Schema(
 	config=StrawberryConfig(auto_camel_case=False),
 	extensions=[
 		ParserCache(maxsize=5096),
+		ExplainExtension,
 	],
 )
 graphql_app = GraphQLRouter(
@@ -31,7 +36,13 @@ graphql_app = GraphQLRouter(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     instrumentator.expose(app=app, endpoint="/metrics")
+    # The local cache of the resolvers is invalidated by the other workers.
+    listener = None
+    if cache_settings.enabled and cache_settings.local_enabled:
+        listener = asyncio.create_task(listen_invalidations())
     yield
+    if listener is not None:
+        listener.cancel()
 
 
 # Create app
@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from uuid import UUID, uuid4
 
 from sqlalchemy import Enum as sql_enum
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.dialects.postgresql import TIMESTAMP, VARCHAR
 from sqlalchemy.dialects.postgresql import UUID as pg_uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -12,14 +12,44 @@ from utils.db.general import MixInNameTable
 
 from .base import Base
 
+# Created by the migrations but not mapped: the generated ``tasks.search_vector``
+# of the full-text search (see repository.search) and its GIN index.
+UNMAPPED_SCHEMA = frozenset(("search_vector", "ix_tasks_search_vector"))
+
+
+def trigram_index(table: str, column: str) -> Index:
+	"""pg_trgm GIN index, it serves ``like``/``ilike`` with any wildcard and the
+	``%`` similarity operator."""
+	return Index(
+		f"ix_{table}_{column}_trgm",
+		column,
+		postgresql_using="gin",
+		postgresql_ops={column: "gin_trgm_ops"},
+	)
+
 
 class Tasks(Base, MixInNameTable):
+	__table_args__ = (
+		# Tasks of the lists (loaders, detach/move/delete of a list).
+		Index("ix_tasks_task_list_id_id", "task_list_id", "id"),
+		# Tasks of a user by status, paginated by id.
+		Index("ix_tasks_user_status_id", "user", "status", "id"),
+		# Tasks by status and priority sorted by creation, it also serves the
+		# filters by status alone.
+		Index("ix_tasks_status_priority_created_at", "status", "priority", "created_at"),
+		# Sort by priority (see repository.tasks), the id is the tiebreaker.
+		Index("ix_tasks_priority_id", "priority", "id"),
+		# Sort by status, the leading status of the composite indexes isn't
+		# followed by the id.
+		Index("ix_tasks_status_id", "status", "id"),
+		trigram_index("tasks", "title"),
+		trigram_index("tasks", "description"),
+	)
+
 	id: Mapped[UUID] = mapped_column(
 		pg_uuid(as_uuid=True), primary_key=True, nullable=False, default=uuid4
 	)
-	status: Mapped[str] = mapped_column(
-		sql_enum(Status), index=True, nullable=False, unique=False
-	)
+	status: Mapped[str] = mapped_column(sql_enum(Status), nullable=False, unique=False)
 	priority: Mapped[int] = mapped_column(
 		sql_enum(Priority), nullable=False, unique=False
 	)
@@ -41,6 +71,8 @@ class Tasks(Base, MixInNameTable):
 
 
 class TaskList(Base, MixInNameTable):
+	__table_args__ = (trigram_index("task_list", "name"),)
+
 	id: Mapped[UUID] = mapped_column(
 		pg_uuid(as_uuid=True), primary_key=True, nullable=False, default=uuid4
 	)
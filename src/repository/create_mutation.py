@@ -1,13 +1,14 @@
-import asyncio
 from enum import Enum
 from typing import Any
 
 import strawberry
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 from strawberry.types import Info
 
-from common.send_email import send_email_for_task
+from common.send_email import send_email_for_task, send_emails_for_tasks
+from models.models import TaskList, Tasks
 from schema.grapql_schemas import (
 	ListTaskInput,
 	ListTaskType,
@@ -16,15 +17,23 @@ from schema.grapql_schemas import (
 	TasksType,
 )
 from schema.grapql_schemas import Tasks as TaskSchema
-from schema.tasks import ListTaskGQLCreation, ListTaskGQLResponse, TasksResponse
-from services.users import user_repository
+from schema.tasks import ListTaskGQLCreation, ListTaskGQLResponse
+from utils.cache.redis_cache import invalidate_cache
+from utils.db.count import count_provider
 from utils.db.crud.entity import GeneralCrudAsync
 from utils.exceptions import (
 	EntityAlreadyExistsError,
+	EntityDoesNotExistError,
+	InvalidParameter,
 )
 
+from .query import loaded_columns
 from .tasks import tasks_list_repository, tasks_repository
 
+BULK_LIMIT = 10_000
+
+tasks_adapter = TypeAdapter(list[TaskSchema])
+
 
 async def get_other_entity(
 	column: InstrumentedAttribute,  # type: ignore
@@ -60,6 +69,9 @@ async def tasks_lists_mutation(tasks_list: ListTaskInput, info: Info) -> ListTas
 	"""
 	Asynchronously creates a new tasks list entity in the database and returns the corresponding GraphQL type.
 
+	The tasks of the input are attached with one ``UPDATE tasks ... WHERE id IN (...)``,
+	whatever the number of tasks the mutation runs the same statements.
+
 	Args:
 		tasks_list (ListTaskInput): The input data for the tasks list to be created.
 		info (Info): GraphQL resolver info containing context, including the database session.
@@ -68,37 +80,45 @@ async def tasks_lists_mutation(tasks_list: ListTaskInput, info: Info) -> ListTas
 		ListTaskType: The created tasks list represented as a GraphQL type.
 
 	Raises:
+		EntityDoesNotExistError: If some of the tasks don't exist, the message has their ids.
 		ValidationError: If the input data does not conform to the expected schema.
 		Exception: For any database or repository errors during entity creation or refresh.
 	"""
 	session = info.context.db
 	entity = strawberry.asdict(tasks_list)
 	converted_data = {key: convert_enum(value) for key, value in entity.items()}
+	task_ids = list(dict.fromkeys(converted_data.pop("tasks", None) or ()))
 
-	# Simplified task retrieval - removed unnecessary loop
-	if converted_data.get("tasks"):
-		tasks = await asyncio.gather(
-			*(
-				tasks_repository.get_entity_by_id(
-					db=session, entity_id=task
-				)
-				for task in converted_data["tasks"]
-			)
-		)
-		converted_data["tasks"] = [
-			TasksResponse(**task_.__dict__) for task_ in tasks
-		]
-
-	entity_schema = ListTaskGQLCreation(**converted_data)
+	# The list and its tasks are written in one transaction: the INSERT of the
+	# list is only flushed and the tasks are attached with one UPDATE, the ids
+	# returned by it are the tasks that exist.
 	result = await tasks_list_repository.create_entity(
 		db=session,
-		entity_schema=entity_schema,
+		entity_schema=ListTaskGQLCreation(**converted_data),
+		commit=False,
 	)
-	await session.refresh(result, attribute_names=["tasks"])
-	tasks = [TaskGQLResponse.model_validate(t) for t in result.tasks]
-
-	# Create a new dict instead of modifying __dict__ directly
-	items_dict = {**result.__dict__, "tasks": tasks}
+	tasks = []
+	if task_ids:
+		tasks = await tasks_repository.update_entities(
+			{"task_list_id": result.id},
+			db=session,
+			filter=(Tasks.id.in_(task_ids),),  # type: ignore
+			commit=False,
+		)
+		found = {task.id for task in tasks}
+		if missing := [str(id) for id in task_ids if id not in found]:
+			await session.rollback()
+			raise EntityDoesNotExistError(
+				message=f"Tasks don't exist: {', '.join(missing)}"
+			)
+	items_dict = {
+		**loaded_columns(result),
+		"tasks": [TaskGQLResponse.model_validate(task) for task in tasks],
+	}
+	await session.commit()
+	count_provider.adjust(TaskList, 1)
+	info.context.loaders.clear_all()
+	await invalidate_cache("task_list", *(("tasks",) if tasks else ()))
 
 	return ListTaskType.from_pydantic(ListTaskGQLResponse(**items_dict))
 
@@ -129,20 +149,75 @@ async def tasks_mutation(tasks: TasksInput, info: Info) -> TasksType:
 		db=session,
 		entity_schema=entity_schema,
 	)
+	count_provider.adjust(Tasks, 1)
+	await invalidate_cache("tasks", "task_list")
 	if (_user := converted_data.get("user")) is not None and _user != str(result.user):
-		user = await user_repository.get_entity_by_id(
-			db=info.context.db, entity_id=str(converted_data["user"])
-		)
+		user = await info.context.loaders.user_by_id.load(_user)
+		if user is None:
+			raise EntityDoesNotExistError(message="Entity don't exist")
 		await send_email_for_task(user=str(user.email), task=result)
 	return TasksType.from_pydantic(TaskGQLResponse.model_validate(result))
 
 
+async def tasks_bulk_mutation(tasks: list[TasksInput], info: Info) -> list[TasksType]:
+	"""
+	Asynchronously creates many task entities with one multi-row insert per chunk and a single commit,
+	and sends an email notification to the users assigned to the tasks.
+
+	Args:
+		tasks (list[TasksInput]): The input data for the tasks to be created.
+		info (Info): The GraphQL resolver info containing context and database session.
+
+	Returns:
+		list[TasksType]: The created task entities as GraphQL types, in the same order as the input.
+
+	Raises:
+		InvalidParameter: If the batch is bigger than :data:`BULK_LIMIT`.
+		ValidationError: If any of the tasks does not conform to the TaskSchema, nothing is created.
+	"""
+	if len(tasks) > BULK_LIMIT:
+		raise InvalidParameter(f"Only {BULK_LIMIT} tasks can be created at once")
+	# The whole batch is validated at once before inserting anything.
+	entity_schemas = tasks_adapter.validate_python(
+		[
+			{key: convert_enum(value) for key, value in strawberry.asdict(task).items()}
+			for task in tasks
+		]
+	)
+	results = await tasks_repository.create_entities(
+		db=info.context.db,
+		entity_schemas=entity_schemas,
+	)
+	count_provider.adjust(Tasks, len(results))
+	await invalidate_cache("tasks", "task_list")
+	assigned = [result for result in results if result.user is not None]
+	if assigned:
+		users = await info.context.loaders.user_by_id.load_many(
+			[result.user for result in assigned]
+		)
+		await send_emails_for_tasks(
+			(str(user.email), result)
+			for user, result in zip(users, assigned, strict=True)
+			if user is not None
+		)
+	return [
+		TasksType.from_pydantic(TaskGQLResponse.model_validate(result))
+		for result in results
+	]
+
+
 @strawberry.type
 class CreateMutation:
 	@strawberry.mutation
 	async def create_tasks(self, tasks: TasksInput, info: Info) -> TasksType:
 		return await tasks_mutation(tasks=tasks, info=info)
 
+	@strawberry.mutation
+	async def create_tasks_bulk(
+		self, tasks: list[TasksInput], info: Info
+	) -> list[TasksType]:
+		return await tasks_bulk_mutation(tasks=tasks, info=info)
+
 	@strawberry.mutation
 	async def create_tasks_lists(
 		self, tasks_list: ListTaskInput, info: Info
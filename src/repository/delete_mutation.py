@@ -4,6 +4,16 @@ from uuid import UUID
 import strawberry
 from strawberry.types import Info
 
+from models.models import TaskList, Tasks
+from schema.grapql_schemas import BulkMutationResult, TasksActionGQLEnum, TasksType
+from schema.tasks import TaskGQLResponse
+from utils.cache.redis_cache import invalidate_cache
+from utils.db.count import count_provider
+from utils.db.dynamic_filter import get_filters
+from utils.db.filter_planner import filter_planner
+from utils.exceptions import EntityDoesNotExistError, InvalidParameter
+
+from .query import selected_columns, to_schema
 from .tasks import tasks_list_repository, tasks_repository
 
 
@@ -26,38 +36,124 @@ async def delete_task(id: Annotated[str, UUID], info: Info) -> None:
 		db=info.context.db,
 		filter=(),  # type: ignore
 	)
+	count_provider.adjust(Tasks, -1)
+	await invalidate_cache("tasks", "task_list")
 
 
-async def delete_task_list(id: Annotated[str, UUID], info: Info) -> None:
-	"""Asynchronously delete a tasks list entity in the database.
+async def delete_task_returning(id: Annotated[str, UUID], info: Info) -> TasksType:
+	"""Asynchronously delete a tasks entity and return it, only the fields
+	selected by the client are returned by the ``DELETE ... RETURNING``.
 
 	Args:
 		id (Annotated[str, UUID]): The id of the task to be deleted.
 		info (Info): GraphQL resolver info containing context, including the database session.
 
+	Returns:
+		TasksType: The deleted task.
+
+	Raises:
+		EntityDoesNotExistError: If the task doesn't exist.
+	"""
+	task = await tasks_repository.delete_entity(
+		id,
+		db=info.context.db,
+		filter=(),  # type: ignore
+		returning=selected_columns(info, ()) or list(Tasks.__table__.c.keys()),
+	)
+	count_provider.adjust(Tasks, -1)
+	await invalidate_cache("tasks", "task_list")
+	return TasksType.from_pydantic(to_schema(TaskGQLResponse, task))
+
+
+async def delete_task_list(
+	id: Annotated[str, UUID],
+	info: Info,
+	tasks_action: TasksActionGQLEnum = TasksActionGQLEnum.DETACH,
+	target_list_id: UUID | None = None,
+) -> None:
+	"""Asynchronously delete a tasks list entity in the database.
+
+	The tasks of the list are changed with one set-based statement in the same
+	transaction as the delete, the session is rolled back if the list doesn't exist:
+
+		- detach: ``UPDATE tasks SET task_list_id = NULL WHERE task_list_id = :id``
+		- delete: ``DELETE FROM tasks WHERE task_list_id = :id``
+		- move: ``UPDATE tasks SET task_list_id = :target_list_id WHERE task_list_id = :id``
+
+	Args:
+		id (Annotated[str, UUID]): The id of the task list to be deleted.
+		info (Info): GraphQL resolver info containing context, including the database session.
+		tasks_action (TasksActionGQLEnum): What to do with the tasks of the list. Defaults to detach.
+		target_list_id (UUID | None): Task list that receives the tasks, required to move them.
+
 	Returns:
 		None
 
 	Raises:
-		ValidationError: If the input data does not conform to the expected schema.
-		Exception: For any database or repository errors during entity creation or refresh.
+		InvalidParameter: If the tasks are moved without a target list, or to the deleted list.
+		EntityDoesNotExistError: If the task list or the target list doesn't exist.
 	"""
 	session = info.context.db
-	task_list = await tasks_list_repository.get_entity_by_id(entity_id=id, db=session)
-	if task_list.tasks:
-		await session.refresh(task_list, attribute_name=["tasks"])
-		[
-			await tasks_repository.update_entity(
-				entity_id=task.id,
-				db=session,
-				entity_schema={"task_list_id": None},
-			)
-			for task in task_list.tasks
-		]
-	await tasks_list_repository.delete_entity(
-		filter=(),  # type: ignore
-		entity_id=id,
-		db=session,
+	filter_ = (Tasks.task_list_id == id,)
+	try:
+		match tasks_action:
+			case TasksActionGQLEnum.DETACH:
+				await tasks_repository.update_entities(
+					{"task_list_id": None}, db=session, filter=filter_, commit=False
+				)
+			case TasksActionGQLEnum.DELETE:
+				deleted = await tasks_repository.delete_entities(
+					db=session, filter=filter_, commit=False
+				)
+			case TasksActionGQLEnum.MOVE:
+				if target_list_id is None:
+					raise InvalidParameter("target_list_id is required to move the tasks")
+				if str(target_list_id) == str(id):
+					raise InvalidParameter("The tasks can't be moved to the deleted task list")
+				await tasks_list_repository.get_entity_by_id(entity_id=target_list_id, db=session)
+				await tasks_repository.update_entities(
+					{"task_list_id": target_list_id}, db=session, filter=filter_, commit=False
+				)
+		await tasks_list_repository.delete_entity(
+			filter=(),  # type: ignore
+			entity_id=id,
+			db=session,
+		)
+	except EntityDoesNotExistError:
+		await session.rollback()
+		raise
+	count_provider.adjust(TaskList, -1)
+	if tasks_action is TasksActionGQLEnum.DELETE:
+		count_provider.adjust(Tasks, -len(deleted))
+	info.context.loaders.clear_all()
+	await invalidate_cache("task_list", "tasks")
+
+
+async def delete_tasks_where(filter: str, info: Info) -> BulkMutationResult:
+	"""Delete every task that matches the filter with one ``DELETE ... RETURNING``.
+
+	Args:
+		filter (str): Filter of the tasks to delete, see :func:`get_filters`.
+		info (Info): GraphQL resolver info containing context, including the database session.
+
+	Returns:
+		BulkMutationResult: Number and ids of the deleted tasks.
+
+	Raises:
+		InvalidParameter: If the filter is empty, it would delete every task, has a column that
+			doesn't exist or the filter planner rejects it.
+	"""
+	filter_ = get_filters(filter, Tasks, strict=True)
+	filter_planner.check(filter_)
+	results = await tasks_repository.delete_entities(
+		db=info.context.db,
+		filter=filter_,  # type: ignore
+	)
+	count_provider.adjust(Tasks, -len(results))
+	info.context.loaders.clear_all()
+	await invalidate_cache("tasks", "task_list")
+	return BulkMutationResult(
+		affected_rows=len(results), ids=[task.id for task in results]
 	)
 
 
@@ -68,5 +164,23 @@ class DeleteMutation:
 		await delete_task(id=id, info=info)
 
 	@strawberry.mutation
-	async def delete_task_list_mutation(self, id: Annotated[str, UUID], info: Info) -> None:
-		await delete_task_list(id=id, info=info)
+	async def delete_task_returning(
+		self, id: Annotated[str, UUID], info: Info
+	) -> TasksType:
+		return await delete_task_returning(id=id, info=info)
+
+	@strawberry.mutation
+	async def delete_task_list_mutation(
+		self,
+		id: Annotated[str, UUID],
+		info: Info,
+		tasks_action: TasksActionGQLEnum = TasksActionGQLEnum.DETACH,
+		target_list_id: UUID | None = None,
+	) -> None:
+		await delete_task_list(
+			id=id, info=info, tasks_action=tasks_action, target_list_id=target_list_id
+		)
+
+	@strawberry.mutation
+	async def delete_tasks_where(self, filter: str, info: Info) -> BulkMutationResult:
+		return await delete_tasks_where(filter=filter, info=info)
@@ -0,0 +1,73 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
+
+from models.models import Tasks, Users
+from services.users import user_repository
+
+from .tasks import tasks_repository
+
+
+def to_uuid(key: Any) -> UUID:
+	return key if isinstance(key, UUID) else UUID(str(key))
+
+
+class Loaders:
+	"""DataLoaders of one request, created by ``get_context`` and available as
+	``info.context.loaders``.
+
+	Every ``load`` done in the same tick of the event loop is deduplicated and
+	resolved with one ``WHERE id = ANY(:ids)``, and the result is cached for the
+	rest of the request. The keys can be ``UUID`` or ``str``.
+
+	Loaders:
+		- task_by_id: task id -> Tasks | None
+		- tasks_by_list_id: task list id -> list[Tasks]
+		- user_by_id: user id -> Users | None
+
+	.. code-block:: python
+
+		tasks = await info.context.loaders.task_by_id.load_many(ids)
+		user = await info.context.loaders.user_by_id.load(task.user)
+	"""
+
+	def __init__(self, db: AsyncSession) -> None:
+		self.db = db
+		self.task_by_id = DataLoader(load_fn=self.load_tasks, cache_key_fn=to_uuid)
+		self.tasks_by_list_id = DataLoader(
+			load_fn=self.load_tasks_by_list_id, cache_key_fn=to_uuid
+		)
+		self.user_by_id = DataLoader(load_fn=self.load_users, cache_key_fn=to_uuid)
+
+	def clear_all(self) -> None:
+		"""Forget the cached entities, used after a mutation changes them."""
+		self.task_by_id.clear_all()
+		self.tasks_by_list_id.clear_all()
+		self.user_by_id.clear_all()
+
+	async def load_tasks(self, keys: Sequence[Any]) -> list[Tasks | None]:
+		ids = [to_uuid(key) for key in keys]
+		tasks = await tasks_repository.get_entities_by_ids(ids, db=self.db)
+		by_id = {to_uuid(task.id): task for task in tasks}
+		return [by_id.get(id) for id in ids]
+
+	async def load_tasks_by_list_id(self, keys: Sequence[Any]) -> list[list[Tasks]]:
+		ids = [to_uuid(key) for key in keys]
+		tasks = await tasks_repository.get_entities_by_ids(
+			ids, db=self.db, column=Tasks.task_list_id
+		)
+		by_list: dict[UUID, list[Tasks]] = defaultdict(list)
+		for task in tasks:
+			by_list[to_uuid(task.task_list_id)].append(task)
+		self.task_by_id.prime_many({task.id: task for task in tasks})
+		return [by_list[id] for id in ids]
+
+	async def load_users(self, keys: Sequence[Any]) -> list[Users | None]:
+		ids = [to_uuid(key) for key in keys]
+		users = await user_repository.get_entities_by_ids(ids, db=self.db)
+		by_id = {to_uuid(user.id): user for user in users}
+		return [by_id.get(id) for id in ids]
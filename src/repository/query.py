@@ -1,22 +1,60 @@
+from collections.abc import Sequence
 from typing import Any
 
 import sqlalchemy as sa
 import strawberry
 from pydantic import BaseModel
-from sqlalchemy import lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.base import Base
 from models.models import TaskList, Tasks
-from schema.grapql_schemas import ListTaskType, TasksType
+from schema.grapql_schemas import (
+	CountModeGQLEnum,
+	ListTaskType,
+	PriorityGQLEnum,
+	StatusGQLEnum,
+	TaskFilter,
+	TaskListFilter,
+	TaskListSort,
+	TaskSort,
+	TaskStats,
+	TaskStatsBucket,
+	TaskStatsGroupGQLEnum,
+	TasksType,
+)
 from schema.tasks import (
 	ListTaskGQLResponse,
 	TaskGQLResponse,
 )
+from utils.cache.redis_cache import cache_resolver
+from utils.db.count import CountMode, count_provider
+from utils.db.cursor import encode_entity_cursor
 from utils.db.dynamic_filter import get_filters
+from utils.db.filter_planner import filter_planner
+from utils.db.sort import SortSpec
+from utils.exceptions import InvalidParameter
+from utils.graphql.filters import build_where
+from utils.graphql.selection import get_selected_fields
 
+from .search import search_tasks
 from .tasks import tasks_list_repository, tasks_repository
 
+COUNT_FIELDS = {"pagination_items", "total_items", "remaining_elements"}
+
+
+@strawberry.type
+class FacetBucket:
+	value: str = strawberry.field(description="Name of the value, like the GraphQL enum.")
+	count: int = strawberry.field(description="Items of the filtered dataset with this value.")
+
+
+@strawberry.type
+class Facet:
+	column: str = strawberry.field(description="Column of the facet.")
+	buckets: list[FacetBucket] = strawberry.field(
+		description="One bucket per value of the column, including the empty ones."
+	)
+
 
 @strawberry.type
 class PaginationWindow[T]:
@@ -32,40 +70,96 @@ class PaginationWindow[T]:
 	remaining_elements: int = strawberry.field(
 		description="Remaining elements in the db"
 	)
+	count_mode: CountModeGQLEnum = strawberry.field(
+		description="How total_items was calculated: exact, estimate or cached.",
+		default=CountModeGQLEnum.EXACT,
+	)
+	facets: list[Facet] | None = strawberry.field(
+		description="Counts of the filtered dataset by status, priority... only calculated when selected.",
+		default=None,
+	)
+
+
+@strawberry.type
+class PageInfo:
+	has_next_page: bool = strawberry.field(
+		description="If there are more items after the end cursor."
+	)
+	has_previous_page: bool = strawberry.field(
+		description="If there are more items before the start cursor."
+	)
+	start_cursor: str | None = strawberry.field(
+		description="Cursor of the first item in this window."
+	)
+	end_cursor: str | None = strawberry.field(
+		description="Cursor of the last item in this window."
+	)
+
+
+@strawberry.type
+class Edge[T]:
+	node: T = strawberry.field(description="The item of this edge.")
+	cursor: str = strawberry.field(
+		description="Opaque cursor to paginate from this item."
+	)
+
+
+@strawberry.type
+class Connection[T]:
+	edges: list[Edge[T]] = strawberry.field(
+		description="The list of edges in this pagination window."
+	)
+	page_info: PageInfo = strawberry.field(
+		description="Information to request the next or previous window."
+	)
 
 
 class Queries:
+	@cache_resolver(tags=("tasks",))
 	async def all_tasks(
 		self,
 		info: strawberry.Info,
 		limit: int,
 		filter: str = "",
+		where: TaskFilter | None = None,  # type: ignore
 		offset: int = 0,
 		order_by: str = "asc",
+		sort: list[TaskSort] | None = None,
+		count_mode: CountModeGQLEnum = CountModeGQLEnum.EXACT,
 	) -> PaginationWindow[TasksType]:
 		return await get_pagination_windows(
+			count_mode=CountMode(count_mode.value),
 			order_by=order_by,
+			sort=sort,
 			limit=limit,
 			offset=offset,
 			schema=TaskGQLResponse,  # type: ignore
 			model=tasks_repository,
 			filter=filter,
+			where=where,
 			model_db=Tasks,  # type: ignore
 			info=info,
 		)
 
+	@cache_resolver(tags=("task_list",))
 	async def all_tasks_list(
 		self,
 		info: strawberry.Info,
 		limit: int,
 		offset: int = 0,
 		filter: str = "",
+		where: TaskListFilter | None = None,  # type: ignore
 		order_by: str = "asc",
+		sort: list[TaskListSort] | None = None,
+		count_mode: CountModeGQLEnum = CountModeGQLEnum.EXACT,
 	) -> PaginationWindow[ListTaskType]:
 		return await get_pagination_windows_task_list(
+			count_mode=CountMode(count_mode.value),
 			model=tasks_list_repository,
 			filter=filter,
+			where=where,
 			order_by=order_by,
+			sort=sort,
 			limit=limit,
 			offset=offset,
 			schema=ListTaskGQLResponse,  # type: ignore
@@ -73,17 +167,223 @@ class Queries:
 			info=info,
 		)
 
+	async def all_tasks_connection(
+		self,
+		info: strawberry.Info,
+		limit: int,
+		filter: str = "",
+		where: TaskFilter | None = None,  # type: ignore
+		after: str | None = None,
+		before: str | None = None,
+		order_by: str = "asc",
+		sort: list[TaskSort] | None = None,
+	) -> Connection[TasksType]:
+		return await get_connection_window(
+			order_by=order_by,
+			sort=sort,
+			limit=limit,
+			after=after,
+			before=before,
+			schema=TaskGQLResponse,  # type: ignore
+			model=tasks_repository,
+			filter=filter,
+			where=where,
+			model_db=Tasks,  # type: ignore
+			info=info,
+		)
+
+	async def all_tasks_list_connection(
+		self,
+		info: strawberry.Info,
+		limit: int,
+		filter: str = "",
+		where: TaskListFilter | None = None,  # type: ignore
+		after: str | None = None,
+		before: str | None = None,
+		order_by: str = "asc",
+		sort: list[TaskListSort] | None = None,
+	) -> Connection[ListTaskType]:
+		return await get_connection_window_task_list(
+			order_by=order_by,
+			sort=sort,
+			limit=limit,
+			after=after,
+			before=before,
+			schema=ListTaskGQLResponse,  # type: ignore
+			model=tasks_list_repository,
+			filter=filter,
+			where=where,
+			model_db=TaskList,  # type: ignore
+			info=info,
+		)
+
+	async def search_tasks(
+		self,
+		info: strawberry.Info,
+		query: str,
+		limit: int,
+		filter: str = "",
+		where: TaskFilter | None = None,  # type: ignore
+		after: str | None = None,
+	) -> Connection[TasksType]:
+		return await get_search_window(
+			query=query,
+			limit=limit,
+			after=after,
+			filter=filter,
+			where=where,
+			info=info,
+		)
+
+	async def task_stats(
+		self,
+		info: strawberry.Info,
+		group_by: list[TaskStatsGroupGQLEnum],
+		filter: str = "",
+		where: TaskFilter | None = None,  # type: ignore
+	) -> TaskStats:
+		return await get_task_stats(
+			group_by=[group.value for group in group_by],
+			filter=filter,
+			where=where,
+			info=info,
+		)
+
+
+async def check_filters(
+	info: strawberry.Info, model_db: Base, filter_: Sequence[Any], limit: int | None
+) -> None:
+	"""Apply the policy of the filter planner to the filters of a query, in
+	explain mode the cost of the plan is added to the response extensions."""
+	filter_planner.check(filter_, limit=limit)
+	if filter_planner.explain:
+		statement = sa.select(model_db).where(*filter_).limit(limit)
+		cost = await filter_planner.explain_cost(info.context.db, statement)
+		info.context.explain.append({"field": info.field_name, **cost})
+
+
+def selected_columns(
+	info: strawberry.Info, path: Sequence[str], nested: Sequence[str] = ()
+) -> list[str] | None:
+	"""Names of the fields selected by the client in the given path, used to
+	load only those columns. The fields of the nested relationships are
+	returned as ``relationship.field``. When the selection can't be read every
+	column is loaded (None)."""
+	fields = get_selected_fields(info, path)
+	if not fields:
+		return None
+	columns = sorted(fields)
+	for relationship in nested:
+		if relationship in fields:
+			nested_fields = get_selected_fields(info, (*path, relationship))
+			columns += [f"{relationship}.{field}" for field in sorted(nested_fields)]
+	return columns
+
+
+def is_projected(entity: Any) -> bool:
+	"""If the entity was loaded with only part of its columns."""
+	state = sa.inspect(entity)
+	return not state.unloaded.isdisjoint(state.mapper.column_attrs.keys())
+
+
+def loaded_columns(entity: Any) -> dict[str, Any]:
+	"""Values of the columns loaded in the entity, without the relationships."""
+	state = sa.inspect(entity)
+	return {
+		key: state.dict[key]
+		for key in state.mapper.column_attrs.keys()
+		if key in state.dict
+	}
+
+
+def to_schema(schema: BaseModel, entity: Any) -> Any:
+	"""Convert the entity to the schema. A projected entity is built without
+	validation from the loaded columns, reading the others would be a lazy load."""
+	if not is_projected(entity):
+		return schema.model_validate(entity)
+	return schema.model_construct(**loaded_columns(entity))
+
+
+def selects_tasks(info: strawberry.Info, path: Sequence[str]) -> bool:
+	"""If the client selected the tasks of the task lists found in the path,
+	when the selection can't be read the tasks are loaded."""
+	fields = get_selected_fields(info, path)
+	return not fields or "tasks" in fields
+
+
+def selects_facets(info: strawberry.Info) -> bool:
+	"""If the client selected the facets of the pagination window, unlike the
+	counts they are only calculated when the selection asks for them."""
+	return "facets" in get_selected_fields(info)
+
+
+async def get_facets(
+	info: strawberry.Info, model: Any, filter_: Sequence[Any]
+) -> list[Facet] | None:
+	"""Facets of the repository for the filters of the page, in the same
+	session (and transaction) of the page."""
+	if not model.facets or not selects_facets(info):
+		return None
+	facets = await model.get_entity_facets(
+		info.context.db, columns=model.facets, filter=filter_
+	)
+	return [
+		Facet(
+			column=column,
+			buckets=[FacetBucket(value=value.name, count=count) for value, count in buckets],
+		)
+		for column, buckets in facets.items()
+	]
+
+
+def selects_counts(info: strawberry.Info) -> bool:
+	"""If the client selected any of the counts of the pagination window, when
+	the selection can't be read the counts are calculated."""
+	fields = get_selected_fields(info)
+	return not fields or not fields.isdisjoint(COUNT_FIELDS)
 
-async def get_count(db: AsyncSession, model_db: Base) -> int:
-	id_column = sa.literal_column("id")  # type: ignore
 
-	stmt_count = lambda_stmt(
-		lambda: sa.select(sa.func.count(id_column)),
+async def get_total_items(
+	session: AsyncSession,
+	model_db: Base,
+	count_mode: CountMode,
+	total_items: int | None,
+) -> int:
+	"""Return the total of the table, the exact total comes already from the
+	page statement and it's used to refresh the cached count."""
+	if count_mode is CountMode.EXACT and total_items is not None:
+		count_provider.store(model_db, total_items)
+		return total_items
+	return await count_provider.count(session, model_db, count_mode)
+
+
+def build_pagination_window(
+	items: list[Any],
+	offset: int,
+	pagination_items: int | None,
+	total_items: int | None,
+	count_mode: CountMode = CountMode.EXACT,
+	facets: list[Facet] | None = None,
+) -> PaginationWindow:  # type: ignore
+	"""Build the pagination window, the counts are None when the client
+	didn't select them so they are never serialized."""
+	if pagination_items is None or total_items is None:
+		return PaginationWindow(
+			items=items,
+			pagination_items=0,
+			total_items=0,
+			remaining_elements=0,
+			facets=facets,
+		)
+	remaining_elements = max(pagination_items - offset - len(items), 0)
+	return PaginationWindow(
+		items=items,
+		pagination_items=pagination_items,
+		total_items=total_items,
+		remaining_elements=remaining_elements,
+		count_mode=CountModeGQLEnum(count_mode.value),
+		facets=facets,
 	)
-	stmt_count += lambda s: (s.select_from(model_db))
-	result = await db.execute(stmt_count)
-	count_result = result.scalars().all()
-	return count_result[0]  # type: ignore
 
 
 async def get_pagination_windows(
@@ -94,36 +394,52 @@ async def get_pagination_windows(
 	model_db: Base,
 	return_type: Any | None = None,
 	filter: str = "",
+	where: Any = None,
 	offset: int = 0,
 	order_by: str = "asc",
+	sort: Sequence[Any] | None = None,
+	count_mode: CountMode = CountMode.EXACT,
 ) -> PaginationWindow:  # type: ignore
 	"""
 	Get one pagination window on the given dataset for the given limit
 	and offset, ordered by the given attribute and filtered using the
-	given filters
+	given filters, the JSON ``filter`` and the typed ``where`` are combined
+	with AND. The ``sort`` keys replace ``order_by`` (the direction of the id).
 	"""
-	total_items = 0
-
 	if limit <= 0 or limit > 100:
 		raise Exception(f"limit ({limit}) must be between 0-100")
-	filter_ = get_filters(filter, model_db)
+	filter_ = (*get_filters(filter, model_db), *build_where(where, model_db))
 	session: AsyncSession = info.context.db
-	items, _ = await model.get_entity_pagination(
-		filter=filter_, db=session, limit=limit, offset=offset, order_by=order_by
+	await check_filters(info, model_db, filter_, limit)
+	with_counts = selects_counts(info)
+	items, pagination_items, total_items = await model.get_entity_pagination(
+		filter=filter_,
+		db=session,
+		limit=limit,
+		offset=offset,
+		order_by=to_sort_specs(sort) or order_by,
+		with_counts=with_counts,
+		with_total=count_mode is CountMode.EXACT,
+		columns=selected_columns(info, ("items",)),
 	)
-	items = [schema.model_validate(item) for item in items]
-	total_items = await get_count(session, model_db)
-
-	total_items_count = len(items)
-	remaining_elements = total_items - offset - total_items_count
-	return PaginationWindow(
-		items=items,
-		pagination_items=total_items_count,
-		total_items=total_items,
-		remaining_elements=remaining_elements,
+	items = [to_schema(schema, item) for item in items]
+	if with_counts:
+		total_items = await get_total_items(session, model_db, count_mode, total_items)
+	facets = await get_facets(info, model, filter_)
+	return build_pagination_window(
+		items, offset, pagination_items, total_items, count_mode, facets
 	)
 
 
+def to_sort_specs(sort: Sequence[Any] | None) -> list[SortSpec]:
+	"""Convert the ``TaskSort``/``TaskListSort`` inputs to the sort specs of the
+	repository, the columns are checked against its sortable columns."""
+	return [
+		SortSpec(key.column.value, key.direction.value, key.nulls.value if key.nulls else None)
+		for key in sort or ()
+	]
+
+
 def capitalize_enum_name(name: str) -> str:
 	return " ".join(name.capitalize().split("_")) if "_" in name else name.capitalize()
 
@@ -136,48 +452,247 @@ async def get_pagination_windows_task_list(
 	model_db: Base,
 	return_type: Any | None = None,
 	filter: str = "",
+	where: Any = None,
 	offset: int = 0,
 	order_by: str = "asc",
+	sort: Sequence[Any] | None = None,
+	count_mode: CountMode = CountMode.EXACT,
 ) -> PaginationWindow:  # type: ignore
 	"""
 	Get one pagination window on the given dataset for the given limit
 	and offset, ordered by the given attribute and filtered using the
-	given filters
+	given filters, the JSON ``filter`` and the typed ``where`` are combined
+	with AND. The ``sort`` keys replace ``order_by`` (the direction of the id).
 	"""
-	total_items = 0
-
 	if limit <= 0 or limit > 100:
 		raise Exception(f"limit ({limit}) must be between 0-100")
-	filter_ = get_filters(filter, model_db)
+	filter_ = (*get_filters(filter, model_db), *build_where(where, model_db))
 	session: AsyncSession = info.context.db
-	kwargs = {}
-	kwargs["join"] = lambda s: s.join(Tasks)
-	items, _ = await model.get_entity_pagination(
+	await check_filters(info, model_db, filter_, limit)
+	with_counts = selects_counts(info)
+	with_tasks = selects_tasks(info, ("items",))
+	items, pagination_items, total_items = await model.get_entity_pagination(
 		filter=filter_,
 		db=session,
 		limit=limit,
 		offset=offset,
-		order_by=order_by,
-		**kwargs,
+		order_by=to_sort_specs(sort) or order_by,
+		with_counts=with_counts,
+		with_total=count_mode is CountMode.EXACT,
+		load={"tasks": "selectin"} if with_tasks else None,
+		columns=selected_columns(info, ("items",), nested=("tasks",)),
+	)
+	items = get_task_list_items(info, items, schema, with_tasks)
+	if with_counts:
+		total_items = await get_total_items(session, model_db, count_mode, total_items)
+	facets = await get_facets(info, model, filter_)
+	return build_pagination_window(
+		items, offset, pagination_items, total_items, count_mode, facets
 	)
-	tasks = []
-	new_items = []
 
-	for item in items:
-		await session.refresh(item, attribute_names=["tasks"])
-		tasks = [TaskGQLResponse.model_validate(t) for t in item.tasks]
-		items_dict = item.__dict__
-		items_dict["tasks"] = tasks
-		new_items.append(schema.model_construct(**items_dict))
-	items = new_items
 
-	total_items = await get_count(session, model_db)
+def get_task_list_items(
+	info: strawberry.Info, items: Any, schema: BaseModel, with_tasks: bool = True
+) -> list[Any]:
+	"""Convert the task lists to the schema, the tasks of each list must be
+	loaded with the page (``load={"tasks": "selectin"}``) unless ``with_tasks``
+	is False. The tasks loaded with every column are primed in the DataLoaders
+	of the request."""
+	tasks = [task for item in items for task in item.tasks] if with_tasks else []
+	if with_tasks and not any(is_projected(task) for task in tasks):
+		loaders = info.context.loaders
+		loaders.tasks_by_list_id.prime_many({item.id: item.tasks for item in items})
+		loaders.task_by_id.prime_many({task.id: task for task in tasks})
+	return [
+		schema.model_construct(
+			**loaded_columns(item),
+			tasks=[to_schema(TaskGQLResponse, t) for t in item.tasks]
+			if with_tasks
+			else [],
+		)
+		for item in items
+	]
 
-	total_items_count = len(items)
-	remaining_elements = total_items - offset - total_items_count
-	return PaginationWindow(
-		items=items,
-		pagination_items=total_items_count,
-		total_items=total_items,
-		remaining_elements=remaining_elements,
+
+def build_connection(
+	model: Any,
+	entities: Any,
+	items: list[Any],
+	has_more: bool,
+	after: str | None = None,
+	before: str | None = None,
+	order_by: str | Sequence[SortSpec] = "asc",
+) -> Connection:  # type: ignore
+	"""Build the Relay connection of one keyset window, the cursors are created
+	from the sort key of the entities."""
+	columns = model.keyset_columns(order_by=order_by)
+	edges = [
+		Edge(node=item, cursor=encode_entity_cursor(columns, entity))
+		for entity, item in zip(entities, items, strict=True)
+	]
+	if before is not None:
+		has_next_page, has_previous_page = True, has_more
+	else:
+		has_next_page, has_previous_page = has_more, after is not None
+	return Connection(
+		edges=edges,
+		page_info=PageInfo(
+			has_next_page=has_next_page,
+			has_previous_page=has_previous_page,
+			start_cursor=edges[0].cursor if edges else None,
+			end_cursor=edges[-1].cursor if edges else None,
+		),
+	)
+
+
+async def get_connection_window(
+	info: strawberry.Info,
+	model: Any,
+	schema: BaseModel,
+	limit: int,
+	model_db: Base,
+	filter: str = "",
+	where: Any = None,
+	after: str | None = None,
+	before: str | None = None,
+	order_by: str = "asc",
+	sort: Sequence[Any] | None = None,
+) -> Connection:  # type: ignore
+	"""
+	Get one keyset (cursor) window on the given dataset for the given limit,
+	starting after or before the given cursor, ordered by the given attribute
+	and filtered using the given filters, the JSON ``filter`` and the typed
+	``where`` are combined with AND. The ``sort`` keys replace ``order_by``
+	(the direction of the id), the cursors are only valid for the same sort.
+	"""
+	if limit <= 0 or limit > 100:
+		raise Exception(f"limit ({limit}) must be between 0-100")
+	filter_ = (*get_filters(filter, model_db), *build_where(where, model_db))
+	session: AsyncSession = info.context.db
+	await check_filters(info, model_db, filter_, limit)
+	entities, has_more = await model.get_entity_keyset(
+		filter=filter_,
+		db=session,
+		limit=limit,
+		order_by=to_sort_specs(sort) or order_by,
+		after=after,
+		before=before,
+		columns=selected_columns(info, ("edges", "node")),
+	)
+	items = [to_schema(schema, entity) for entity in entities]
+	return build_connection(
+		model, entities, items, has_more, after, before, to_sort_specs(sort) or order_by
+	)
+
+
+async def get_connection_window_task_list(
+	info: strawberry.Info,
+	model: Any,
+	schema: BaseModel,
+	limit: int,
+	model_db: Base,
+	filter: str = "",
+	where: Any = None,
+	after: str | None = None,
+	before: str | None = None,
+	order_by: str = "asc",
+	sort: Sequence[Any] | None = None,
+) -> Connection:  # type: ignore
+	"""
+	Get one keyset (cursor) window on the given dataset for the given limit,
+	starting after or before the given cursor, ordered by the given attribute
+	and filtered using the given filters, the JSON ``filter`` and the typed
+	``where`` are combined with AND. The ``sort`` keys replace ``order_by``
+	(the direction of the id), the cursors are only valid for the same sort.
+	"""
+	if limit <= 0 or limit > 100:
+		raise Exception(f"limit ({limit}) must be between 0-100")
+	filter_ = (*get_filters(filter, model_db), *build_where(where, model_db))
+	session: AsyncSession = info.context.db
+	await check_filters(info, model_db, filter_, limit)
+	with_tasks = selects_tasks(info, ("edges", "node"))
+	entities, has_more = await model.get_entity_keyset(
+		filter=filter_,
+		db=session,
+		limit=limit,
+		order_by=to_sort_specs(sort) or order_by,
+		after=after,
+		before=before,
+		load={"tasks": "selectin"} if with_tasks else None,
+		columns=selected_columns(info, ("edges", "node"), nested=("tasks",)),
+	)
+	items = get_task_list_items(info, entities, schema, with_tasks)
+	return build_connection(
+		model, entities, items, has_more, after, before, to_sort_specs(sort) or order_by
 	)
+
+
+async def get_search_window(
+	info: strawberry.Info,
+	query: str,
+	limit: int,
+	filter: str = "",
+	where: Any = None,
+	after: str | None = None,
+) -> Connection:  # type: ignore
+	"""
+	Get one window of the full-text search of the tasks, ranked by relevance and
+	paginated with the cursor ``after``, the JSON ``filter`` and the typed
+	``where`` are combined with the search.
+	"""
+	if limit <= 0 or limit > 100:
+		raise Exception(f"limit ({limit}) must be between 0-100")
+	if not query.strip():
+		raise InvalidParameter("The search query can't be empty")
+	filter_ = (*get_filters(filter, Tasks), *build_where(where, Tasks))
+	await check_filters(info, Tasks, filter_, limit)  # type: ignore
+	tasks, has_more = await search_tasks(
+		info.context.db,
+		query,
+		limit=limit,
+		filter=filter_,
+		after=after,
+		columns=selected_columns(info, ("edges", "node")),
+	)
+	edges = [
+		Edge(node=to_schema(TaskGQLResponse, task), cursor=cursor)  # type: ignore
+		for task, cursor in tasks
+	]
+	return Connection(
+		edges=edges,
+		page_info=PageInfo(
+			has_next_page=has_more,
+			has_previous_page=after is not None,
+			start_cursor=edges[0].cursor if edges else None,
+			end_cursor=edges[-1].cursor if edges else None,
+		),
+	)
+
+
+async def get_task_stats(
+	info: strawberry.Info,
+	group_by: Sequence[str],
+	filter: str = "",
+	where: Any = None,
+) -> TaskStats:
+	"""
+	Count the tasks that match the filters grouped by the given columns with
+	one ``GROUP BY`` statement, the JSON ``filter`` and the typed ``where`` are
+	combined with AND.
+	"""
+	filter_ = (*get_filters(filter, Tasks), *build_where(where, Tasks))
+	await check_filters(info, Tasks, filter_, None)  # type: ignore
+	counts = await tasks_repository.get_entity_counts(
+		info.context.db, group_by=group_by, filter=filter_
+	)
+	buckets = [to_stats_bucket(values, count) for values, count in counts]
+	return TaskStats(buckets=buckets, total=sum(bucket.count for bucket in buckets))
+
+
+def to_stats_bucket(values: dict[str, Any], count: int) -> TaskStatsBucket:
+	"""The enums of the columns are converted to the GraphQL enums."""
+	if (status := values.get("status")) is not None:
+		values["status"] = StatusGQLEnum(status.value)
+	if (priority := values.get("priority")) is not None:
+		values["priority"] = PriorityGQLEnum(priority.value)
+	return TaskStatsBucket(**values, count=count)
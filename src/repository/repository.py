@@ -1,28 +1,190 @@
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from typing import Any, Literal, TypeVar, override
 
-from sqlalchemy import delete, func, lambda_stmt, select, update
+from sqlalchemy import (
+	ColumnElement,
+	and_,
+	any_,
+	bindparam,
+	delete,
+	func,
+	insert,
+	lambda_stmt,
+	literal,
+	or_,
+	select,
+	tuple_,
+	update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, load_only, selectinload
+from sqlalchemy.sql.base import ExecutableOption
 
 from utils.db.crud.entity import GeneralCrudAsync
-from utils.exceptions import EntityDoesNotExistError
+from utils.db.cursor import decode_cursor
+from utils.db.sort import Direction, SortKey, SortSpec, resolve_sort
+from utils.exceptions import EntityDoesNotExistError, InvalidParameter
 
 T = TypeVar("T")
 
+EagerLoad = Mapping[str, Literal["selectin", "joined"]]
+
+EAGER_LOADERS = {"selectin": selectinload, "joined": joinedload}
+
+
+def projection(model: Any, columns: Sequence[str]) -> list[InstrumentedAttribute[Any]]:
+	"""Column attributes of the model among the given names, the primary and
+	foreign keys are always included so the identity and the relationships of
+	the entities can be resolved. Names that aren't columns are ignored.
+
+	Args:
+		model (Any): SQLAlchemy model.
+		columns (Sequence[str]): Names of the columns to load.
+
+	Returns:
+		list[InstrumentedAttribute[Any]]: Attributes for ``load_only(...)``.
+	"""
+	attributes = []
+	for attribute in model.__mapper__.column_attrs:
+		is_key = any(c.primary_key or c.foreign_keys for c in attribute.columns)
+		if is_key or attribute.key in columns:
+			attributes.append(getattr(model, attribute.key))
+	return attributes
+
+
+def eager_options(
+	model: Any, load: EagerLoad | None, columns: Sequence[str] | None = None
+) -> list[ExecutableOption]:
+	"""Convert a declarative mapping ``{relationship: strategy}`` to the loader
+	options of SQLAlchemy.
+
+	``selectin`` loads the relationship of every row of the page with one extra
+	``SELECT ... WHERE fk IN (...)``, ``joined`` uses a ``LEFT OUTER JOIN`` in the
+	same statement (the page is wrapped in a subquery so the ``LIMIT`` is applied
+	to the parents, not to the joined rows).
+
+	The columns select only part of the row (``load_only``), the names without a
+	dot are columns of the model and ``relationship.column`` are columns of the
+	related model. When there are no columns every column is loaded.
+
+	Args:
+		model (Any): SQLAlchemy model.
+		load (EagerLoad | None): Relationship name and the strategy used to load it.
+		columns (Sequence[str] | None): Columns to load, see :func:`projection`.
+
+	Raises:
+		InvalidParameter: If the relationship or the strategy doesn't exist.
+
+	Returns:
+		list[ExecutableOption]: Options for ``select(model).options(...)``.
+
+	.. code-block:: python
+
+		eager_options(TaskList, {"tasks": "selectin"})
+		eager_options(TaskList, {"tasks": "selectin"}, ["name", "tasks.title"])
+	"""
+	options: list[ExecutableOption] = []
+	nested: dict[str, list[str]] = {}
+	if columns is not None:
+		for column in columns:
+			relationship, _, name = column.rpartition(".")
+			nested.setdefault(relationship, []).append(name)
+		options.append(load_only(*projection(model, nested.get("", []))))
+	for relationship, strategy in (load or {}).items():
+		if relationship not in model.__mapper__.relationships:
+			raise InvalidParameter(f"{relationship} is not a relationship")
+		if strategy not in EAGER_LOADERS:
+			raise InvalidParameter(f"{strategy} is not a loading strategy")
+		option = EAGER_LOADERS[strategy](getattr(model, relationship))
+		if relationship in nested:
+			related = model.__mapper__.relationships[relationship].mapper.class_
+			option = option.load_only(*projection(related, nested[relationship]))
+		options.append(option)
+	return options
+
+
+def keyset_seek(
+	columns: Sequence[InstrumentedAttribute[Any]],
+	values: Sequence[Any],
+	descending: bool | Sequence[bool],
+) -> ColumnElement[bool]:
+	"""Build the seek predicate of a keyset pagination.
+
+	With one column it's ``col > :value``, with more it's a row value comparison
+	``(col, id) > (:col, :id)`` that Postgres resolves with a composite index.
+	When the columns are sorted in different directions the row value can't be
+	used, it's expanded to ``col > :col OR (col = :col AND id < :id)``.
+
+	Args:
+		columns (Sequence[InstrumentedAttribute[Any]]): Sort columns, the last one is the id.
+		values (Sequence[Any]): Values of the cursor for each column.
+		descending (bool | Sequence[bool]): If the sort is descending (the comparison is ``<``), for
+			all the columns or for each one.
+
+	Returns:
+		ColumnElement[bool]: Predicate to use in the ``WHERE``.
+	"""
+	if not isinstance(descending, bool):
+		if len(set(descending)) > 1:
+			return or_(
+				*(
+					and_(
+						*(c == v for c, v in zip(columns[:i], values[:i], strict=True)),
+						column < value if desc else column > value,
+					)
+					for i, (column, value, desc) in enumerate(
+						zip(columns, values, descending, strict=True)
+					)
+				)
+			)
+		descending = descending[0]
+	if len(columns) == 1:
+		left, right = columns[0], values[0]
+	else:
+		left = tuple_(*columns)
+		right = tuple_(
+			*(literal(v, c.type) for c, v in zip(columns, values, strict=True))
+		)
+	return left < right if descending else left > right
+
 
 class Repository(GeneralCrudAsync[T]):
+	def __init__(
+		self, model: T, sortable: Sequence[str] = (), facets: Sequence[str] = ()
+	) -> None:
+		"""
+		Args:
+			model (T): SQLAlchemy model of the repository.
+			sortable (Sequence[str]): Columns the lists can be sorted by with :class:`SortSpec`, only
+				columns backed by an index (the id is always sortable).
+			facets (Sequence[str]): Enum columns counted next to the pages, see :meth:`get_entity_facets`.
+		"""
+		super().__init__(model)
+		self.sortable = tuple(sortable)
+		self.facets = tuple(facets)
+
+	def sort_keys(
+		self,
+		order_by: Direction | Sequence[SortSpec],
+		sort_columns: Sequence[InstrumentedAttribute[Any]] | None = None,
+	) -> list[SortKey]:
+		"""Keys of the ``ORDER BY`` of a list, see :func:`resolve_sort`."""
+		return resolve_sort(self.model, order_by, self.sortable, sort_columns)
+
 	@override
 	async def get_entity(
 		self,
 		db: AsyncSession,
 		filter: tuple[Any],
+		columns: Sequence[str] | None = None,
 	) -> Sequence[T]:
 		"""Function that retrieves all the entities of a Model
 
 		Args:
 		db (AsyncSession): Async Session from the context o Dependencies.
 		filter (tuple[Any]): Filter the data to get.
+		columns (Sequence[str] | None): Only load these columns, see :func:`eager_options`.
 
 		Returns:
 		Sequence[T]: Return the Sequence or List of data.
@@ -46,6 +208,8 @@ class Repository(GeneralCrudAsync[T]):
 		"""
 		model = self.model
 		stmt = lambda_stmt(lambda: select(model).filter(*filter))  # type: ignore
+		if options := eager_options(model, None, columns):
+			stmt += lambda s: s.options(*options)  # type: ignore
 		result = await db.execute(stmt)
 		return result.scalars().all()
 
@@ -55,71 +219,220 @@ class Repository(GeneralCrudAsync[T]):
 		db: AsyncSession,
 		limit: int,
 		offset: int,
-		order_by: Literal["asc", "desc"],
+		order_by: Direction | Sequence[SortSpec],
 		filter: tuple[Any],
+		with_counts: bool = True,
+		with_total: bool = True,
+		load: EagerLoad | None = None,
+		columns: Sequence[str] | None = None,
 		**kwargs,
-	) -> tuple[Sequence[T], int]:
+	) -> tuple[Sequence[T], int | None, int | None]:
 		"""Function that retrieves and paginates the entities of a Model
 
+		The page, the count of the filtered data (``count(*) OVER ()``) and the
+		count of the whole table (scalar subquery) are returned by the same
+		statement, so one page is one round trip to the database.
+
 		Args:
 			db (AsyncSession): Async Session from the context o Dependencie.
 			limit (int): How many results want to retrieve
 			offser (int): From which index return
-			order_by (Literal ["asc", "desc"]): How the data should be ordered.
+			order_by (Direction | Sequence[SortSpec]): How the data should be ordered, ``asc``/``desc`` by
+				the id or the sort specs of the columns in :attr:`sortable`.
 			filter (tuple[Any]): Filter the data to get.
+			with_counts (bool): Calculate the counts, if they are not needed only the page is selected.
+			with_total (bool): Calculate the count of the whole table, disable it when the total comes from
+				other source (see :class:`utils.db.count.CountProvider`).
+			load (EagerLoad | None): Relationships to load with the page, see :func:`eager_options`.
+			columns (Sequence[str] | None): Only load these columns, see :func:`eager_options`.
 			kwargs: Can be any statement that we want to run
 
 		Returns:
-			tuple[Sequence[T], int]: Return a tuple with the Sequence o List of the data, and the count of the data selected.
+			tuple[Sequence[T], int | None, int | None]: Return a tuple with the Sequence o List of the data,
+			the count of the data selected and the count of all the data. The counts are None when
+			``with_counts``/``with_total`` are False.
 
 		.. code-block:: python
 
 			# Graphql
-			async def get_pagination_graphql(info: strawberry.Info)-> tuple[Sequence[model], int]:
-				data, count = await get_entity_pagination(db=info.context.db, filter=(), limit=10, offset=0, order_by="asc")
+			async def get_pagination_graphql(info: strawberry.Info)-> tuple[Sequence[model], int, int]:
+				data, count, total = await get_entity_pagination(db=info.context.db, filter=(), limit=10, offset=0, order_by="asc")
 				filter_str = "[["id", "=", "1"]]"
 				filter_: tuple[Operators] = get_filters(filter_str, model)
-				data, count = await get_entity_pagination(info.context.db, filter=filter_, limit=10, offset=0, order_by="asc")
+				data, count, total = await get_entity_pagination(info.context.db, filter=filter_, limit=10, offset=0, order_by="asc")
 
 			# FastApi endpoint
 			@app.get("/")
 			async def get_pagination_fastapi(db: depend_db_annotated)-> Sequence[model]:
-				data, count = await get_entity_pagination(db=db, filter=(), limit=10, offset=0, order_by="asc",
-					kwargs={"join": lambda s: s.join(model, model.id == model2.id)})
+				data, _, _ = await get_entity_pagination(db=db, filter=(), limit=10, offset=0, order_by="asc",
+					with_counts=False, kwargs={"join": lambda s: s.join(model, model.id == model2.id)})
 				filter_str = "[["id", "=", "1"]]"
 				filter_: tuple[Operators] = get_filters(filter_str, model)
-				data, count = await get_entity_pagination(db, filter=filter_, limit=10, offset=0, order_by="asc")
+				data, count, total = await get_entity_pagination(db, filter=filter_, limit=10, offset=0, order_by="asc")
 		"""
 		model = self.model
-		stmt = lambda_stmt(lambda: select(model))  # type: ignore
-		if order_by == "desc":
-			stmt += lambda s: s.order_by(model.id.desc())  # type: ignore
-		elif order_by == "asc":
-			stmt += lambda s: s.order_by(model.id.asc())  # type: ignore
-		else:
-			raise ValueError("Order by should be 'asc' or 'desc' ")
+		order = [key.order() for key in self.sort_keys(order_by)]
 
+		stmt = lambda_stmt(lambda: select(model))  # type: ignore
 		stmt += lambda s: s.filter(*filter)  # type: ignore
 		if kwargs:
 			for v in kwargs.values():
 				stmt += v
+		counts = [func.count().over().label("filtered_count")]
+		if with_total:
+			counts.append(
+				select(func.count())
+				.select_from(model)
+				.correlate(None)
+				.scalar_subquery()
+			)
+		page = stmt
+		if with_counts:
+			page += lambda s: s.add_columns(*counts)  # type: ignore
+		if options := eager_options(model, load, columns):
+			page += lambda s: s.options(*options)  # type: ignore
+		page += lambda s: s.order_by(*order)  # type: ignore
+		page += lambda s: s.limit(limit)  # type: ignore
+		page += lambda s: s.offset(offset)  # type: ignore
+		result = await db.execute(page)
+		if load and "joined" in load.values():
+			result = result.unique()
+		if not with_counts:
+			return (result.scalars().all(), None, None)
+
+		rows = result.all()
+		if rows:
+			total_count = rows[0][2] if with_total else None
+			return ([row[0] for row in rows], rows[0][1], total_count)
+		# An empty page (offset after the last row) doesn't bring the window
+		# count, only then the counts are selected apart, without the ORDER BY.
+		counts[0] = func.count()
 		count_query = lambda_stmt(
-			lambda: select(func.count()).select_from(stmt.subquery())  # type: ignore
+			lambda: select(*counts).select_from(stmt.subquery())  # type: ignore
 		)
-		total_count = await db.scalar(count_query)
+		count_row = (await db.execute(count_query)).one()
+		return ([], count_row[0], count_row[1] if with_total else None)
+
+	def keyset_columns(
+		self,
+		sort_columns: Sequence[InstrumentedAttribute[Any]] | None = None,
+		order_by: Direction | Sequence[SortSpec] = "asc",
+	) -> list[InstrumentedAttribute[Any]]:
+		"""Columns that define the keyset of the model, the id is always added
+		as the last column so the sort is unique.
+
+		Args:
+			sort_columns (Sequence[InstrumentedAttribute[Any]] | None): Columns used to sort.
+			order_by (Direction | Sequence[SortSpec]): The sort specs replace the ``sort_columns``.
+
+		Returns:
+			list[InstrumentedAttribute[Any]]: Sort columns plus the id as tiebreaker.
+		"""
+		return [key.column for key in self.sort_keys(order_by, sort_columns)]
+
+	@override
+	async def get_entity_keyset(
+		self,
+		db: AsyncSession,
+		limit: int,
+		order_by: Direction | Sequence[SortSpec],
+		filter: tuple[Any],
+		after: str | None = None,
+		before: str | None = None,
+		sort_columns: Sequence[InstrumentedAttribute[Any]] | None = None,
+		load: EagerLoad | None = None,
+		columns: Sequence[str] | None = None,
+		**kwargs,
+	) -> tuple[Sequence[T], bool]:
+		"""Function that retrieves the entities of a Model using keyset (cursor)
+		pagination. Instead of an ``OFFSET`` the query seeks from the sort key of
+		the cursor, ``WHERE (col, id) > (:col, :id)``, so the cost of any page is
+		the same as the first one while the sort is backed by an index.
+
+		Args:
+			db (AsyncSession): Async Session from the context o Dependencie.
+			limit (int): How many results want to retrieve
+			order_by (Direction | Sequence[SortSpec]): How the data should be ordered, ``asc``/``desc`` by
+				the ``sort_columns`` or the sort specs of the columns in :attr:`sortable`.
+			filter (tuple[Any]): Filter the data to get.
+			after (str | None): Cursor, return the elements after this one.
+			before (str | None): Cursor, return the elements before this one.
+			sort_columns (Sequence[InstrumentedAttribute[Any]] | None): Columns to sort with ``asc``/``desc``,
+				the id is used as tiebreaker.
+			load (EagerLoad | None): Relationships to load with the page, see :func:`eager_options`.
+			columns (Sequence[str] | None): Only load these columns (the sort columns are added), see
+				:func:`eager_options`.
+			kwargs: Can be any statement that we want to run
+
+		Raises:
+			InvalidParameter: If the cursor doesn't match the sort or a sort column is nullable.
+
+		Returns:
+			tuple[Sequence[T], bool]: Return a tuple with the Sequence o List of the data, and if there are more
+			elements in the direction of the pagination.
+
+		.. code-block:: python
+
+			# Graphql
+			async def get_keyset_graphql(info: strawberry.Info)-> tuple[Sequence[model], bool]:
+				data, has_more = await get_entity_keyset(db=info.context.db, filter=(), limit=10, order_by="asc")
+				cursor = encode_entity_cursor(keyset_columns(), data[-1])
+				data, has_more = await get_entity_keyset(
+					db=info.context.db, filter=(), limit=10, order_by="asc", after=cursor
+				)
+		"""
+		if after is not None and before is not None:
+			raise InvalidParameter("Only one of 'after' or 'before' can be used")
+		model = self.model
+		keys = self.sort_keys(order_by, sort_columns)
+		keyset = [key.column for key in keys]
+		if nullable := [c.key for c in keyset if c.expression.nullable]:  # type: ignore
+			# The seek compares the values of the cursor, NULLs never match it.
+			raise InvalidParameter(f"Can't paginate with a cursor sorted by {', '.join(nullable)}")
+		# Paginating backwards is the same seek with the sort inverted, the page
+		# is reversed again before returning it.
+		reverse = before is not None
+		order = [key.order(reverse) for key in keys]
+		descending = [key.descending != reverse for key in keys]
 
-		stmt += lambda s: s.limit(limit)  # type: ignore
-		stmt += lambda s: s.offset(offset)  # type: ignore
+		stmt = lambda_stmt(lambda: select(model))  # type: ignore
+		stmt += lambda s: s.filter(*filter)  # type: ignore
+		if (cursor := after or before) is not None:
+			values = decode_cursor(cursor, keyset)
+			seek = keyset_seek(keyset, values, descending)
+			stmt += lambda s: s.where(seek)  # type: ignore
+		if kwargs:
+			for v in kwargs.values():
+				stmt += v
+		# One extra row tells if there is another page without a count query.
+		fetch = limit + 1
+		if columns is not None:
+			# The cursors are built from the sort key of the rows.
+			columns = [*columns, *(c.key for c in keyset)]
+		if options := eager_options(model, load, columns):
+			stmt += lambda s: s.options(*options)  # type: ignore
+		stmt += lambda s: s.order_by(*order)  # type: ignore
+		stmt += lambda s: s.limit(fetch)  # type: ignore
 		result = await db.execute(stmt)
-		return (result.scalars().all(), total_count)
+		if load and "joined" in load.values():
+			result = result.unique()
+		items = list(result.scalars().all())
+		has_more = len(items) > limit
+		items = items[:limit]
+		if before is not None:
+			items.reverse()
+		return (items, has_more)
 
 	@override
-	async def get_entity_by_id(self, entity_id: str | int, db: AsyncSession) -> T:
+	async def get_entity_by_id(
+		self, entity_id: str | int, db: AsyncSession, load: EagerLoad | None = None
+	) -> T:
 		"""Retrieves a single result from the Model
 
 		Args:
 		    db (AsyncSession): Async session from the context or dependencies.
 		    entity_id (str | int): index or uuid4 from the entity to retrieve
+		    load (EagerLoad | None): Relationships to load with the entity, see :func:`eager_options`.
 
 		Returns:
 		    T: Return the single result from the model.
@@ -150,24 +463,70 @@ class Repository(GeneralCrudAsync[T]):
 		model = self.model
 		stmt = lambda_stmt(lambda: select(model))  # type: ignore
 		stmt += lambda s: s.where(model.id == entity_id)  # type: ignore
+		if options := eager_options(model, load):
+			stmt += lambda s: s.options(*options)  # type: ignore
 		result = await db.execute(stmt)
+		if load and "joined" in load.values():
+			result = result.unique()
 		if not (entity_result := result.scalar_one_or_none()):
 			raise EntityDoesNotExistError(message="Entity don't exist")
 		return entity_result
 
+	@override
+	async def get_entities_by_ids(
+		self,
+		entity_ids: Sequence[Any],
+		db: AsyncSession,
+		column: InstrumentedAttribute[Any] | None = None,
+	) -> Sequence[T]:
+		"""Retrieves all the entities whose column is one of the values, with one
+		``WHERE column = ANY(:ids)``. The ids are sent as a single array parameter,
+		so the statement is the same for any number of keys.
+
+		Args:
+			entity_ids (Sequence[Any]): Values to search.
+			db (AsyncSession): Async session from the context or dependencies.
+			column (InstrumentedAttribute[Any] | None): Column to compare, defaults to the id of the model.
+
+		Returns:
+			Sequence[T]: The entities found, in no particular order. Missing values are ignored.
+
+		.. code-block:: python
+
+			tasks = await get_entities_by_ids([task_id_1, task_id_2], db=info.context.db)
+			tasks = await get_entities_by_ids([task_list_id], db=db, column=Tasks.task_list_id)
+		"""
+		model = self.model
+		if column is None:
+			column = model.id  # type: ignore
+		ids = bindparam("ids", list(entity_ids), type_=ARRAY(column.type))  # type: ignore
+		stmt = select(model).where(column == any_(ids))  # type: ignore
+		result = await db.execute(stmt)
+		return result.scalars().all()
+
 	@override
 	async def delete_entity(
-		self, entity_id: str | int, db: AsyncSession, filter: tuple[Any]
-	) -> None:
-		"""Function that deletes one entity.
+		self,
+		entity_id: str | int,
+		db: AsyncSession,
+		filter: tuple[Any],
+		returning: Sequence[str] | None = None,
+	) -> T | None:
+		"""Function that deletes one entity with a single ``DELETE ... WHERE ...
+		RETURNING id``, the entity doesn't exist when nothing is returned.
 
 		Args:
 			db (AsyncSession): Async session from the context or dependencies..
 			entity_id (str | int): index or uuid4 from the entity to retrieve
 			filter (tuple[Any]): Filter the data to get.
+			returning (Sequence[str] | None): Columns of the deleted entity to return, see :func:`projection`.
+
+		Raises:
+			EntityDoesNotExistError: If no entity matches the id and the filter.
 
 		Returns:
-			None
+			T | None: The deleted entity with the ``returning`` columns (it isn't attached to the session),
+			None when ``returning`` isn't given.
 
 		.. code-block:: python
 
@@ -184,18 +543,22 @@ class Repository(GeneralCrudAsync[T]):
 				await delete_entity(db=db, filter=())
 				filter_str = "[["email", "=", "somerandom@email.com"]]"
 				filter_: tuple[Operators] = get_filters(filter_str, model)
-				await delete_entity(db, filter=filter_)
+				deleted = await delete_entity(db, filter=filter_, returning=["title"])
 		"""
-		await self.get_entity_by_id(entity_id=entity_id, db=db)
 		model = self.model
+		columns = projection(model, returning or ())
 		stmt = lambda_stmt(lambda: delete(model))  # type: ignore
 		stmt += lambda s: s.where(model.id == entity_id)  # type: ignore
 		stmt += lambda s: s.filter(*filter)  # type: ignore
-		if (await db.execute(stmt)).rowcount == 0:  # type: ignore
+		stmt += lambda s: s.returning(*columns)  # type: ignore
+		if (row := (await db.execute(stmt)).one_or_none()) is None:
 			raise EntityDoesNotExistError(
 				message="Entity don't exist",
 			)
 		await db.commit()
+		if returning is None:
+			return None
+		return model(**dict(zip((c.key for c in columns), row, strict=True)))  # type: ignore
 
 	@override
 	async def get_entity_by_args(
@@ -243,17 +606,110 @@ class Repository(GeneralCrudAsync[T]):
 			return None
 		return entity_result
 
+	@override
+	async def get_entity_counts(
+		self,
+		db: AsyncSession,
+		group_by: Sequence[str],
+		filter: tuple[Any],
+	) -> list[tuple[dict[str, Any], int]]:
+		"""Count the entities grouped by the given columns with one ``SELECT col,
+		count(*) ... GROUP BY col`` statement, the database returns one row per
+		bucket instead of the entities.
+
+		Args:
+			db (AsyncSession): Async Session from the context or dependencies.
+			group_by (Sequence[str]): Columns of the buckets, without columns there is one bucket with the total.
+			filter (tuple[Any]): Filter the data to count.
+
+		Raises:
+			InvalidParameter: If a column doesn't exist.
+
+		Returns:
+			list[tuple[dict[str, Any], int]]: The values of the columns of each bucket and its count, ordered
+			by the columns.
+
+		.. code-block:: python
+
+			counts = await get_entity_counts(db, group_by=["status"], filter=())
+			# [({"status": Status.NEW}, 12), ({"status": Status.ACTIVE}, 3)]
+		"""
+		model = self.model
+		names = list(dict.fromkeys(group_by))
+		if missing := [name for name in names if name not in model.__table__.c]:  # type: ignore
+			raise InvalidParameter(f"Can't group by {', '.join(missing)}")
+		columns = [getattr(model, name) for name in names]
+		stmt = (
+			select(*columns, func.count().label("count"))
+			.select_from(model)  # type: ignore
+			.where(*filter)
+			.group_by(*columns)
+			.order_by(*columns)
+		)
+		rows = (await db.execute(stmt)).all()
+		return [(dict(zip(names, row[:-1], strict=True)), row[-1]) for row in rows]
+
+	@override
+	async def get_entity_facets(
+		self,
+		db: AsyncSession,
+		columns: Sequence[str],
+		filter: tuple[Any],
+	) -> dict[str, list[tuple[Any, int]]]:
+		"""Count the entities of each value of the given enum columns with one
+		statement of ``count(*) FILTER (WHERE col = :value)`` aggregates, a
+		single row with every facet and one scan of the filtered rows.
+
+		Args:
+			db (AsyncSession): Async Session from the context or dependencies.
+			columns (Sequence[str]): Enum columns of the facets.
+			filter (tuple[Any]): Filter the data to count, the same of the page.
+
+		Raises:
+			InvalidParameter: If a column doesn't exist or isn't an enum.
+
+		Returns:
+			dict[str, list[tuple[Any, int]]]: Each value of the enum of the column and its count, in the
+			order of the enum (the values without entities count 0).
+
+		.. code-block:: python
+
+			facets = await get_entity_facets(db, columns=["status"], filter=filter_)
+			# {"status": [(Status.NEW, 12), (Status.ACTIVE, 3), (Status.COMPLETED, 0), ...]}
+		"""
+		model = self.model
+		buckets: list[tuple[str, Any]] = []
+		aggregates = []
+		for name in columns:
+			column = getattr(model, name, None)
+			if (enum_class := getattr(getattr(column, "type", None), "enum_class", None)) is None:
+				raise InvalidParameter(f"Can't count the facets of {name}, it isn't an enum column")
+			for value in enum_class:
+				buckets.append((name, value))
+				aggregates.append(func.count().filter(column == value))
+		if not aggregates:
+			return {}
+		stmt = select(*aggregates).select_from(model).where(*filter)  # type: ignore
+		row = (await db.execute(stmt)).one()
+		facets: dict[str, list[tuple[Any, int]]] = {name: [] for name in columns}
+		for (name, value), count in zip(buckets, row, strict=True):
+			facets[name].append((value, count))
+		return facets
+
 	@override
 	async def create_entity(
 		self,
 		entity_schema: Any,
 		db: AsyncSession,
+		commit: bool = True,
 	) -> T:
 		"""Function that creates an entity.
 
 		Args:
 		    db (AsyncSession): Async Session from the Context or dependencies.
 		    entity_schema (Any): A valid Pydantic Schema
+		    commit (bool): Commit the transaction and refresh the entity, disable it to only flush
+		        the INSERT and run more statements in the same transaction.
 
 		Returns:
 		    T: Return the result of the entity.
@@ -290,10 +746,137 @@ class Repository(GeneralCrudAsync[T]):
 		entity_result_ = entity_schema.model_dump()
 		entity_result_ = self.model(**entity_result_)  # type: ignore
 		db.add(entity_result_)  # type: ignore
+		if not commit:
+			await db.flush()
+			return entity_result_  # type: ignore
 		await db.commit()
 		await db.refresh(entity_result_)  # type: ignore
 		return entity_result_  # type: ignore
 
+	@override
+	async def create_entities(
+		self,
+		entity_schemas: Sequence[Any],
+		db: AsyncSession,
+		chunk_size: int = 1000,
+	) -> list[T]:
+		"""Function that creates many entities with a multi-row
+		``INSERT ... VALUES (...), (...) RETURNING *`` per chunk and one commit for
+		the whole batch, instead of ``add`` + ``commit`` + ``refresh`` per entity.
+
+		Args:
+		    entity_schemas (Sequence[Any]): Valid Pydantic Schemas.
+		    db (AsyncSession): Async Session from the Context or dependencies.
+		    chunk_size (int): Rows per ``INSERT``, postgres accepts up to 32767 parameters per statement.
+
+		Returns:
+		    list[T]: The created entities, in the same order as the schemas. They aren't attached to the session.
+
+		.. code-block:: python
+
+		    schemas = [modelSchema(...) for _ in range(5000)]
+		    entities = await create_entities(entity_schemas=schemas, db=info.context.db)
+		"""  # noqa: E101
+		model = self.model
+		columns = model.__table__.c  # type: ignore
+		rows = [entity_schema.model_dump() for entity_schema in entity_schemas]
+		entities: list[T] = []
+		for start in range(0, len(rows), chunk_size):
+			stmt = (
+				insert(model)  # type: ignore
+				.values(rows[start : start + chunk_size])
+				.returning(*columns)
+			)
+			result = await db.execute(stmt)
+			entities.extend(model(**row._mapping) for row in result)  # type: ignore
+		await db.commit()
+		return entities
+
+	@override
+	async def update_entities(
+		self,
+		entity_schema: dict[str, Any],
+		db: AsyncSession,
+		filter: tuple[Any],
+		commit: bool = True,
+	) -> list[T]:
+		"""Function that updates every entity that matches the filter with one
+		``UPDATE ... WHERE ... RETURNING *``.
+
+		Args:
+		    entity_schema (dict[str, Any]): Columns and values to set.
+		    db (AsyncSession): Async session from the context or dependencies.
+		    filter (tuple[Any]): Filter of the entities to update, it can't be empty.
+		    commit (bool): Commit the transaction, disable it to run more statements in the same transaction.
+
+		Raises:
+		    InvalidParameter: If the filter is empty, it would update the whole table.
+
+		Returns:
+		    list[T]: The updated entities. They aren't attached to the session.
+
+		.. code-block:: python
+
+		    filter_: tuple[Operators] = get_filters("[["status", "=", "active"]]", model)
+		    entities = await update_entities(db=info.context.db, entity_schema={"status": "completed"}, filter=filter_)
+		"""  # noqa: E101
+		if not filter:
+			raise InvalidParameter("A filter is required to update many entities")
+		model = self.model
+		stmt = (
+			update(model)  # type: ignore
+			.where(*filter)
+			.values(**entity_schema)
+			.returning(*model.__table__.c)  # type: ignore
+			.execution_options(synchronize_session=False)
+		)
+		result = await db.execute(stmt)
+		entities = [model(**row._mapping) for row in result]  # type: ignore
+		if commit:
+			await db.commit()
+		return entities
+
+	@override
+	async def delete_entities(
+		self,
+		db: AsyncSession,
+		filter: tuple[Any],
+		commit: bool = True,
+	) -> list[T]:
+		"""Function that deletes every entity that matches the filter with one
+		``DELETE ... WHERE ... RETURNING *``.
+
+		Args:
+		    db (AsyncSession): Async session from the context or dependencies.
+		    filter (tuple[Any]): Filter of the entities to delete, it can't be empty.
+		    commit (bool): Commit the transaction, disable it to run more statements in the same transaction.
+
+		Raises:
+		    InvalidParameter: If the filter is empty, it would delete the whole table.
+
+		Returns:
+		    list[T]: The deleted entities.
+
+		.. code-block:: python
+
+		    filter_: tuple[Operators] = get_filters("[["status", "=", "completed"]]", model)
+		    entities = await delete_entities(db=info.context.db, filter=filter_)
+		"""  # noqa: E101
+		if not filter:
+			raise InvalidParameter("A filter is required to delete many entities")
+		model = self.model
+		stmt = (
+			delete(model)  # type: ignore
+			.where(*filter)
+			.returning(*model.__table__.c)  # type: ignore
+			.execution_options(synchronize_session=False)
+		)
+		result = await db.execute(stmt)
+		entities = [model(**row._mapping) for row in result]  # type: ignore
+		if commit:
+			await db.commit()
+		return entities
+
 	@override
 	async def update_entity(
 		self,
@@ -310,8 +893,11 @@ class Repository(GeneralCrudAsync[T]):
 		    entity_id (int | str): id of the entity to update
 		    filter (tuple[Any]):  Filter the data to get.
 
+		Raises:
+		    EntityDoesNotExistError: If no entity matches the id and the filter.
+
 		Returns:
-		    T: Return the result of the entity.
+		    T: Return the entity returned by ``UPDATE ... RETURNING``, it isn't attached to the session.
 
 		.. code-block:: python
 
@@ -335,17 +921,128 @@ class Repository(GeneralCrudAsync[T]):
 
 		"""  # noqa: E101
 		model = self.model
-
 		stmt = (
 			update(model)  # type: ignore
-			.where(model.id == entity_id)  # type: ignore
+			.where(model.id == entity_id, *(filter or ()))  # type: ignore
 			.values(**entity_schema)
-		)  # type: ignore
-		if filter:
-			stmt.filter(*filter)
-		if (await db.execute(stmt)).rowcount == 0:  # type: ignore
+			.returning(*model.__table__.c)  # type: ignore
+			.execution_options(synchronize_session=False)
+		)
+		if (row := (await db.execute(stmt)).one_or_none()) is None:
+			raise EntityDoesNotExistError(
+				message="No record was updated; it may not exist or values may be the same.",
+			) from None
+		await db.commit()
+		return model(**row._mapping)  # type: ignore
+
+	@override
+	async def update_entity_with_previous(
+		self,
+		entity_id: int | str,
+		entity_schema: dict[str, Any],
+		db: AsyncSession,
+		filter: tuple[Any] | None = None,
+	) -> tuple[T, T]:
+		"""Same as :meth:`update_entity` but it also returns the entity as it was
+		before the update, to detect what changed. The row is read and locked in a
+		CTE of the same statement, so it's still one round trip:
+
+		``WITH previous AS (SELECT ... FOR UPDATE) UPDATE ... FROM previous RETURNING ...``
+
+		Args:
+		    entity_id (int | str): id of the entity to update
+		    entity_schema (dict[str, Any]): A valid Pydantic Schema already dump (converted to dict)
+		    db (AsyncSession): Async session from the context or dependencies.
+		    filter (tuple[Any]):  Filter the data to get.
+
+		Raises:
+		    EntityDoesNotExistError: If no entity matches the id and the filter.
+
+		Returns:
+		    tuple[T, T]: The updated entity and the entity before the update.
+
+		.. code-block:: python
+
+		    task, previous = await update_entity_with_previous(db=db, entity_schema={"user": user_id}, entity_id=1)
+		    if task.user != previous.user:
+		        ...
+		"""  # noqa: E101
+		model = self.model
+		table = model.__table__  # type: ignore
+		previous = (
+			select(table)
+			.where(model.id == entity_id, *(filter or ()))  # type: ignore
+			.with_for_update()
+			.cte("previous")
+		)
+		stmt = (
+			update(table)
+			.where(table.c.id == previous.c.id)
+			.values(**entity_schema)
+			.returning(*table.c, *previous.c)
+		)
+		if (row := (await db.execute(stmt)).one_or_none()) is None:
 			raise EntityDoesNotExistError(
 				message="No record was updated; it may not exist or values may be the same.",
 			) from None
 		await db.commit()
-		return await self.get_entity_by_id(entity_id, db)
+		keys = table.c.keys()
+		updated, before = row[: len(keys)], row[len(keys) :]
+		return (
+			model(**dict(zip(keys, updated, strict=True))),  # type: ignore
+			model(**dict(zip(keys, before, strict=True))),  # type: ignore
+		)
+
+	@override
+	async def update_entities_with_previous(
+		self,
+		entity_schema: dict[str, Any],
+		db: AsyncSession,
+		filter: tuple[Any],
+		commit: bool = True,
+	) -> list[tuple[T, T]]:
+		"""Same as :meth:`update_entities` but it also returns each entity as it
+		was before the update, read and locked in a CTE of the same statement:
+
+		``WITH previous AS (SELECT ... WHERE ... FOR UPDATE) UPDATE ... FROM previous RETURNING ...``
+
+		Args:
+		    entity_schema (dict[str, Any]): Columns and values to set.
+		    db (AsyncSession): Async session from the context or dependencies.
+		    filter (tuple[Any]): Filter of the entities to update, it can't be empty.
+		    commit (bool): Commit the transaction, disable it to run more statements in the same transaction.
+
+		Raises:
+		    InvalidParameter: If the filter is empty, it would update the whole table.
+
+		Returns:
+		    list[tuple[T, T]]: The updated entities and the entities before the update.
+
+		.. code-block:: python
+
+		    rows = await update_entities_with_previous(db=db, entity_schema={"user": user_id}, filter=filter_)
+		    changed = [task for task, previous in rows if task.user != previous.user]
+		"""  # noqa: E101
+		if not filter:
+			raise InvalidParameter("A filter is required to update many entities")
+		model = self.model
+		table = model.__table__  # type: ignore
+		previous = select(table).where(*filter).with_for_update().cte("previous")
+		stmt = (
+			update(table)
+			.where(table.c.id == previous.c.id)
+			.values(**entity_schema)
+			.returning(*table.c, *previous.c)
+		)
+		result = await db.execute(stmt)
+		keys = table.c.keys()
+		entities = [
+			(
+				model(**dict(zip(keys, row[: len(keys)], strict=True))),  # type: ignore
+				model(**dict(zip(keys, row[len(keys) :], strict=True))),  # type: ignore
+			)
+			for row in result
+		]
+		if commit:
+			await db.commit()
+		return entities
@@ -0,0 +1,74 @@
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Tasks
+from utils.db.cursor import decode_cursor, encode_cursor
+
+from .repository import eager_options, keyset_seek
+
+SEARCH_CONFIG = "english"
+
+# Generated column of the migration ``add tasks search vector``, it isn't mapped
+# in the model so the entities and the RETURNING of the repository don't load it.
+search_vector = sa.literal_column("tasks.search_vector", TSVECTOR)
+
+
+def rank_expression(query: str) -> tuple[Any, Any]:
+	"""The ``@@`` match and the ``ts_rank_cd`` rank of the search query."""
+	ts_query = sa.func.websearch_to_tsquery(SEARCH_CONFIG, query)
+	return (
+		search_vector.op("@@")(ts_query),
+		sa.func.ts_rank_cd(search_vector, ts_query, type_=sa.Float),
+	)
+
+
+async def search_tasks(
+	db: AsyncSession,
+	query: str,
+	limit: int,
+	filter: Sequence[Any] = (),
+	after: str | None = None,
+	columns: Sequence[str] | None = None,
+) -> tuple[list[tuple[Tasks, str]], bool]:
+	"""Full-text search of the tasks by title and description, backed by the GIN
+	index of ``tasks.search_vector``. The tasks are ranked with ``ts_rank_cd``
+	(the title weighs more than the description) and paginated with a keyset
+	on ``(rank, id)``.
+
+	Args:
+		db (AsyncSession): Async session from the context or dependencies.
+		query (str): Search in the ``websearch_to_tsquery`` syntax (``"exact phrase" -word or other``).
+		limit (int): How many tasks to return.
+		filter (Sequence[Any]): Other conditions of the tasks, like the status or the priority.
+		after (str | None): Cursor of the last task of the previous page.
+		columns (Sequence[str] | None): Only load these columns, see :func:`eager_options`.
+
+	Raises:
+		InvalidParameter: If the cursor is malformed.
+
+	Returns:
+		tuple[list[tuple[Tasks, str]], bool]: The tasks with their cursor, and if there are more tasks.
+
+	.. code-block:: python
+
+		tasks, has_more = await search_tasks(db, "database migration", limit=10)
+		tasks, has_more = await search_tasks(db, "database migration", limit=10, after=tasks[-1][1])
+	"""
+	match, rank = rank_expression(query)
+	keyset = [rank.label("rank"), Tasks.id]
+	stmt = sa.select(Tasks, keyset[0]).where(match, *filter)
+	if after is not None:
+		stmt = stmt.where(keyset_seek([rank, Tasks.id], decode_cursor(after, keyset), True))
+	if options := eager_options(Tasks, None, columns):
+		stmt = stmt.options(*options)
+	stmt = stmt.order_by(rank.desc(), Tasks.id.desc()).limit(limit + 1)
+	rows = (await db.execute(stmt)).all()
+	tasks = [
+		(task, encode_cursor(keyset, [task_rank, task.id]))
+		for task, task_rank in rows[:limit]
+	]
+	return tasks, len(rows) > limit
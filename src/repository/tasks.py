@@ -1,5 +1,8 @@
 from models.models import TaskList, Tasks
 from repository.repository import Repository
 
-tasks_repository = Repository(model=Tasks)
-tasks_list_repository = Repository(model=TaskList)
+# The sortable columns are backed by an index, see models.models.
+tasks_repository = Repository(
+	model=Tasks, sortable=("created_at", "priority", "status"), facets=("status", "priority")
+)
+tasks_list_repository = Repository(model=TaskList, sortable=("created_at", "name"))
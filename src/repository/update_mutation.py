@@ -7,16 +7,21 @@ import strawberry
 from sqlalchemy import select
 from strawberry.types import Info
 
-from common.send_email import send_email_for_task
+from common.send_email import send_email_for_task, send_emails_for_tasks
 from models.models import TaskList, Tasks
 from schema.grapql_schemas import (
+	BulkMutationResult,
 	ListTasksUpdate,
 	ListTaskType,
+	TasksPatchGQL,
 	TasksType,
 	TasksUpdateGQL,
 )
 from schema.tasks import ListTaskGQLResponse, TaskGQLResponse, TaskUpdates
-from services.users import user_repository
+from utils.cache.redis_cache import invalidate_cache
+from utils.db.dynamic_filter import get_filters
+from utils.db.filter_planner import filter_planner
+from utils.exceptions import EntityDoesNotExistError, InvalidParameter
 
 from .tasks import tasks_list_repository, tasks_repository
 
@@ -47,20 +52,21 @@ async def update_tasks(
 	_entity = strawberry.asdict(tasks)
 	# _entity = {k: v for k, v in _entity.items() if v is not None}
 	converted_data = {key: convert_enum(value) for key, value in _entity.items()}
-	result = await tasks_repository.update_entity(
+	loaders = info.context.loaders
+	user = None
+	if (_user := converted_data.get("user")) is not None:
+		if (user := await loaders.user_by_id.load(_user)) is None:
+			raise EntityDoesNotExistError(message="Entity don't exist")
+	# The previous row comes back in the same UPDATE ... RETURNING.
+	result, previous = await tasks_repository.update_entity_with_previous(
 		db=info.context.db,
 		entity_schema=TaskUpdates(**converted_data).model_dump(exclude_none=True),
 		filter=(),  # type: ignore
 		entity_id=id,
 	)
-	if (_user := converted_data.get("user")) is not None and _user != (
-		_ := await tasks_repository.get_entity_by_id(
-			entity_id=id, db=info.context.db
-		)
-	).user:
-		user = await user_repository.get_entity_by_id(
-			db=info.context.db, entity_id=str(converted_data["user"])
-		)
+	loaders.task_by_id.clear_all()
+	await invalidate_cache("tasks", "task_list")
+	if user is not None and result.user != previous.user:
 		await send_email_for_task(user=str(user.email), task=result)
 	__tasks = TasksType.from_pydantic(TaskGQLResponse.model_validate(result))
 	return __tasks
@@ -83,10 +89,11 @@ async def list_tasks_update(
 		filter=(),  # type: ignore
 	)
 
-	tasks = []
-
-	await session.refresh(result, attribute_names=["tasks"])
-	tasks = [TaskGQLResponse.model_validate(t) for t in result.tasks]
+	# The tasks of the list could be loaded before the update in this request.
+	info.context.loaders.clear_all()
+	await invalidate_cache("task_list", *(("tasks",) if tasks else ()))
+	list_tasks = await info.context.loaders.tasks_by_list_id.load(id)
+	tasks = [TaskGQLResponse.model_validate(t) for t in list_tasks]
 	items_dict = result.__dict__
 	items_dict["tasks"] = tasks
 	new_items: ListTaskGQLResponse = ListTaskGQLResponse.model_construct(**items_dict)
@@ -96,6 +103,92 @@ async def list_tasks_update(
 	return __tasks_list
 
 
+def get_patch_values(patch: TasksPatchGQL) -> dict[str, Any]:
+	"""Columns sent in the patch, validated with :class:`TaskUpdates`. The
+	``updated_at`` is always set.
+
+	Raises:
+		InvalidParameter: If the patch is empty or clears a column that can't be null.
+	"""
+	values = {
+		key: convert_enum(value)
+		for key, value in vars(patch).items()
+		if value is not strawberry.UNSET
+	}
+	if not values:
+		raise InvalidParameter("The patch doesn't have any column to update")
+	for key, value in values.items():
+		if value is None and not Tasks.__table__.c[key].nullable:
+			raise InvalidParameter(f"{key} can't be null")
+	return TaskUpdates(**values).model_dump(include={*values, "updated_at"})
+
+
+async def update_tasks_filter(
+	filter: tuple[Any], patch: TasksPatchGQL, info: Info
+) -> BulkMutationResult:
+	"""Update every task that matches the filter with one ``UPDATE ... RETURNING``
+	in a single transaction. When the patch assigns a user, the previous rows come
+	back in the same statement and only the tasks whose user changed are emailed,
+	see :func:`send_emails_for_tasks`.
+
+	Args:
+		filter (tuple[Any]): Filter of the tasks to update.
+		patch (TasksPatchGQL): Columns to set.
+		info (Info): GraphQL resolver info containing context and database session.
+
+	Returns:
+		BulkMutationResult: Number and ids of the updated tasks.
+
+	Raises:
+		InvalidParameter: If the filter or the patch are empty.
+		EntityDoesNotExistError: If the user of the patch doesn't exist.
+	"""
+	values = get_patch_values(patch)
+	loaders = info.context.loaders
+	user = None
+	if (user_id := values.get("user")) is not None:
+		if (user := await loaders.user_by_id.load(user_id)) is None:
+			raise EntityDoesNotExistError(message="Entity don't exist")
+	if user is None:
+		results = await tasks_repository.update_entities(
+			db=info.context.db,
+			entity_schema=values,
+			filter=filter,
+		)
+		changed = []
+	else:
+		rows = await tasks_repository.update_entities_with_previous(
+			db=info.context.db,
+			entity_schema=values,
+			filter=filter,
+		)
+		results = [task for task, _ in rows]
+		changed = [task for task, previous in rows if task.user != previous.user]
+	loaders.clear_all()
+	await invalidate_cache("tasks", "task_list")
+	if changed:
+		await send_emails_for_tasks((str(user.email), task) for task in changed)
+	return BulkMutationResult(
+		affected_rows=len(results), ids=[task.id for task in results]
+	)
+
+
+async def update_tasks_bulk(
+	ids: list[UUID], patch: TasksPatchGQL, info: Info
+) -> BulkMutationResult:
+	if not ids:
+		raise InvalidParameter("At least one id is required")
+	return await update_tasks_filter((Tasks.id.in_(ids),), patch, info)
+
+
+async def update_tasks_where(
+	filter: str, patch: TasksPatchGQL, info: Info
+) -> BulkMutationResult:
+	filter_ = get_filters(filter, Tasks, strict=True)
+	filter_planner.check(filter_)
+	return await update_tasks_filter(filter_, patch, info)
+
+
 @strawberry.type
 class UpdateMutation:
 	"""Class that update the data from the employee using GraphQL"""
@@ -111,3 +204,15 @@ class UpdateMutation:
 		self, id: Annotated[str, UUID], list_tasks: ListTasksUpdate, info: Info
 	) -> ListTaskType:
 		return await list_tasks_update(id=id, list_tasks=list_tasks, info=info)
+
+	@strawberry.mutation
+	async def update_tasks_bulk(
+		self, ids: list[UUID], patch: TasksPatchGQL, info: Info
+	) -> BulkMutationResult:
+		return await update_tasks_bulk(ids=ids, patch=patch, info=info)
+
+	@strawberry.mutation
+	async def update_tasks_where(
+		self, filter: str, patch: TasksPatchGQL, info: Info
+	) -> BulkMutationResult:
+		return await update_tasks_where(filter=filter, patch=patch, info=info)
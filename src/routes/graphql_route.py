@@ -3,9 +3,9 @@ from strawberry.permission import PermissionExtension
 
 from repository.create_mutation import CreateMutation
 from repository.delete_mutation import DeleteMutation
-from repository.query import PaginationWindow, Queries
+from repository.query import Connection, PaginationWindow, Queries
 from repository.update_mutation import UpdateMutation
-from schema.grapql_schemas import ListTaskType, TasksType
+from schema.grapql_schemas import ListTaskType, TaskStats, TasksType
 from utils.dependencies.graphql_fastapi import IsAuthenticated
 
 
@@ -43,6 +43,10 @@ class Query:
 	Attributes:
 		tasks (PaginationWindow[TasksType]): Returns a paginated list of tasks. Requires authentication.
 		task_list (PaginationWindow[ListTaskType]): Returns a paginated list of task summaries. Requires authentication.
+		tasks_connection (Connection[TasksType]): Returns a cursor paginated list of tasks. Requires authentication.
+		task_list_connection (Connection[ListTaskType]): Returns a cursor paginated list of task lists. Requires authentication.
+		search_tasks (Connection[TasksType]): Returns the tasks that match a full-text search, ranked by relevance. Requires authentication.
+		task_stats (TaskStats): Returns the counts of the tasks grouped by status, priority, user or task list. Requires authentication.
 	Each field uses a resolver from the Queries class and enforces authentication via permission_classes.
 	"""
 
@@ -52,3 +56,16 @@ class Query:
 	task_list: PaginationWindow[ListTaskType] = strawberry.field(
 		resolver=Queries.all_tasks_list, permission_classes=[IsAuthenticated]
 	)
+	tasks_connection: Connection[TasksType] = strawberry.field(
+		resolver=Queries.all_tasks_connection, permission_classes=[IsAuthenticated]
+	)
+	task_list_connection: Connection[ListTaskType] = strawberry.field(
+		resolver=Queries.all_tasks_list_connection,
+		permission_classes=[IsAuthenticated],
+	)
+	search_tasks: Connection[TasksType] = strawberry.field(
+		resolver=Queries.search_tasks, permission_classes=[IsAuthenticated]
+	)
+	task_stats: TaskStats = strawberry.field(
+		resolver=Queries.task_stats, permission_classes=[IsAuthenticated]
+	)
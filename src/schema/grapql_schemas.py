@@ -4,7 +4,17 @@ from uuid import UUID
 
 import strawberry
 
-from schema.tasks import ListTaskGQL, TaskGQLResponse, Tasks, TaskUpdates
+from models.models import TaskList as TaskListModel
+from models.models import Tasks as TasksModel
+from schema.tasks import (
+	ListTaskGQL,
+	Priority,
+	Status,
+	TaskGQLResponse,
+	Tasks,
+	TaskUpdates,
+)
+from utils.graphql.filters import model_filter_input
 
 
 @strawberry.enum
@@ -25,6 +35,79 @@ class StatusGQLEnum(Enum):
 	ERROR = "error"
 
 
+@strawberry.enum
+class CountModeGQLEnum(Enum):
+	EXACT = "exact"
+	ESTIMATE = "estimate"
+	CACHED = "cached"
+
+
+@strawberry.enum
+class SortDirectionGQLEnum(Enum):
+	ASC = "asc"
+	DESC = "desc"
+
+
+@strawberry.enum
+class NullsOrderGQLEnum(Enum):
+	FIRST = "first"
+	LAST = "last"
+
+
+@strawberry.enum
+class TaskSortColumnGQLEnum(Enum):
+	ID = "id"
+	CREATED_AT = "created_at"
+	PRIORITY = "priority"
+	STATUS = "status"
+
+
+@strawberry.enum
+class TaskListSortColumnGQLEnum(Enum):
+	ID = "id"
+	CREATED_AT = "created_at"
+	NAME = "name"
+
+
+@strawberry.enum
+class TaskStatsGroupGQLEnum(Enum):
+	STATUS = "status"
+	PRIORITY = "priority"
+	USER = "user"
+	TASK_LIST_ID = "task_list_id"
+
+
+@strawberry.input(description="One key of the sort of the tasks, the id is always the last one.")
+class TaskSort:
+	column: TaskSortColumnGQLEnum
+	direction: SortDirectionGQLEnum = SortDirectionGQLEnum.ASC
+	nulls: NullsOrderGQLEnum | None = None
+
+
+@strawberry.input(description="One key of the sort of the task lists, the id is always the last one.")
+class TaskListSort:
+	column: TaskListSortColumnGQLEnum
+	direction: SortDirectionGQLEnum = SortDirectionGQLEnum.ASC
+	nulls: NullsOrderGQLEnum | None = None
+
+
+TaskFilter = model_filter_input(
+	TasksModel,
+	"TaskFilter",
+	enums={Status: StatusGQLEnum, Priority: PriorityGQLEnum},
+)
+TaskListFilter = model_filter_input(TaskListModel, "TaskListFilter")
+
+
+@strawberry.enum
+class TasksActionGQLEnum(Enum):
+	"""What happens to the tasks of a task list that is deleted."""
+
+	DETACH = "detach"
+	DELETE = "delete"
+	MOVE = "move"
+
+
 @strawberry.experimental.pydantic.type(model=TaskGQLResponse)
 class TasksType:
 	status: StatusGQLEnum = strawberry.field(default=StatusGQLEnum.NEW)
@@ -47,6 +130,39 @@ class ListTaskType:
 	id: UUID
 
 
+@strawberry.type
+class BulkMutationResult:
+	affected_rows: int = strawberry.field(
+		description="Number of rows changed by the mutation."
+	)
+	ids: list[UUID] = strawberry.field(description="Ids of the rows changed.")
+
+
+@strawberry.type
+class TaskStatsBucket:
+	status: StatusGQLEnum | None = strawberry.field(
+		default=None, description="Status of the bucket, when it's grouped by status."
+	)
+	priority: PriorityGQLEnum | None = strawberry.field(
+		default=None, description="Priority of the bucket, when it's grouped by priority."
+	)
+	user: UUID | None = strawberry.field(
+		default=None, description="User of the bucket, when it's grouped by user."
+	)
+	task_list_id: UUID | None = strawberry.field(
+		default=None, description="Task list of the bucket, when it's grouped by task list."
+	)
+	count: int = strawberry.field(default=0, description="Number of tasks in the bucket.")
+
+
+@strawberry.type
+class TaskStats:
+	buckets: list[TaskStatsBucket] = strawberry.field(
+		description="One bucket per combination of the grouped columns."
+	)
+	total: int = strawberry.field(description="Number of tasks that match the filter.")
+
+
 # =================================== Input ===========================================
 
 
@@ -100,3 +216,16 @@ class TasksUpdateGQL:
 		default_factory=lambda: datetime.now(UTC)
 	)
 	created_at: datetime | None = None
+
+
+@strawberry.input
+class TasksPatchGQL:
+	"""Columns to set in a bulk update, the fields that aren't sent keep their
+	value (``null`` clears the nullable ones)."""
+
+	status: StatusGQLEnum | None = strawberry.UNSET
+	priority: PriorityGQLEnum | None = strawberry.UNSET
+	user: UUID | None = strawberry.UNSET
+	title: str | None = strawberry.UNSET
+	description: str | None = strawberry.UNSET
+	task_list_id: UUID | None = strawberry.UNSET
@@ -0,0 +1,31 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ResolverCacheSettings(BaseSettings):
+	"""Settings of the cache of the GraphQL resolvers, read from the environment
+	or the .env file with the ``RESOLVER_CACHE_`` prefix (``RESOLVER_CACHE_TTL=600``).
+
+	Args:
+		BaseSettings
+	"""
+
+	enabled: bool = Field(default=True, description="Serve the cached resolvers from Redis.")
+	ttl: int = Field(default=3600, gt=0, description="Seconds a cached result is kept.")
+	local_enabled: bool = Field(
+		default=True, description="Keep the hot results in the memory of the worker too."
+	)
+	local_max_bytes: int = Field(
+		default=64 * 1024 * 1024, gt=0, description="Bytes of the results kept by each worker."
+	)
+	local_ttl: int = Field(
+		default=60,
+		gt=0,
+		description="Seconds a result is kept by the worker, the bound of its staleness if an invalidation is lost.",
+	)
+	model_config = SettingsConfigDict(
+		env_prefix="resolver_cache_",
+		env_file=".env",
+		env_file_encoding="utf-8",
+		extra="ignore",
+	)
@@ -0,0 +1,34 @@
+from enum import Enum
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class FilterPolicy(Enum):
+	"""What to do with a filter that can't use an index."""
+
+	ALLOW = "allow"
+	WARN = "warn"
+	REJECT = "reject"
+	REQUIRE_LIMIT = "require_limit"
+
+
+class FilterPlannerSettings(BaseSettings):
+	"""Settings of the filter planner, read from the environment or the .env file
+	with the ``FILTER_PLANNER_`` prefix (``FILTER_PLANNER_POLICY=reject``).
+
+	Args:
+		BaseSettings
+	"""
+
+	policy: FilterPolicy = Field(default=FilterPolicy.WARN)
+	explain: bool = Field(
+		default=False,
+		description="Add the EXPLAIN cost of the filtered queries to the GraphQL response extensions.",
+	)
+	model_config = SettingsConfigDict(
+		env_prefix="filter_planner_",
+		env_file=".env",
+		env_file_encoding="utf-8",
+		extra="ignore",
+	)
@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class LocalEntry:
+	value: bytes
+	expires_at: float
+	tags: tuple[str, ...]
+
+
+class LocalCache:
+	"""LRU of the worker in front of Redis, bounded by the bytes of the values
+	(the JSON of the results of the resolvers) and with a TTL per entry. The keys
+	are indexed by tag, so the invalidation of a tag doesn't read Redis.
+
+	:attr:`generation` changes with each invalidation, a result read before an
+	invalidation isn't stored after it:
+
+	.. code-block:: python
+
+		generation = local_cache.generation
+		value = await redis.get(key)
+		local_cache.set(key, value, ("tasks",), generation=generation)
+		local_cache.info()  # {"hits": 0, "misses": 0, "size": 1, "bytes": 812, ...}
+	"""
+
+	def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60) -> None:
+		self.max_bytes = max_bytes
+		self.ttl = ttl
+		self.hits = 0
+		self.misses = 0
+		self.bytes = 0
+		self.generation = 0
+		self._entries: OrderedDict[str, LocalEntry] = OrderedDict()
+		self._tags: dict[str, set[str]] = {}
+
+	def get(self, key: str) -> bytes | None:
+		entry = self._entries.get(key)
+		if entry is None or entry.expires_at <= time.monotonic():
+			if entry is not None:
+				self._pop(key)
+			self.misses += 1
+			return None
+		self.hits += 1
+		self._entries.move_to_end(key)
+		return entry.value
+
+	def set(
+		self,
+		key: str,
+		value: bytes,
+		tags: Iterable[str] = (),
+		ttl: float | None = None,
+		generation: int | None = None,
+	) -> bool:
+		"""Store the value, the least recently used entries are evicted until it
+		fits. Values bigger than the cache and values read before the last
+		invalidation (``generation``) aren't stored."""
+		if len(value) > self.max_bytes or (
+			generation is not None and generation != self.generation
+		):
+			return False
+		self._pop(key)
+		entry = LocalEntry(value, time.monotonic() + (ttl or self.ttl), tuple(tags))
+		self._entries[key] = entry
+		self.bytes += len(value)
+		for tag in entry.tags:
+			self._tags.setdefault(tag, set()).add(key)
+		while self.bytes > self.max_bytes:
+			self._pop(next(iter(self._entries)))
+		return True
+
+	def invalidate_tags(self, tags: Iterable[str]) -> int:
+		self.generation += 1
+		keys = set().union(*(self._tags.pop(tag, ()) for tag in tags))
+		for key in keys:
+			self._pop(key)
+		return len(keys)
+
+	def _pop(self, key: str) -> None:
+		entry = self._entries.pop(key, None)
+		if entry is None:
+			return
+		self.bytes -= len(entry.value)
+		for tag in entry.tags:
+			if (keys := self._tags.get(tag)) is not None:
+				keys.discard(key)
+				if not keys:
+					del self._tags[tag]
+
+	def info(self) -> dict[str, int]:
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"size": len(self._entries),
+			"bytes": self.bytes,
+			"max_bytes": self.max_bytes,
+		}
+
+	def clear(self) -> None:
+		self.generation += 1
+		self._entries.clear()
+		self._tags.clear()
+		self.bytes = self.hits = self.misses = 0
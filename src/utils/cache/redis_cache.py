@@ -1,14 +1,35 @@
+import asyncio
+import dataclasses
 import hashlib
 import json
-from collections.abc import Callable
-from typing import Annotated, Any
+from collections.abc import Callable, Sequence
+from enum import Enum
+from functools import wraps
+from typing import Any, get_type_hints
 
-from fastapi import Depends
 from graphql import parse, print_ast
+from loguru import logger
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from strawberry import Info
 
+from settings.cache_settings import ResolverCacheSettings
+from utils.cache.local_cache import LocalCache
+from utils.cache.serializer import dump_result, load_result
 from utils.dependencies.redis_cache import get_master, get_replica
+from utils.fastapi.observability.metrics import (
+	RESOLVER_CACHE_HITS,
+	RESOLVER_CACHE_INVALIDATIONS,
+	RESOLVER_CACHE_LOCAL_BYTES,
+	RESOLVER_CACHE_MISSES,
+)
+
+INVALIDATION_CHANNEL = "resolver_cache:invalidate"
+
+settings = ResolverCacheSettings()
+# L1 of each worker, Redis is the L2 shared by every worker.
+local_cache = LocalCache(max_bytes=settings.local_max_bytes, ttl=settings.local_ttl)
+RESOLVER_CACHE_LOCAL_BYTES.set_function(lambda: local_cache.bytes)
 
 
 def normalize_query(query: str) -> str:
@@ -28,44 +49,189 @@ def generate_cache_key(query: str, variables: dict[str, Any]) -> str:
 	return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
 
 
-def tag_cache_key(key: str, tag: str, redis_master: Redis) -> None:
+def to_json(value: Any) -> Any:
+	"""JSON of the values of the arguments: the input types are dataclasses and
+	the enums are serialized by value, anything else (UUID, datetime) as string."""
+	if dataclasses.is_dataclass(value) and not isinstance(value, type):
+		return dataclasses.asdict(value)
+	if isinstance(value, Enum):
+		return value.value
+	return str(value)
+
+
+def resolver_cache_key(info: Info[Any, Any]) -> str:
+	"""Key of the result of a resolver: the field with its arguments (variables
+	already replaced) and the selection set, fragments included. Two queries that
+	ask the same field with the same arguments and selection share the key.
+
+	.. code-block:: python
+
+		resolver_cache_key(info)  # "resolver:tasks:5f0c..."
 	"""
-	Associate a cache key with tags for invalidation (mutations)
+	selection = [dataclasses.asdict(field) for field in info.selected_fields]
+	digest = hashlib.sha256(
+		json.dumps(selection, sort_keys=True, default=to_json).encode()
+	).hexdigest()
+	return f"resolver:{info.field_name}:{digest}"
+
+
+def generation_keys(tags: Sequence[str]) -> list[str]:
+	"""Keys of the generations of the tags, they never expire."""
+	return [f"tag:{tag}:generation" for tag in tags]
+
+
+def tags_version(generations: Sequence[bytes | None]) -> bytes:
+	"""Version of a cached result: the generations of its tags when it was
+	resolved, a tag that was never invalidated is the generation 0."""
+	return b".".join(generation or b"0" for generation in generations)
+
+
+async def invalidate_tag(tags: Sequence[str], redis_master: Redis) -> list[int]:
+	"""Bump the generation of the tags and publish them in :data:`INVALIDATION_CHANNEL`
+	(so every worker drops them from its local cache) in one ``MULTI``/``EXEC``
+	of the master. The results of the previous generations are never read
+	again and age out with their TTL, so the invalidation is O(1) per tag
+	whatever the number of cached results.
+
+	Returns:
+		list[int]: The new generations of the tags.
 	"""
-	redis_master.sadd(f"tag:{tag}", key)
+	async with redis_master.pipeline(transaction=True) as pipe:
+		for key in generation_keys(tags):
+			pipe.incr(key)
+		pipe.publish(INVALIDATION_CHANNEL, ",".join(tags))
+		*generations, _ = await pipe.execute()
+	for tag in tags:
+		RESOLVER_CACHE_INVALIDATIONS.labels(tag=tag).inc()
+	return generations
+
 
+async def invalidate_cache(*tags: str) -> None:
+	"""Invalidate the tags of the resolver cache, called by the mutations after
+	the commit. The local cache of this worker is invalidated right away, the
+	other workers receive the tags from Redis pub/sub. The errors of Redis are
+	logged and ignored, the cached results expire with their TTL.
 
-async def invalidate_tag(
-	tags: list[str], redis_master: Redis, redis_replica: Redis
+	.. code-block:: python
+
+		await invalidate_cache("tasks", "task_list")
+	"""
+	if not settings.enabled:
+		return
+	local_cache.invalidate_tags(tags)
+	try:
+		await invalidate_tag(tags, await get_master())
+	except RedisError as e:
+		logger.warning(f"The resolver cache tags {tags} weren't invalidated: {e}")
+
+
+async def listen_invalidations(retry_delay: float = 1.0) -> None:
+	"""Invalidate the tags published by the other workers in the local cache,
+	runs while the application is alive (see the lifespan of ``main``). The
+	invalidations published while the worker is disconnected are lost, so the
+	local cache is cleared each time it subscribes.
+	"""
+	while True:
+		try:
+			redis_master = await get_master()
+			async with redis_master.pubsub() as pubsub:
+				await pubsub.subscribe(INVALIDATION_CHANNEL)
+				local_cache.clear()
+				async for message in pubsub.listen():
+					if message["type"] == "message":
+						local_cache.invalidate_tags(message["data"].decode().split(","))
+		except RedisError as e:
+			logger.warning(f"The resolver cache invalidations can't be received: {e}")
+			local_cache.clear()
+			await asyncio.sleep(retry_delay)
+
+
+def cache_locally(
+	key: str, value: bytes, tags: Sequence[str], ttl: int, generation: int
 ) -> None:
-	for tag in tags:
-		keys = await redis_replica.smembers(f"tag:{tag}")  # type: ignore # this is ignored 'cause the response can be an Awaitable or not
-		for key in keys:
-			redis_master.delete(key)
-		redis_master.delete(f"tag:{tag}")
+	"""Keep the result in the local cache, never longer than in Redis."""
+	if settings.local_enabled:
+		local_cache.set(key, value, tags, min(ttl, settings.local_ttl), generation)
+
+
+def resolver_return_type(func: Callable[..., Any]) -> Any:
+	"""Return annotation of the resolver, Any (the plain JSON) without it."""
+	try:
+		return get_type_hints(func).get("return", Any)
+	except TypeError:
+		return Any
 
 
 def cache_resolver(
-	redis_client: Annotated[Redis, Depends(get_replica)],
-	redis_master: Annotated[Redis, Depends(get_master)],
-	tag: str,
-	ttl: int = 3600,
-) -> Callable[..., Any]:
+	tags: Sequence[str], ttl: int | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	"""Cache the result of an async resolver in two tiers: the memory of the
+	worker (:data:`local_cache`) and Redis, read from the replica and written in
+	the master with the ``tags`` that invalidate it. The results are stored as
+	JSON and rebuilt as the return annotation of the resolver (strawberry types,
+	lists, enums, UUIDs and datetimes), so whoever writes in Redis can't run code
+	in the workers. If Redis fails the resolver runs as if the cache didn't exist.
+
+	The result in Redis is stored with the version of its tags, read with the
+	current generations in one ``MGET``: a result of an older generation is a
+	miss. The version is the one read before resolving, so a result resolved
+	while its tags are invalidated is already stale when it's written.
+
+	Args:
+		tags (Sequence[str]): Tags of the cached results, see :func:`invalidate_cache`.
+		ttl (int | None): Seconds the result is kept. Defaults to ``RESOLVER_CACHE_TTL``.
+
+	Returns:
+		Callable: The decorator, the resolver keeps its signature for strawberry.
+
+	.. code-block:: python
+
+		@cache_resolver(tags=("tasks",))
+		async def all_tasks(self, info: strawberry.Info, limit: int) -> PaginationWindow[TasksType]: ...
+	"""
+
 	def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-		async def wrapper(*args: tuple[Any, Any], **kwargs: dict[str, Any]) -> Any:
-			info: Info[Any, Any] = kwargs.get("info")  #  type: ignore
-			query = info.context["query"]
-			variables = info.context.get("variables", {})
-
-			cache_key = generate_cache_key(query, variables)
-			cached_response = await redis_client.get(cache_key)
-			if cached_response:
-				info.context["cache_source"] = "cache"
-				return json.loads(cached_response)
+		return_type = resolver_return_type(func)
+
+		@wraps(func)
+		async def wrapper(*args: Any, **kwargs: Any) -> Any:
+			if not settings.enabled:
+				return await func(*args, **kwargs)
+			info: Info[Any, Any] = kwargs["info"]
+			cache_key = resolver_cache_key(info)
+			if settings.local_enabled and (cached := local_cache.get(cache_key)) is not None:
+				RESOLVER_CACHE_HITS.labels(resolver=info.field_name, tier="local").inc()
+				return load_result(return_type, cached)
+			generation = local_cache.generation
+			try:
+				redis_client = await get_replica()
+				cached_response, *generations = await redis_client.mget(
+					cache_key, *generation_keys(tags)
+				)
+			except RedisError as e:
+				logger.warning(f"The resolver cache can't be read: {e}")
+				return await func(*args, **kwargs)
+			version = tags_version(generations)
+			if cached_response is not None:
+				cached_version, _, cached_value = cached_response.partition(b"\n")
+				if cached_version == version:
+					try:
+						result = load_result(return_type, cached_value)
+					except (AttributeError, TypeError, ValueError) as e:
+						logger.warning(f"The resolver cache {cache_key} can't be decoded: {e}")
+					else:
+						RESOLVER_CACHE_HITS.labels(resolver=info.field_name, tier="redis").inc()
+						cache_locally(cache_key, cached_value, tags, ttl or settings.ttl, generation)
+						return result
+			RESOLVER_CACHE_MISSES.labels(resolver=info.field_name).inc()
 			result = await func(*args, **kwargs)
-			await redis_master.setex(cache_key, ttl, json.dumps(result))
-			tag_cache_key(cache_key, tag, redis_master)
-			info.context["cache_source"] = "database"
+			value = dump_result(result)
+			cache_locally(cache_key, value, tags, ttl or settings.ttl, generation)
+			try:
+				redis_master = await get_master()
+				await redis_master.setex(cache_key, ttl or settings.ttl, version + b"\n" + value)
+			except RedisError as e:
+				logger.warning(f"The resolver cache can't be written: {e}")
 			return result
 
 		return wrapper
@@ -0,0 +1,100 @@
+import dataclasses
+import json
+from datetime import datetime
+from enum import Enum
+from types import NoneType, UnionType
+from typing import Any, TypeVar, Union, get_args, get_origin, get_type_hints
+from uuid import UUID
+
+from pydantic import BaseModel
+from strawberry.types.base import StrawberryList, StrawberryOptional
+from strawberry.types.enum import StrawberryEnumDefinition
+
+
+def to_json(value: Any) -> Any:
+	"""JSON of the values of a result: the strawberry types (dataclasses) and the
+	pydantic models by their fields, only the loaded ones of a projected model."""
+	if isinstance(value, BaseModel):
+		return {
+			name: getattr(value, name)
+			for name in type(value).model_fields
+			if hasattr(value, name)
+		}
+	if dataclasses.is_dataclass(value) and not isinstance(value, type):
+		return {
+			field.name: getattr(value, field.name)
+			for field in dataclasses.fields(value)
+		}
+	if isinstance(value, Enum):
+		return value.value
+	if isinstance(value, datetime):
+		return value.isoformat()
+	if isinstance(value, UUID):
+		return str(value)
+	raise TypeError(f"{type(value).__name__} can't be cached")
+
+
+def dump_result(value: Any) -> bytes:
+	"""Serialize the result of a resolver to JSON, see :func:`load_result`."""
+	return json.dumps(value, default=to_json, separators=(",", ":")).encode()
+
+
+def from_json(
+	annotation: Any, value: Any, type_vars: dict[TypeVar, Any] | None = None
+) -> Any:
+	"""Rebuild the value of the annotation from its JSON. The dataclasses (the
+	strawberry types) are built with the fields found in the JSON, the missing
+	ones (not selected) are None."""
+	type_vars = type_vars or {}
+	annotation = type_vars.get(annotation, annotation)
+	if value is None or annotation is Any:
+		return value
+	# The strawberry pydantic types annotate their fields with the strawberry types.
+	match annotation:
+		case StrawberryOptional():
+			return from_json(annotation.of_type, value, type_vars)
+		case StrawberryList():
+			return [from_json(annotation.of_type, item, type_vars) for item in value]
+		case StrawberryEnumDefinition():
+			return annotation.wrapped_cls(value)
+	origin, args = get_origin(annotation), get_args(annotation)
+	if origin in (Union, UnionType):
+		members = [arg for arg in args if arg is not NoneType]
+		if len(members) != 1:
+			raise TypeError(f"{annotation} can't be cached, only optional types")
+		return from_json(members[0], value, type_vars)
+	if origin is list:
+		return [from_json(args[0], item, type_vars) for item in value]
+	cls = origin or annotation
+	if isinstance(cls, type) and issubclass(cls, Enum | UUID):
+		return cls(value)
+	if dataclasses.is_dataclass(cls):
+		hints = get_type_hints(cls)
+		type_vars = {
+			**type_vars,
+			**dict(zip(getattr(cls, "__type_params__", ()), args, strict=False)),
+		}
+		return cls(
+			**{
+				field.name: from_json(
+					hints[field.name], value.get(field.name), type_vars
+				)
+				for field in dataclasses.fields(cls)
+				if field.init
+			}
+		)
+	if cls is datetime:
+		return datetime.fromisoformat(value)
+	return value
+
+
+def load_result(annotation: Any, data: bytes) -> Any:
+	"""Rebuild a result of :func:`dump_result` as the return annotation of the
+	resolver, unlike pickle the cached bytes can't run code.
+
+	.. code-block:: python
+
+		load_result(PaginationWindow[TasksType], dump_result(window))
+		# PaginationWindow(items=[TasksType(...)], ...)
+	"""
+	return from_json(annotation, json.loads(data))
@@ -0,0 +1,80 @@
+from enum import Enum
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class CountMode(Enum):
+	EXACT = "exact"
+	ESTIMATE = "estimate"
+	CACHED = "cached"
+
+
+class CountProvider:
+	"""Provide the total number of rows of a table with three modes:
+
+		- exact: ``count(*)`` over the whole table, a sequential scan on big tables.
+		- estimate: the planner statistics (``pg_class.reltuples``), free but only
+		as fresh as the last ``ANALYZE``/autovacuum.
+		- cached: an exact count kept per model for ``ttl`` seconds, the create and
+		delete mutations adjust it with :meth:`adjust` in the meantime.
+
+	.. code-block:: python
+
+		total = await count_provider.count(db, Tasks, CountMode.CACHED)
+		count_provider.adjust(Tasks, 1)  # after creating one task
+	"""
+
+	def __init__(self, ttl: float = 60.0) -> None:
+		self.ttl = ttl
+		self._counts: dict[str, tuple[int, float]] = {}
+
+	async def count(self, db: AsyncSession, model: Any, mode: CountMode) -> int:
+		"""Return the total number of rows of the model using the given mode."""
+		match mode:
+			case CountMode.EXACT:
+				return await self.exact(db, model)
+			case CountMode.ESTIMATE:
+				return await self.estimate(db, model)
+			case CountMode.CACHED:
+				return await self.cached(db, model)
+
+	async def exact(self, db: AsyncSession, model: Any) -> int:
+		total = await db.scalar(select(func.count()).select_from(model))
+		self.store(model, total)  # type: ignore
+		return total  # type: ignore
+
+	async def estimate(self, db: AsyncSession, model: Any) -> int:
+		estimate = await db.scalar(
+			text(
+				"SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+			),
+			{"table": model.__tablename__},
+		)
+		# reltuples is -1 until the table is analyzed for the first time.
+		if estimate is None or estimate < 0:
+			return await self.exact(db, model)
+		return estimate
+
+	async def cached(self, db: AsyncSession, model: Any) -> int:
+		entry = self._counts.get(model.__tablename__)
+		if entry is not None and entry[1] > monotonic():
+			return entry[0]
+		return await self.exact(db, model)
+
+	def store(self, model: Any, total: int) -> None:
+		"""Save an exact count of the model, it's valid for ``ttl`` seconds."""
+		self._counts[model.__tablename__] = (total, monotonic() + self.ttl)
+
+	def adjust(self, model: Any, delta: int) -> None:
+		"""Add ``delta`` to the cached count of the model, if there is one."""
+		if (entry := self._counts.get(model.__tablename__)) is not None:
+			self._counts[model.__tablename__] = (max(entry[0] + delta, 0), entry[1])
+
+	def invalidate(self, model: Any) -> None:
+		self._counts.pop(model.__tablename__, None)
+
+
+count_provider = CountProvider()
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
-from typing import Any, Literal
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 
+from utils.db.sort import Direction, SortSpec
+
 
 class GeneralCrudAsync[T](ABC):
 	"""Class that define the factory to create a crud for any Entity
@@ -12,18 +14,31 @@ class GeneralCrudAsync[T](ABC):
 	Methods:
 		- get_entity
 		- get_entity_pagination
+		- get_entity_keyset
 		- create_entity
+		- create_entities
 		- update_entity
+		- update_entity_with_previous
+		- update_entities
 		- delete_entity
+		- delete_entities
 		- get_entity_by_id
+		- get_entities_by_ids
 		- get_entity_by_args
+		- get_entity_counts
+		- get_entity_facets
 	"""
 
 	def __init__(self, model: T) -> None:
 		self.model = model
 
 	@abstractmethod
-	async def get_entity(self, db: AsyncSession, filter: tuple[Any]) -> Sequence[T]:
+	async def get_entity(
+		self,
+		db: AsyncSession,
+		filter: tuple[Any],
+		columns: Sequence[str] | None = None,
+	) -> Sequence[T]:
 		pass
 
 	@abstractmethod
@@ -32,14 +47,42 @@ class GeneralCrudAsync[T](ABC):
 		db: AsyncSession,
 		limit: int,
 		offset: int,
-		order_by: Literal["asc", "desc"],
+		order_by: Direction | Sequence[SortSpec],
 		filter: tuple[Any],
+		with_counts: bool = True,
+		with_total: bool = True,
+		load: Any | None = None,
+		columns: Sequence[str] | None = None,
 		**kwargs,
-	) -> tuple[Sequence[T], int]:
+	) -> tuple[Sequence[T], int | None, int | None]:
+		pass
+
+	@abstractmethod
+	async def get_entity_keyset(
+		self,
+		db: AsyncSession,
+		limit: int,
+		order_by: Direction | Sequence[SortSpec],
+		filter: tuple[Any],
+		after: str | None = None,
+		before: str | None = None,
+		sort_columns: Sequence[InstrumentedAttribute[Any]] | None = None,
+		load: Any | None = None,
+		columns: Sequence[str] | None = None,
+		**kwargs,
+	) -> tuple[Sequence[T], bool]:
+		pass
+
+	@abstractmethod
+	async def create_entity(
+		self, entity_schema: Any, db: AsyncSession, commit: bool = True
+	) -> T:
 		pass
 
 	@abstractmethod
-	async def create_entity(self, entity_schema: Any, db: AsyncSession) -> T:
+	async def create_entities(
+		self, entity_schemas: Sequence[Any], db: AsyncSession, chunk_size: int = 1000
+	) -> list[T]:
 		pass
 
 	@abstractmethod
@@ -52,14 +95,65 @@ class GeneralCrudAsync[T](ABC):
 	) -> T:
 		pass
 
+	@abstractmethod
+	async def update_entity_with_previous(
+		self,
+		entity_id: int | str,
+		entity_schema: dict[str, Any],
+		db: AsyncSession,
+		filter: tuple[Any] | None = None,
+	) -> tuple[T, T]:
+		pass
+
+	@abstractmethod
+	async def update_entities_with_previous(
+		self,
+		entity_schema: dict[str, Any],
+		db: AsyncSession,
+		filter: tuple[Any],
+		commit: bool = True,
+	) -> list[tuple[T, T]]:
+		pass
+
+	@abstractmethod
+	async def update_entities(
+		self,
+		entity_schema: dict[str, Any],
+		db: AsyncSession,
+		filter: tuple[Any],
+		commit: bool = True,
+	) -> list[T]:
+		pass
+
+	@abstractmethod
+	async def delete_entities(
+		self, db: AsyncSession, filter: tuple[Any], commit: bool = True
+	) -> list[T]:
+		pass
+
 	@abstractmethod
 	async def delete_entity(
-		self, entity_id: int | str, db: AsyncSession, filter: tuple[Any]
-	) -> None:
+		self,
+		entity_id: int | str,
+		db: AsyncSession,
+		filter: tuple[Any],
+		returning: Sequence[str] | None = None,
+	) -> T | None:
+		pass
+
+	@abstractmethod
+	async def get_entity_by_id(
+		self, entity_id: int | str, db: AsyncSession, load: Any | None = None
+	) -> T:
 		pass
 
 	@abstractmethod
-	async def get_entity_by_id(self, entity_id: int | str, db: AsyncSession) -> T:
+	async def get_entities_by_ids(
+		self,
+		entity_ids: Sequence[Any],
+		db: AsyncSession,
+		column: InstrumentedAttribute[Any] | None = None,
+	) -> Sequence[T]:
 		pass
 
 	@abstractmethod
@@ -71,3 +165,21 @@ class GeneralCrudAsync[T](ABC):
 		filter: tuple[Any],
 	) -> T | None:
 		pass
+
+	@abstractmethod
+	async def get_entity_counts(
+		self,
+		db: AsyncSession,
+		group_by: Sequence[str],
+		filter: tuple[Any],
+	) -> list[tuple[dict[str, Any], int]]:
+		pass
+
+	@abstractmethod
+	async def get_entity_facets(
+		self,
+		db: AsyncSession,
+		columns: Sequence[str],
+		filter: tuple[Any],
+	) -> dict[str, list[tuple[Any, int]]]:
+		pass
@@ -0,0 +1,95 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from datetime import datetime
+from enum import Enum
+from json import dumps, loads
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from utils.exceptions import InvalidParameter
+
+
+def _serialize(value: Any) -> Any:
+	if isinstance(value, UUID):
+		return str(value)
+	if isinstance(value, datetime):
+		return value.isoformat()
+	if isinstance(value, Enum):
+		return value.name
+	return value
+
+
+def _deserialize(column: InstrumentedAttribute[Any], value: Any) -> Any:
+	if value is None:
+		return None
+	python_type = column.type.python_type
+	if issubclass(python_type, Enum):
+		return python_type[value]
+	if issubclass(python_type, datetime):
+		return datetime.fromisoformat(value)
+	if issubclass(python_type, UUID):
+		return UUID(value)
+	return python_type(value)
+
+
+def encode_cursor(
+	columns: Sequence[InstrumentedAttribute[Any]], values: Sequence[Any]
+) -> str:
+	"""Build an opaque cursor with the sort key of one row.
+
+	Args:
+		columns (Sequence[InstrumentedAttribute[Any]]): Columns used to sort, the last one is the tiebreaker (id).
+		values (Sequence[Any]): Values of the row for each column.
+
+	Returns:
+		str: Url safe base64 string.
+
+	.. code-block:: python
+
+		cursor = encode_cursor([Tasks.created_at, Tasks.id], [task.created_at, task.id])
+	"""
+	payload = {
+		"k": [column.key for column in columns],
+		"v": [_serialize(value) for value in values],
+	}
+	return urlsafe_b64encode(dumps(payload).encode()).decode()
+
+
+def encode_entity_cursor(
+	columns: Sequence[InstrumentedAttribute[Any]], entity: Any
+) -> str:
+	"""Same as :func:`encode_cursor` but reading the values from an entity."""
+	return encode_cursor(columns, [getattr(entity, column.key) for column in columns])
+
+
+def decode_cursor(
+	cursor: str, columns: Sequence[InstrumentedAttribute[Any]]
+) -> tuple[Any, ...]:
+	"""Decode a cursor created with :func:`encode_cursor`.
+
+	Args:
+		cursor (str): Opaque cursor sent by the client.
+		columns (Sequence[InstrumentedAttribute[Any]]): Columns expected in the cursor.
+
+	Raises:
+		InvalidParameter: If the cursor is malformed or was created with other sort columns.
+
+	Returns:
+		tuple[Any, ...]: The values converted to the python type of each column.
+	"""
+	try:
+		payload = loads(urlsafe_b64decode(cursor.encode()))
+		keys, values = payload["k"], payload["v"]
+	except (ValueError, KeyError, TypeError) as err:
+		raise InvalidParameter("Invalid cursor") from err
+	if keys != [column.key for column in columns] or len(values) != len(columns):
+		raise InvalidParameter("The cursor doesn't match the sort of the query")
+	try:
+		return tuple(
+			_deserialize(column, value)
+			for column, value in zip(columns, values, strict=True)
+		)
+	except (ValueError, KeyError, TypeError) as err:
+		raise InvalidParameter("Invalid cursor") from err
@@ -1,11 +1,29 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from json import loads
 from typing import Any
 
-import icecream
+from sqlalchemy import Date, DateTime, and_, func
 from sqlalchemy.sql import operators
 from sqlalchemy.sql.operators import Operators
 
+from utils.exceptions import InvalidParameter
+
+
+def similar_op(column: Any, value: Any) -> Any:
+	"""Trigram similarity of pg_trgm. ``text`` uses the ``%`` operator (similarity
+	over ``pg_trgm.similarity_threshold``, 0.3 by default), ``[text, threshold]``
+	also requires ``similarity(column, text) >= threshold``. Both are served by the
+	trigram indexes, a threshold under ``pg_trgm.similarity_threshold`` finds nothing
+	more than the default one."""
+	if isinstance(value, list | tuple):
+		text, threshold = value
+		return and_(column.op("%")(text), func.similarity(column, text) >= threshold)
+	return column.op("%")(value)
+
+
 operator_map = {
 	"=": operators.eq,
 	"!=": operators.ne,
@@ -14,12 +32,172 @@ operator_map = {
 	"<": operators.lt,
 	"<=": operators.le,
 	"like": operators.like_op,
+	"ilike": operators.ilike_op,
+	"similar": similar_op,
 	"in": operators.in_op,
 	"btw": operators.between_op,
 }
 
+COMPARISONS = frozenset(("=", "!=", ">", ">=", "<", "<="))
+
+
+def to_date(value: Any) -> Any:
+	"""Convert a ``YYYY-MM-DD`` string to a datetime, other values are returned as is."""
+	if isinstance(value, str):
+		try:
+			return datetime.strptime(value, "%Y-%m-%d")
+		except ValueError:
+			pass
+	return value
+
+
+def identity(value: Any) -> Any:
+	return value
+
+
+def get_coercer(column: Any, operator: str) -> Callable[[Any], Any]:
+	"""Conversion of the values of a column, chosen once from the type of the
+	column: only the comparisons of date/datetime columns parse the strings."""
+	if operator not in COMPARISONS:
+		return identity
+	type_ = getattr(getattr(column, "expression", None), "type", None)
+	if isinstance(type_, DateTime | Date):
+		return to_date
+	return identity
+
+
+def get_column(model_db: Any, column_name: str) -> tuple[Any, tuple[Any, ...]]:
+	"""Column of the model and the relationships to reach it, dotted names are
+	columns of a relationship (``task_list.name``, ``tasks.task_list.name``).
+	The column is None when a part of the path doesn't exist."""
+	*rel_names, name = column_name.split(".")
+	path = []
+	for rel_name in rel_names:
+		relationship = getattr(model_db, rel_name, None)
+		if relationship is None or not hasattr(relationship.property, "mapper"):
+			return None, ()
+		path.append(relationship)
+		model_db = relationship.property.mapper.class_
+	return getattr(model_db, name, None), tuple(path)
 
-def get_filters(filters: str, model_db: Any) -> tuple[Any] | tuple[Operators]:
+
+def related_exists(path: tuple[Any, ...], conditions: list[Any]) -> Any:
+	"""Correlated ``EXISTS`` of the conditions of a relationship path, ``any()``
+	for the one-to-many relationships and ``has()`` for the many-to-one. The
+	page keeps one row per entity, the related rows are never joined."""
+	condition = and_(*conditions)
+	for relationship in reversed(path):
+		if relationship.property.uselist:
+			condition = relationship.any(condition)
+		else:
+			condition = relationship.has(condition)
+	return condition
+
+
+@dataclass(frozen=True, slots=True)
+class FilterTerm:
+	column: Any
+	operator: Callable[..., Any]
+	coerce: Callable[[Any], Any]
+	between: bool
+	path: tuple[Any, ...] = ()
+
+	def bind(self, value: Any) -> Any:
+		if self.between:
+			return self.operator(self.column, self.coerce(value[0]), self.coerce(value[1]))
+		return self.operator(self.column, self.coerce(value))
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledFilter:
+	"""Filter with the columns, operators and conversions already resolved, one
+	term per filter of the shape (None when the column doesn't exist). The
+	terms of the same relationship path are combined in one ``EXISTS``, so
+	``tasks.status`` and ``tasks.priority`` must match the same task."""
+
+	terms: tuple[FilterTerm | None, ...]
+
+	def bind(self, values: list[Any]) -> tuple[Any] | tuple[Operators]:
+		conditions = []
+		related: dict[tuple[Any, ...], list[Any]] = {}
+		for term, value in zip(self.terms, values, strict=True):
+			if term is None:
+				continue
+			if term.path:
+				related.setdefault(term.path, []).append(term.bind(value))
+			else:
+				conditions.append(term.bind(value))
+		conditions.extend(related_exists(path, related[path]) for path in related)
+		return tuple(conditions)  # type: ignore
+
+
+def compile_filter(model_db: Any, shape: tuple[tuple[str, str], ...]) -> CompiledFilter:
+	terms = []
+	for column_name, operator in shape:
+		column, path = get_column(model_db, column_name)
+		if column is None:
+			terms.append(None)
+			continue
+		terms.append(
+			FilterTerm(
+				column=column,
+				operator=operator_map[operator],
+				coerce=get_coercer(column, operator),
+				between=operator == "btw",
+				path=path,
+			)
+		)
+	return CompiledFilter(terms=tuple(terms))
+
+
+class FilterCache:
+	"""LRU of the compiled filters, keyed by the model and the shape of the
+	filter (the columns and operators without the values). A filter with a
+	known shape only binds its values, the columns aren't resolved again.
+
+	.. code-block:: python
+
+		filter_cache.get(Tasks, (("status", "="),)).bind(["completed"])
+		filter_cache.info()  # {"hits": 1, "misses": 1, "size": 1, "maxsize": 256}
+	"""
+
+	def __init__(self, maxsize: int = 256) -> None:
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self._filters: OrderedDict[tuple[Any, ...], CompiledFilter] = OrderedDict()
+
+	def get(self, model_db: Any, shape: tuple[tuple[str, str], ...]) -> CompiledFilter:
+		key = (model_db, shape)
+		if (compiled := self._filters.get(key)) is not None:
+			self.hits += 1
+			self._filters.move_to_end(key)
+			return compiled
+		self.misses += 1
+		compiled = self._filters[key] = compile_filter(model_db, shape)
+		if len(self._filters) > self.maxsize:
+			self._filters.popitem(last=False)
+		return compiled
+
+	def info(self) -> dict[str, int]:
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"size": len(self._filters),
+			"maxsize": self.maxsize,
+		}
+
+	def clear(self) -> None:
+		self._filters.clear()
+		self.hits = self.misses = 0
+
+
+filter_cache = FilterCache()
+
+
+def get_filters(
+	filters: str, model_db: Any, strict: bool = False
+) -> tuple[Any] | tuple[Operators]:
 	"""
 	Convert a string of filters to a tuple with the real Operations.
 	The operations available are:
@@ -30,11 +208,24 @@ def get_filters(filters: str, model_db: Any) -> tuple[Any] | tuple[Operators]:
 		- >=
 		- <=
 		- like
+		- ilike
+		- similar (pg_trgm similarity, ``"text"`` or ``["text", threshold]``)
 		- in
 		- btw
+
+	The columns of each shape of filter are resolved once and kept in
+	:data:`filter_cache`, the following calls only convert and bind the values.
+	The columns of a relationship (``tasks.status``) are filtered with a
+	correlated ``EXISTS`` instead of a join, see :func:`related_exists`.
+	The filters of columns that don't exist are ignored, unless ``strict``.
+
 	Args:
 		filters (str): A string with `n` filters used in any operation in the db.
 		model_db (Any): Model where the filter should be applied
+		strict (bool): Raise if a column doesn't exist, the bulk updates and
+			deletes would affect more rows without the filter.
+	Raises:
+		InvalidParameter: If ``strict`` and a column of the filter doesn't exist.
 	Returns:
 		tuple[Any] | tuple[Operators] :A tuple with the applied filters.
 
@@ -43,33 +234,15 @@ def get_filters(filters: str, model_db: Any) -> tuple[Any] | tuple[Operators]:
 	.. code-block:: python
 		filter = "[["id", "=", 1]]"
 		get_filters(filters=filter, model_db: Employee)"""
-	filter_ = ()
 	if not filters:
-		return filter_
+		return ()
 
 	filter_list: list[Any] = loads(filters)
-	for column_name, operator, value in filter_list:
-		# Handle dotted notation for relationships
-		if "." in column_name:
-			rel_name, sub_column = column_name.split(".", 1)
-			rel_model = getattr(model_db, rel_name).property.mapper.class_
-			column = getattr(rel_model, sub_column, None)
-		else:
-			column = getattr(model_db, column_name, None)
-
-		if column is None:
-			continue
-
-		# Handle datetime conversion
-		if isinstance(value, str) and operator in ["=", "!=", ">", ">=", "<", "<="]:
-			try:
-				value = datetime.strptime(value, "%Y-%m-%d")
-			except ValueError:
-				pass
-		# Build filter expression
-		if operator != "btw":
-			filter_ += (operator_map[operator](column, value),)
-		else:
-			filter_ += (operator_map[operator](column, value[0], value[1]),)
-		icecream.ic(filter_)
-	return filter_
+	shape = tuple((column_name, operator) for column_name, operator, _ in filter_list)
+	compiled = filter_cache.get(model_db, shape)
+	unknown = [
+		name for (name, _), term in zip(shape, compiled.terms, strict=True) if term is None
+	]
+	if strict and unknown:
+		raise InvalidParameter(f"Unknown columns in the filter: {', '.join(unknown)}")
+	return compiled.bind([value for *_, value in filter_list])
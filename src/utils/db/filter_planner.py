@@ -0,0 +1,275 @@
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+import sqlalchemy as sa
+from loguru import logger
+from prometheus_client import Counter
+from sqlalchemy import ClauseElement, ColumnElement, Executable, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import elements, operators, selectable
+
+from settings.filter_settings import FilterPlannerSettings, FilterPolicy
+from utils.exceptions import InvalidParameter
+
+UNINDEXED_FILTERS = Counter(
+	"unindexed_filters_total",
+	"Filters that can't use an index, by table and column.",
+	labelnames=("table", "column"),
+)
+
+# Operators that can't be answered with a btree index on the column.
+UNINDEXABLE_OPERATORS = frozenset(
+	(
+		operators.ne,
+		operators.not_in_op,
+		operators.not_like_op,
+		operators.ilike_op,
+		operators.not_ilike_op,
+		operators.not_between_op,
+	)
+)
+
+
+# Operators served by a pg_trgm index whatever the wildcards of the pattern.
+TRIGRAM_OPERATORS = frozenset((operators.eq, operators.like_op, operators.ilike_op))
+
+
+def is_trigram_index(index: sa.Index) -> bool:
+	ops = index.dialect_options["postgresql"]["ops"] or {}
+	return "gin_trgm_ops" in ops.values()
+
+
+@cache
+def indexed_columns(table: Table) -> frozenset[str]:
+	"""Columns of the table that lead an index: the primary key, the unique
+	constraints and the indexes of the metadata. The other columns of a
+	composite index can't be searched alone, the trigram indexes are only used
+	by the text searches (see :func:`trigram_columns`)."""
+	leading = {table.primary_key.columns.values()[0].name} if table.primary_key else set()
+	leading.update(
+		next(iter(index.columns)).name
+		for index in table.indexes
+		if index.columns and not is_trigram_index(index)
+	)
+	leading.update(
+		next(iter(constraint.columns)).name
+		for constraint in table.constraints
+		if isinstance(constraint, sa.UniqueConstraint) and constraint.columns
+	)
+	return frozenset(leading)
+
+
+@cache
+def trigram_columns(table: Table) -> frozenset[str]:
+	"""Columns of the table with a pg_trgm GIN index."""
+	return frozenset(
+		column.name
+		for index in table.indexes
+		if is_trigram_index(index)
+		for column in index.columns
+	)
+
+
+def is_similarity(operator: Any) -> bool:
+	"""The ``%`` similarity operator of pg_trgm, see ``similar_op``."""
+	return getattr(operator, "opstring", None) == "%"
+
+
+@dataclass(frozen=True, slots=True)
+class FilterPlan:
+	"""Classification of one condition of the ``WHERE``."""
+
+	condition: str
+	indexed: bool
+	table: str | None = None
+	column: str | None = None
+	reason: str | None = None
+
+
+def is_correlation(condition: Any) -> bool:
+	"""``parent.id = child.parent_id`` of the ``EXISTS`` of a relationship."""
+	return (
+		isinstance(condition, elements.BinaryExpression)
+		and isinstance(condition.left, sa.Column)
+		and isinstance(condition.right, sa.Column)
+		and condition.left.table is not condition.right.table
+	)
+
+
+def _exists_unindexed(condition: selectable.Exists) -> tuple[Any, str] | None:
+	"""The semi join of an ``EXISTS`` starts from the index of the related rows
+	and reaches the parent through both columns of the correlation."""
+	where = condition.element.element.whereclause
+	clauses = list(getattr(where, "clauses", (where,)))
+	conditions = []
+	for clause in clauses:
+		if not is_correlation(clause):
+			conditions.append(clause)
+			continue
+		for column in (clause.left, clause.right):
+			if column.name not in indexed_columns(column.table):
+				return column, "the relationship has no index"
+	if not conditions:
+		return None, "the condition can't use an index"
+	return _unindexed(sa.and_(*conditions))
+
+
+def _unindexed(condition: Any) -> tuple[Any, str] | None:
+	"""Column and reason when the condition can't use an index, None if it can."""
+	match condition:
+		case elements.Grouping():
+			return _unindexed(condition.element)
+		case elements.True_() | elements.False_():
+			return None
+		case elements.BooleanClauseList() if condition.operator is operators.and_:
+			# One index-backed condition is enough to avoid the full scan.
+			reasons = [_unindexed(clause) for clause in condition.clauses]
+			return None if None in reasons else reasons[0]
+		case elements.BooleanClauseList():
+			# Every branch of an OR needs an index (bitmap OR).
+			return next(
+				(reason for c in condition.clauses if (reason := _unindexed(c))), None
+			)
+		case selectable.Exists():
+			return _exists_unindexed(condition)
+		case elements.BinaryExpression() if isinstance(condition.left, sa.Column):
+			column = condition.left
+			if column.name in trigram_columns(column.table) and (
+				condition.operator in TRIGRAM_OPERATORS or is_similarity(condition.operator)
+			):
+				return None
+			if is_similarity(condition.operator):
+				return column, "the column has no trigram index"
+			if column.name not in indexed_columns(column.table):
+				return column, "the column has no index"
+			if condition.operator in UNINDEXABLE_OPERATORS:
+				return column, "the operator can't use an index"
+			if condition.operator is operators.like_op:
+				pattern = getattr(condition.right, "value", None)
+				if isinstance(pattern, str) and pattern[:1] in ("%", "_"):
+					return column, "like with a leading wildcard"
+			return None
+		case _:
+			return None, "the condition can't use an index"
+
+
+def plan_filters(conditions: Sequence[ColumnElement[bool]]) -> list[FilterPlan]:
+	"""Classify each condition as index-backed or not.
+
+	.. code-block:: python
+
+		plan_filters(get_filters('[["title", "like", "%bug%"]]', Tasks))
+		# [FilterPlan(condition="tasks.title LIKE :title_1", indexed=False, ...)]
+	"""
+	plans = []
+	for condition in conditions:
+		if (unindexed := _unindexed(condition)) is None:
+			plans.append(FilterPlan(condition=str(condition), indexed=True))
+			continue
+		column, reason = unindexed
+		plans.append(
+			FilterPlan(
+				condition=str(condition),
+				indexed=False,
+				table=getattr(getattr(column, "table", None), "name", None),
+				column=getattr(column, "name", None),
+				reason=reason,
+			)
+		)
+	return plans
+
+
+class Explain(Executable, ClauseElement):
+	"""``EXPLAIN (FORMAT JSON)`` of a statement, compiled with the same binds."""
+
+	inherit_cache = False
+
+	def __init__(self, statement: Any) -> None:
+		self.statement = statement
+
+
+@compiles(Explain)
+def compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+	return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class FilterPlanner:
+	"""Check the filters of the queries against the indexes of the models with
+	a policy:
+
+		- allow: every filter runs.
+		- warn: the unindexed filters run, they are logged and counted in ``unindexed_filters_total``.
+		- reject: the unindexed filters raise ``InvalidParameter``.
+		- require_limit: the unindexed filters only run with a ``limit``.
+
+	With ``explain`` the queries also run ``EXPLAIN`` to report the cost of the plan.
+
+	.. code-block:: python
+
+		filter_planner.check(filter_, limit=limit)
+		cost = await filter_planner.explain_cost(db, select(Tasks).where(*filter_))
+	"""
+
+	def __init__(
+		self, policy: FilterPolicy = FilterPolicy.WARN, explain: bool = False
+	) -> None:
+		self.policy = policy
+		self.explain = explain
+
+	def check(
+		self, conditions: Sequence[ColumnElement[bool]], limit: int | None = None
+	) -> list[FilterPlan]:
+		"""Apply the policy to the conditions. They are an implicit ``AND``, like
+		in ``_unindexed`` one index-backed condition is enough: the others filter
+		the rows already found by the index.
+
+		Raises:
+			InvalidParameter: If the policy rejects an unindexed condition.
+
+		Returns:
+			list[FilterPlan]: The classification of the conditions.
+		"""
+		if self.policy is FilterPolicy.ALLOW or not conditions:
+			return []
+		plans = plan_filters(conditions)
+		unindexed = [plan for plan in plans if not plan.indexed]
+		if len(unindexed) < len(plans):
+			return plans
+		match self.policy:
+			case FilterPolicy.WARN:
+				for plan in unindexed:
+					UNINDEXED_FILTERS.labels(table=plan.table, column=plan.column).inc()
+					logger.warning(f"Unindexed filter {plan.condition}: {plan.reason}")
+			case FilterPolicy.REJECT:
+				raise InvalidParameter(
+					f"The filter can't use an index: {describe(unindexed)}"
+				)
+			case FilterPolicy.REQUIRE_LIMIT if limit is None:
+				raise InvalidParameter(
+					f"A limit is required to filter without an index: {describe(unindexed)}"
+				)
+		return plans
+
+	async def explain_cost(self, db: AsyncSession, statement: Any) -> dict[str, Any]:
+		"""Cost and estimated rows of the plan of the statement."""
+		plan = (await db.execute(Explain(statement))).scalar_one()
+		if isinstance(plan, str):
+			plan = json.loads(plan)
+		root = plan[0]["Plan"]
+		return {
+			"node_type": root["Node Type"],
+			"total_cost": root["Total Cost"],
+			"plan_rows": root["Plan Rows"],
+		}
+
+
+def describe(plans: Sequence[FilterPlan]) -> str:
+	return ", ".join(f"{plan.table}.{plan.column} ({plan.reason})" for plan in plans)
+
+
+settings = FilterPlannerSettings()
+filter_planner = FilterPlanner(policy=settings.policy, explain=settings.explain)
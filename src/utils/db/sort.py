@@ -0,0 +1,96 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import InstrumentedAttribute
+
+from utils.exceptions import InvalidParameter
+
+Direction = Literal["asc", "desc"]
+Nulls = Literal["first", "last"]
+
+
+@dataclass(frozen=True, slots=True)
+class SortSpec:
+	"""One key of the sort of a list: the column, the direction and where the
+	NULLs go (None keeps the default of Postgres, last with asc and first with
+	desc)."""
+
+	column: str
+	direction: Direction = "asc"
+	nulls: Nulls | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SortKey:
+	"""Sort spec resolved to the column of the model."""
+
+	column: InstrumentedAttribute[Any]
+	descending: bool = False
+	nulls: Nulls | None = None
+
+	def order(self, reverse: bool = False) -> ColumnElement[Any]:
+		"""``ORDER BY`` clause of the key, ``reverse`` inverts the direction and
+		the NULLs to paginate backwards."""
+		descending = self.descending != reverse
+		clause = self.column.desc() if descending else self.column.asc()
+		nulls = self.nulls
+		if nulls is not None and reverse:
+			nulls = "last" if nulls == "first" else "first"
+		if nulls == "first":
+			return clause.nulls_first()
+		if nulls == "last":
+			return clause.nulls_last()
+		return clause
+
+
+def resolve_sort(
+	model: Any,
+	order_by: Direction | Sequence[SortSpec],
+	sortable: Sequence[str] = (),
+	sort_columns: Sequence[InstrumentedAttribute[Any]] | None = None,
+) -> list[SortKey]:
+	"""Resolve the sort of a list to the columns of the model. The id is always
+	the last key so the sort is unique, with the direction of the key before it.
+
+	Args:
+		model (Any): SQLAlchemy model.
+		order_by (Direction | Sequence[SortSpec]): ``asc``/``desc`` sorts by the ``sort_columns``
+			and the id, the specs sort by the given columns.
+		sortable (Sequence[str]): Columns of the specs allowed, they should be backed by an index.
+		sort_columns (Sequence[InstrumentedAttribute[Any]] | None): Columns of the ``asc``/``desc`` sort.
+
+	Raises:
+		ValueError: If ``order_by`` is a string other than ``asc`` or ``desc``.
+		InvalidParameter: If a spec isn't sortable, is repeated or has an invalid direction or nulls.
+
+	Returns:
+		list[SortKey]: The keys of the ``ORDER BY``, the id is the last one.
+
+	.. code-block:: python
+
+		resolve_sort(Tasks, [SortSpec("priority", "desc")], sortable=("priority",))
+		# [SortKey(Tasks.priority, descending=True), SortKey(Tasks.id, descending=True)]
+	"""
+	if isinstance(order_by, str):
+		if order_by not in ("asc", "desc"):
+			raise ValueError("Order by should be 'asc' or 'desc' ")
+		columns = [c for c in sort_columns or () if c.key != "id"]
+		return [SortKey(c, order_by == "desc") for c in (*columns, model.id)]
+	keys: list[SortKey] = []
+	for spec in order_by:
+		if spec.column != "id" and spec.column not in sortable:
+			raise InvalidParameter(
+				f"Can't sort by {spec.column}, the sortable columns are: {', '.join(sorted(sortable))}"
+			)
+		if any(key.column.key == spec.column for key in keys):
+			raise InvalidParameter(f"{spec.column} is sorted more than once")
+		if spec.direction not in ("asc", "desc") or spec.nulls not in (None, "first", "last"):
+			raise InvalidParameter(f"Invalid sort of {spec.column}")
+		keys.append(
+			SortKey(getattr(model, spec.column), spec.direction == "desc", spec.nulls)
+		)
+	if not any(key.column.key == "id" for key in keys):
+		keys.append(SortKey(model.id, keys[-1].descending if keys else False))
+	return keys
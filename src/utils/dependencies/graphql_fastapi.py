@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import BaseContext
 from strawberry.permission import BasePermission
 
+from repository.loaders import Loaders
 from utils.db.async_db_conf import depend_db_annotated, get_db_session
 from utils.fastapi.auth import get_current_user
 
@@ -97,8 +98,12 @@ class DbContext(BaseContext):
 	def __init__(
 		self,
 		db: AsyncSession,
+		loaders: Loaders | None = None,
 	) -> None:
 		self.db = db
+		self.loaders = loaders if loaders is not None else Loaders(db)
+		# EXPLAIN costs of the queries, see utils.graphql.extensions.ExplainExtension
+		self.explain: list[dict[str, Any]] = []
 
 
 async def get_context(
@@ -112,7 +117,7 @@ async def get_context(
 		db (AsyncSession, optional): Defaults to Depends(get_db_session).
 
 	Returns:
-		DbContext: Custom context
+		DbContext: Custom context, with the DataLoaders of the request
 	"""
 
-	return DbContext(db=db)
+	return DbContext(db=db, loaders=Loaders(db))
@@ -1,15 +1,16 @@
 from redis.asyncio import Redis
 
+# The cached values are JSON bytes with their version, so the responses aren't decoded.
 redis_master = Redis(
 	host="redis-master.redis.svc.cluster.local",
 	port=6379,
-	decode_responses=True,
+	decode_responses=False,
 	password="test-redis",
 )
 redis_replica = Redis(
 	host="redis-replicas.redis.svc.cluster.local",
 	port=6379,
-	decode_responses=True,
+	decode_responses=False,
 	password="test-redis",
 )
 
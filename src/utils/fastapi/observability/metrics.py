@@ -10,6 +10,28 @@ from prometheus_fastapi_instrumentator.metrics import Info
 from pydantic import BaseModel
 from starlette.routing import Match
 
+# Cache of the GraphQL resolvers (utils.cache.redis_cache), exposed in /metrics
+# with the default registry.
+RESOLVER_CACHE_HITS = Counter(
+    "graphql_resolver_cache_hits_total",
+    "Resolver results served from the cache, by tier (local memory or redis).",
+    labelnames=("resolver", "tier"),
+)
+RESOLVER_CACHE_MISSES = Counter(
+    "graphql_resolver_cache_misses_total",
+    "Resolver results not found in the cache and resolved from the database.",
+    labelnames=("resolver",),
+)
+RESOLVER_CACHE_INVALIDATIONS = Counter(
+    "graphql_resolver_cache_invalidations_total",
+    "Tags of the resolver cache invalidated by the mutations.",
+    labelnames=("tag",),
+)
+RESOLVER_CACHE_LOCAL_BYTES = Gauge(
+    "graphql_resolver_cache_local_bytes",
+    "Bytes of the resolver results kept in the memory of the worker.",
+)
+
 
 class PrometheusMetrics(BaseModel):
 
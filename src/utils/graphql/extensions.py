@@ -0,0 +1,18 @@
+from typing import Any
+
+from strawberry.extensions import SchemaExtension
+
+
+class ExplainExtension(SchemaExtension):
+	"""Add the EXPLAIN costs collected by the resolvers in ``info.context.explain``
+	to the ``extensions`` of the response, only when the filter planner runs in
+	explain mode (``FILTER_PLANNER_EXPLAIN=true``).
+
+	.. code-block:: json
+
+		{"data": {...}, "extensions": {"explain": [{"field": "tasks", "node_type": "Seq Scan", "total_cost": 35.5, "plan_rows": 3}]}}
+	"""
+
+	def get_results(self) -> dict[str, Any]:
+		explain = getattr(self.execution_context.context, "explain", None)
+		return {"explain": explain} if explain else {}
@@ -0,0 +1,183 @@
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+import sqlalchemy as sa
+import strawberry
+from sqlalchemy import ColumnElement
+from sqlalchemy.sql import operators as sql_operators
+
+ORDERABLE = (int, float, datetime, date)
+
+TYPE_NAMES = {str: "String", int: "Int", float: "Float", datetime: "DateTime", date: "Date"}
+
+COMPARISONS = {
+	"eq": sql_operators.eq,
+	"ne": sql_operators.ne,
+	"gt": sql_operators.gt,
+	"gte": sql_operators.ge,
+	"lt": sql_operators.lt,
+	"lte": sql_operators.le,
+}
+
+_operator_inputs: dict[Any, type] = {}
+_range_inputs: dict[Any, type] = {}
+
+
+def type_name(type_: Any) -> str:
+	return TYPE_NAMES.get(type_) or type_.__name__.removesuffix("GQLEnum")
+
+
+def range_input(type_: Any) -> type:
+	"""Input of the ``between`` operator (``DateTimeRange``, ``IntRange``...)."""
+	if (input_ := _range_inputs.get(type_)) is not None:
+		return input_
+	name = type_name(type_)
+	input_ = _range_inputs[type_] = strawberry.input(
+		type(f"{name}Range", (), {"__annotations__": {"start": type_, "end": type_}}),
+		description=f"Inclusive range of {name} values.",
+	)
+	return input_
+
+
+def operators_input(type_: Any) -> type:
+	"""Input with the operators of one column type, there is one per type
+	(``StringFilter``, ``UUIDFilter``, ``DateTimeFilter``...) shared by every model.
+
+	Every type has ``eq``, ``ne`` and ``in``, the orderable ones ``gt``, ``gte``,
+	``lt``, ``lte`` and ``between`` and the strings ``like``, ``ilike`` and
+	``similar`` (pg_trgm similarity).
+	"""
+	if (input_ := _operator_inputs.get(type_)) is not None:
+		return input_
+	name = type_name(type_)
+	annotations: dict[str, Any] = {
+		"eq": type_ | None,
+		"ne": type_ | None,
+		"in_": list[type_] | None,
+	}
+	namespace: dict[str, Any] = {
+		"eq": None,
+		"ne": None,
+		"in_": strawberry.field(name="in", default=None),
+	}
+	if isinstance(type_, type) and issubclass(type_, ORDERABLE):
+		for operator in ("gt", "gte", "lt", "lte"):
+			annotations[operator] = type_ | None
+			namespace[operator] = None
+		annotations["between"] = range_input(type_) | None
+		namespace["between"] = None
+	if type_ is str:
+		for operator in ("like", "ilike", "similar"):
+			annotations[operator] = str | None
+			namespace[operator] = None
+	namespace["__annotations__"] = annotations
+	input_ = _operator_inputs[type_] = strawberry.input(
+		type(f"{name}Filter", (), namespace),
+		description=f"Operators of the {name} columns, the given operators are combined with AND.",
+	)
+	return input_
+
+
+def model_filter_input(
+	model: Any, name: str, enums: dict[type[Enum], type[Enum]] | None = None
+) -> type:
+	"""Generate the filter input of a model, one field per column with the
+	operators of its type plus ``and``, ``or`` and ``not`` to combine filters.
+
+	Args:
+		model (Any): SQLAlchemy model.
+		name (str): Name of the GraphQL input.
+		enums (dict[type[Enum], type[Enum]] | None): GraphQL enum of the python enums of the columns.
+
+	Returns:
+		type: The strawberry input, use :func:`build_where` to convert it to SQL.
+
+	.. code-block:: python
+
+		TaskFilter = model_filter_input(Tasks, "TaskFilter", {Status: StatusGQLEnum})
+		# { status: { in: [NEW, ACTIVE] }, or: [{ title: { like: "%x%" } }] }
+	"""
+	enums = enums or {}
+	filter_input = type(name, (), {})
+	annotations: dict[str, Any] = {}
+	for attribute in model.__mapper__.column_attrs:
+		type_ = attribute.expression.type.python_type
+		annotations[attribute.key] = operators_input(enums.get(type_, type_)) | None
+		setattr(filter_input, attribute.key, None)
+	annotations |= {
+		"and_": list[filter_input] | None,  # type: ignore
+		"or_": list[filter_input] | None,  # type: ignore
+		"not_": filter_input | None,  # type: ignore
+	}
+	for operator in ("and", "or", "not"):
+		setattr(filter_input, f"{operator}_", strawberry.field(name=operator, default=None))
+	filter_input.__annotations__ = annotations
+	return strawberry.input(filter_input, description=f"Filter of {model.__tablename__}.")
+
+
+def _to_column_value(column: Any, value: Any) -> Any:
+	"""The GraphQL enums are converted to the enum of the column."""
+	enum_class = getattr(column.type, "enum_class", None)
+	if enum_class is not None and isinstance(value, Enum):
+		return enum_class(value.value)
+	return value
+
+
+def _column_conditions(column: Any, operators: Any) -> list[ColumnElement[bool]]:
+	conditions = []
+	for operator, value in vars(operators).items():
+		if value is None or value is strawberry.UNSET:
+			continue
+		match operator:
+			case "in_":
+				conditions.append(column.in_([_to_column_value(column, v) for v in value]))
+			case "between":
+				conditions.append(
+					column.between(
+						_to_column_value(column, value.start),
+						_to_column_value(column, value.end),
+					)
+				)
+			case "like":
+				conditions.append(column.like(value))
+			case "ilike":
+				conditions.append(column.ilike(value))
+			case "similar":
+				conditions.append(column.op("%")(value))
+			case _:
+				conditions.append(
+					COMPARISONS[operator](column, _to_column_value(column, value))
+				)
+	return conditions
+
+
+def build_where(where: Any, model: Any) -> tuple[ColumnElement[bool], ...]:
+	"""Convert a filter input generated by :func:`model_filter_input` to the
+	conditions of the ``WHERE``, the given fields are combined with AND.
+
+	Args:
+		where (Any): Filter input, or None.
+		model (Any): SQLAlchemy model of the filter.
+
+	Returns:
+		tuple[ColumnElement[bool], ...]: The conditions, empty without filter.
+	"""
+	if where is None:
+		return ()
+	conditions: list[ColumnElement[bool]] = []
+	for key, value in vars(where).items():
+		if value is None or value is strawberry.UNSET:
+			continue
+		match key:
+			case "and_":
+				conditions.extend(c for w in value for c in build_where(w, model))
+			case "or_":
+				conditions.append(
+					sa.or_(sa.false(), *(sa.and_(sa.true(), *build_where(w, model)) for w in value))
+				)
+			case "not_":
+				conditions.append(sa.not_(sa.and_(sa.true(), *build_where(value, model))))
+			case _:
+				conditions.extend(_column_conditions(getattr(model, key), value))
+	return tuple(conditions)
@@ -0,0 +1,47 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import strawberry
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+
+
+def _flatten(selections: Iterable[Any]) -> list[SelectedField]:
+	"""Replace the fragments (named or inline) with the fields they select."""
+	fields: list[SelectedField] = []
+	for selection in selections:
+		if isinstance(selection, FragmentSpread | InlineFragment):
+			fields.extend(_flatten(selection.selections))
+		else:
+			fields.append(selection)
+	return fields
+
+
+def get_selected_fields(info: strawberry.Info, path: Sequence[str] = ()) -> set[str]:
+	"""Return the name of the fields selected by the client under the
+	current resolver, following the given path of nested fields.
+
+	Args:
+		info (strawberry.Info): GraphQL resolver info.
+		path (Sequence[str], optional): Nested fields to follow. Defaults to ().
+
+	Returns:
+		set[str]: Names of the selected fields, empty if the path wasn't selected.
+
+	.. code-block:: python
+
+		# query { tasks(limit: 10) { items { id title } total_items } }
+		get_selected_fields(info)  # {"items", "total_items"}
+		get_selected_fields(info, ["items"])  # {"id", "title"}
+	"""
+	# The selected fields of the info are the current field itself.
+	fields = _flatten(
+		selection for field in info.selected_fields for selection in field.selections
+	)
+	for name in path:
+		fields = _flatten(
+			selection
+			for field in fields
+			if field.name == name
+			for selection in field.selections
+		)
+	return {field.name for field in fields}
@@ -1,8 +1,10 @@
+import asyncio
 from datetime import UTC, datetime
+from unittest.mock import patch
 
 import pytest
 
-from common.send_email import fm, send_email_for_task
+from common.send_email import fm, send_email_for_task, send_emails_for_tasks
 from models.models import Tasks
 from schema.tasks import Priority, Status
 
@@ -27,3 +29,23 @@ async def test_send_email_task():
 				}
 			),
 		)
+
+
+@pytest.mark.asyncio
+async def test_send_emails_for_tasks_concurrency():
+	sending = 0
+	max_sending = 0
+
+	async def send(user, task):
+		nonlocal sending, max_sending
+		sending += 1
+		max_sending = max(max_sending, sending)
+		await asyncio.sleep(0)
+		sending -= 1
+
+	with patch("common.send_email.send_email_for_task", side_effect=send) as mock_send:
+		await send_emails_for_tasks(
+			((f"user{number}@example.com", Tasks()) for number in range(50)), concurrency=5
+		)
+	assert mock_send.await_count == 50
+	assert max_sending == 5
@@ -4,7 +4,10 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import Tasks
+from repository.loaders import Loaders
 from repository.repository import Repository
+from tests.mock_redis import FakeRedis
+from utils.cache.redis_cache import local_cache
 
 
 @pytest.fixture
@@ -22,6 +25,7 @@ def db():
 def strawberry_context(db):
 	info = AsyncMock()
 	info.context.db = db
+	info.context.loaders = Loaders(db)
 	yield info
 
 
@@ -36,3 +40,14 @@ def db_with():
 	db_cm.__aexit__.return_value = None
 
 	return db_cm, session_mock
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+	"""The resolver cache uses an in-process Redis, the same client is the
+	master and the replica, and starts with an empty local cache."""
+	redis = FakeRedis()
+	local_cache.clear()
+	monkeypatch.setattr("utils.dependencies.redis_cache.redis_master", redis)
+	monkeypatch.setattr("utils.dependencies.redis_cache.redis_replica", redis)
+	return redis
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+class FakeRedis:
+	"""In-process stand-in of ``redis.asyncio.Redis`` with the commands used by
+	the resolver cache, the values are bytes like a client without
+	``decode_responses``."""
+
+	def __init__(self) -> None:
+		self.values: dict[str, tuple[bytes, float]] = {}
+		self.subscribers: list[FakePubSub] = []
+
+	@staticmethod
+	def encode(value: Any) -> bytes:
+		return value if isinstance(value, bytes) else str(value).encode()
+
+	async def get(self, key: str) -> bytes | None:
+		value, expires_at = self.values.get(key, (None, 0.0))
+		if value is None or expires_at <= time.monotonic():
+			self.values.pop(key, None)
+			return None
+		return value
+
+	async def mget(self, *keys: str) -> list[bytes | None]:
+		return [await self.get(key) for key in keys]
+
+	async def set(self, key: str, value: Any) -> bool:
+		self.values[key] = (self.encode(value), float("inf"))
+		return True
+
+	async def setex(self, key: str, ttl: int, value: Any) -> bool:
+		self.values[key] = (self.encode(value), time.monotonic() + ttl)
+		return True
+
+	async def incr(self, key: str) -> int:
+		value = int(await self.get(key) or 0) + 1
+		await self.set(key, value)
+		return value
+
+	async def publish(self, channel: str, message: Any) -> int:
+		receivers = [pubsub for pubsub in self.subscribers if channel in pubsub.channels]
+		for pubsub in receivers:
+			pubsub.messages.put_nowait(
+				{"type": "message", "channel": channel.encode(), "data": self.encode(message)}
+			)
+		return len(receivers)
+
+	def pubsub(self) -> "FakePubSub":
+		return FakePubSub(self)
+
+	def pipeline(self, transaction: bool = True) -> "FakePipeline":
+		return FakePipeline(self)
+
+
+class FakePubSub:
+	def __init__(self, redis: FakeRedis) -> None:
+		self.redis = redis
+		self.channels: set[str] = set()
+		self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+	async def __aenter__(self) -> "FakePubSub":
+		self.redis.subscribers.append(self)
+		return self
+
+	async def __aexit__(self, *args: Any) -> None:
+		self.redis.subscribers.remove(self)
+
+	async def subscribe(self, *channels: str) -> None:
+		self.channels.update(channels)
+
+	async def listen(self) -> AsyncIterator[dict[str, Any]]:
+		while True:
+			yield await self.messages.get()
+
+
+class FakePipeline:
+	"""Queue of the commands of a ``MULTI``/``EXEC``, run in order by :meth:`execute`."""
+
+	def __init__(self, redis: FakeRedis) -> None:
+		self.redis = redis
+		self.commands: list[tuple[str, tuple[Any, ...]]] = []
+
+	async def __aenter__(self) -> "FakePipeline":
+		return self
+
+	async def __aexit__(self, *args: Any) -> None:
+		self.commands.clear()
+
+	def __getattr__(self, name: str) -> Any:
+		def queue(*args: Any) -> "FakePipeline":
+			self.commands.append((name, args))
+			return self
+
+		return queue
+
+	async def execute(self) -> list[Any]:
+		commands, self.commands = self.commands, []
+		return [await getattr(self.redis, name)(*args) for name, args in commands]
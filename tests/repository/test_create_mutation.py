@@ -4,21 +4,19 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from mock_tasks import TASK_DATA_MOCK
 from mock_user import MOCK_USER
+from pydantic import ValidationError
 
 from models.models import TaskList, Tasks, Users
 from repository.create_mutation import (
 	convert_enum,
 	get_other_entity,
+	tasks_bulk_mutation,
 	tasks_lists_mutation,
 	tasks_mutation,
 )
 from schema.grapql_schemas import ListTaskInput, TasksInput
-from tests.mock_task_list import (
-	MOCK_TASK_LIST,
-	MOCK_TASK_LIST_WITH_TASKS,
-	MOCK_TASK_LIST_WITH_TASKS_ID,
-)
-from utils.exceptions import EntityAlreadyExistsError
+from tests.mock_task_list import MOCK_TASK_LIST, MOCK_TASK_LIST_WITH_TASKS_ID
+from utils.exceptions import EntityAlreadyExistsError, EntityDoesNotExistError
 
 
 @pytest.mark.asyncio
@@ -56,10 +54,12 @@ def test_conver_enum():
 	return_value=Tasks(**TASK_DATA_MOCK[1]),
 )
 @patch(
-	"repository.create_mutation.user_repository.get_entity_by_id",
-	return_value=Users(**MOCK_USER),
+	"repository.loaders.user_repository.get_entities_by_ids",
+	return_value=[Users(**MOCK_USER)],
 )
-async def test_tasks(db: AsyncMock, strawberry_context: AsyncMock):
+async def test_tasks(
+	mock_get_users, mock_create_entity, strawberry_context: AsyncMock
+):
 	task_input = TASK_DATA_MOCK[1].copy()
 	task_input_id = task_input.pop("id")
 
@@ -68,6 +68,7 @@ async def test_tasks(db: AsyncMock, strawberry_context: AsyncMock):
 	)
 	assert task_input_id == result.id
 	assert MOCK_USER["id"] == str(result.user)
+	mock_get_users.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -91,6 +92,7 @@ async def test_tasks_user_none(db: AsyncMock, strawberry_context: AsyncMock):
 	"repository.create_mutation.tasks_list_repository.create_entity",
 	return_value=TaskList(**MOCK_TASK_LIST),
 )
+@patch("repository.loaders.tasks_repository.get_entities_by_ids", return_value=[])
 async def test_list_tasks_task_none(db: AsyncMock, strawberry_context: AsyncMock):
 	list_task = MOCK_TASK_LIST.copy()
 	del  list_task["id"]
@@ -106,20 +108,95 @@ async def test_list_tasks_task_none(db: AsyncMock, strawberry_context: AsyncMock
 @pytest.mark.asyncio
 @patch(
 	"repository.create_mutation.tasks_list_repository.create_entity",
-	return_value=TaskList(**MOCK_TASK_LIST_WITH_TASKS),
+	return_value=TaskList(**MOCK_TASK_LIST),
 )
 @patch(
-	"repository.create_mutation.tasks_repository.get_entity_by_id",
-	return_value=Tasks(**TASK_DATA_MOCK[1]),
+	"repository.create_mutation.tasks_repository.update_entities",
+	return_value=[
+		Tasks(**{**TASK_DATA_MOCK[1], "task_list_id": MOCK_TASK_LIST["id"]})
+	],
 )
-async def test_list_tasks(mock_get_entity,mock_create_entity, db: AsyncMock, strawberry_context: AsyncMock):
+async def test_list_tasks(mock_update_entities, mock_create_entity, db: AsyncMock, strawberry_context: AsyncMock):
 	list_task = MOCK_TASK_LIST_WITH_TASKS_ID.copy()
 	del  list_task["id"]
-	refresh = AsyncMock()
-	refresh.return_value = Tasks(**TASK_DATA_MOCK[1])
-	db.refresh.return_value = refresh
+	list_task["tasks"] = [TASK_DATA_MOCK[1]["id"], TASK_DATA_MOCK[1]["id"]]
 	result = await tasks_lists_mutation(
 		tasks_list=ListTaskInput(**list_task), info=strawberry_context
 	)
 	assert MOCK_TASK_LIST["id"] == result.id
 	assert TASK_DATA_MOCK[1]["id"] == result.tasks[0].id
+	# The list is flushed and the tasks attached with one UPDATE before the commit.
+	assert mock_create_entity.await_args.kwargs["commit"] is False
+	mock_update_entities.assert_awaited_once()
+	assert mock_update_entities.await_args.args[0] == {"task_list_id": MOCK_TASK_LIST["id"]}
+	assert mock_update_entities.await_args.kwargs["commit"] is False
+	filter_ = mock_update_entities.await_args.kwargs["filter"]
+	assert filter_[0].right.value == [TASK_DATA_MOCK[1]["id"]]
+	db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch(
+	"repository.create_mutation.tasks_list_repository.create_entity",
+	return_value=TaskList(**MOCK_TASK_LIST),
+)
+@patch(
+	"repository.create_mutation.tasks_repository.update_entities",
+	return_value=[Tasks(**TASK_DATA_MOCK[1])],
+)
+async def test_list_tasks_task_not_found(mock_update_entities, mock_create_entity, db: AsyncMock, strawberry_context: AsyncMock):
+	list_task = MOCK_TASK_LIST_WITH_TASKS_ID.copy()
+	del list_task["id"]
+	list_task["tasks"] = [TASK_DATA_MOCK[1]["id"], TASK_DATA_MOCK[0]["id"]]
+	with pytest.raises(EntityDoesNotExistError) as exc:
+		await tasks_lists_mutation(
+			tasks_list=ListTaskInput(**list_task), info=strawberry_context
+		)
+	assert str(TASK_DATA_MOCK[0]["id"]) in str(exc.value)
+	assert str(TASK_DATA_MOCK[1]["id"]) not in str(exc.value)
+	db.rollback.assert_awaited_once()
+	db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("common.send_email.send_email_for_task")
+@patch(
+	"repository.loaders.user_repository.get_entities_by_ids",
+	return_value=[Users(**MOCK_USER)],
+)
+@patch(
+	"repository.create_mutation.tasks_repository.create_entities",
+	return_value=[Tasks(**task) for task in TASK_DATA_MOCK],
+)
+async def test_tasks_bulk(
+	mock_create_entities, mock_get_users, mock_send_email, strawberry_context: AsyncMock
+):
+	tasks_input = []
+	for task in TASK_DATA_MOCK:
+		task_input = task.copy()
+		task_input.pop("id")
+		tasks_input.append(TasksInput(**task_input))
+
+	result = await tasks_bulk_mutation(tasks=tasks_input, info=strawberry_context)
+
+	assert [task.id for task in result] == [task["id"] for task in TASK_DATA_MOCK]
+	mock_create_entities.assert_awaited_once()
+	assert len(mock_create_entities.await_args.kwargs["entity_schemas"]) == 2
+	# The users of both tasks are loaded with one query.
+	mock_get_users.assert_awaited_once()
+	assert mock_send_email.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch("repository.create_mutation.tasks_repository.create_entities")
+async def test_tasks_bulk_invalid(mock_create_entities, strawberry_context: AsyncMock):
+	task_input = TASK_DATA_MOCK[0].copy()
+	task_input.pop("id")
+	invalid = {**task_input, "title": "T"}
+
+	with pytest.raises(ValidationError):
+		await tasks_bulk_mutation(
+			tasks=[TasksInput(**task_input), TasksInput(**invalid)],
+			info=strawberry_context,
+		)
+	mock_create_entities.assert_not_awaited()
@@ -1,12 +1,18 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
 from models.models import TaskList, Tasks
-from repository.delete_mutation import delete_task, delete_task_list
-from tests.mock_task_list import MOCK_TASK_LIST, MOCK_TASK_LIST_WITH_TASKS
+from repository.delete_mutation import (
+	delete_task,
+	delete_task_list,
+	delete_task_returning,
+	delete_tasks_where,
+)
+from schema.grapql_schemas import TasksActionGQLEnum
+from tests.mock_task_list import MOCK_TASK_LIST
 from tests.mock_tasks import TASK_DATA_MOCK
-from utils.exceptions import EntityDoesNotExistError
+from utils.exceptions import EntityDoesNotExistError, InvalidParameter
 
 
 @pytest.mark.asyncio
@@ -31,47 +37,137 @@ async def test_delete_task_failure(mock_delete_entity, strawberry_context):
 
 
 @pytest.mark.asyncio
+@patch("repository.delete_mutation.selected_columns", return_value=["id", "title"])
 @patch(
-	"repository.delete_mutation.tasks_list_repository.get_entity_by_id",
-	return_value=TaskList(**MOCK_TASK_LIST),
+	"repository.delete_mutation.tasks_repository.delete_entity",
+	return_value=Tasks(id=TASK_DATA_MOCK[0]["id"], title=TASK_DATA_MOCK[0]["title"]),
+)
+async def test_delete_task_returning(mock_delete_entity, mock_selected, strawberry_context):
+	result = await delete_task_returning(
+		id=TASK_DATA_MOCK[0]["id"], info=strawberry_context
+	)
+
+	assert result.id == TASK_DATA_MOCK[0]["id"]
+	assert result.title == TASK_DATA_MOCK[0]["title"]
+	assert mock_delete_entity.await_args.kwargs["returning"] == ["id", "title"]
+
+
+LIST_ID = "712260b0-2690-4da2-8bb4-75fd21628273"
+
+
+@pytest.mark.asyncio
+@patch(
+	"repository.delete_mutation.tasks_list_repository.delete_entity", return_value=None
 )
+@patch("repository.delete_mutation.tasks_repository.update_entities", return_value=[])
+async def test_delete_task_list_success(mock_update_entities, mock_delete_entity, strawberry_context):
+	await delete_task_list(id=LIST_ID, info=strawberry_context)
+
+	mock_update_entities.assert_awaited_once()
+	assert mock_update_entities.await_args.args[0] == {"task_list_id": None}
+	assert mock_update_entities.await_args.kwargs["commit"] is False
+	filter_ = mock_update_entities.await_args.kwargs["filter"]
+	assert "tasks.task_list_id = :task_list_id_1" in str(filter_[0])
+	mock_delete_entity.assert_awaited_once()
+
+
+@pytest.mark.asyncio
 @patch(
 	"repository.delete_mutation.tasks_list_repository.delete_entity", return_value=None
 )
-async def test_delete_task_list_success(mock_delete_entity,mock_get_entity, strawberry_context):
+@patch(
+	"repository.delete_mutation.tasks_repository.delete_entities",
+	return_value=[Tasks(**task) for task in TASK_DATA_MOCK],
+)
+async def test_delete_task_list_delete_tasks(mock_delete_entities, mock_delete_entity, strawberry_context):
 	await delete_task_list(
-		id="712260b0-2690-4da2-8bb4-75fd21628273", info=strawberry_context
+		id=LIST_ID, info=strawberry_context, tasks_action=TasksActionGQLEnum.DELETE
 	)
 
+	mock_delete_entities.assert_awaited_once()
+	assert mock_delete_entities.await_args.kwargs["commit"] is False
+	mock_delete_entity.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 @patch(
 	"repository.delete_mutation.tasks_list_repository.get_entity_by_id",
-	return_value=TaskList(**MOCK_TASK_LIST_WITH_TASKS),
+	return_value=TaskList(**MOCK_TASK_LIST),
 )
 @patch(
 	"repository.delete_mutation.tasks_list_repository.delete_entity", return_value=None
 )
-@patch(
-	"repository.delete_mutation.tasks_repository.update_entity", return_value=MagicMock()
-)
-async def test_delete_task_list_success_with_tasks(mock_update_entity, mock_delete_entity,mock_get_entity,strawberry_context, db):
-	refresh = AsyncMock()
-	refresh.return_value = Tasks(**TASK_DATA_MOCK[1])
-	new_db = db.refresh.return_value = refresh
-	strawberry_context.context.db = new_db
+@patch("repository.delete_mutation.tasks_repository.update_entities", return_value=[])
+async def test_delete_task_list_move_tasks(mock_update_entities, mock_delete_entity, mock_get_entity, strawberry_context):
+	target = MOCK_TASK_LIST["id"]
 	await delete_task_list(
-		id="712260b0-2690-4da2-8bb4-75fd21628273", info=strawberry_context
+		id=LIST_ID,
+		info=strawberry_context,
+		tasks_action=TasksActionGQLEnum.MOVE,
+		target_list_id=target,
 	)
 
+	mock_get_entity.assert_awaited_once()
+	assert mock_update_entities.await_args.args[0] == {"task_list_id": target}
+	mock_delete_entity.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("target_list_id", [None, LIST_ID])
+async def test_delete_task_list_move_invalid_target(target_list_id, db, strawberry_context):
+	with pytest.raises(InvalidParameter):
+		await delete_task_list(
+			id=LIST_ID,
+			info=strawberry_context,
+			tasks_action=TasksActionGQLEnum.MOVE,
+			target_list_id=target_list_id,
+		)
+	db.execute.assert_not_awaited()
+
 
 @pytest.mark.asyncio
 @patch(
-	"repository.delete_mutation.tasks_list_repository.get_entity_by_id",
+	"repository.delete_mutation.tasks_list_repository.delete_entity",
 	side_effect=EntityDoesNotExistError("Entity don't exist"),
 )
-async def test_delete_task_list_failure(mock_get_entity,strawberry_context):
+@patch("repository.delete_mutation.tasks_repository.update_entities", return_value=[])
+async def test_delete_task_list_failure(mock_update_entities, mock_delete_entity, strawberry_context):
 	with pytest.raises(EntityDoesNotExistError) as exc:
-		await delete_task_list(
-			id="712260b0-2690-4da2-8bb4-75fd21628273", info=strawberry_context
-		)
+		await delete_task_list(id=LIST_ID, info=strawberry_context)
 	assert str(exc.value) == "Entity don't exist"
+	# The tasks detached without commit are rolled back with the missing list.
+	mock_update_entities.assert_awaited_once()
+	strawberry_context.context.db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch(
+	"repository.delete_mutation.tasks_repository.delete_entities",
+	return_value=[Tasks(**task) for task in TASK_DATA_MOCK],
+)
+async def test_delete_tasks_where(mock_delete_entities, strawberry_context):
+	result = await delete_tasks_where(
+		filter='[["status", "=", "completed"]]', info=strawberry_context
+	)
+
+	assert result.affected_rows == 2
+	assert result.ids == [task["id"] for task in TASK_DATA_MOCK]
+	filter_ = mock_delete_entities.await_args.kwargs["filter"]
+	assert "tasks.status = :status_1" in str(filter_[0])
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_where_empty_filter(db, strawberry_context):
+	with pytest.raises(InvalidParameter):
+		await delete_tasks_where(filter="", info=strawberry_context)
+	db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_where_unknown_column(db, strawberry_context):
+	with pytest.raises(InvalidParameter):
+		await delete_tasks_where(
+			filter='[["status", "=", "completed"], ["titel", "=", "x"]]',
+			info=strawberry_context,
+		)
+	db.execute.assert_not_awaited()
@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import UUID
+
+import pytest
+from mock_tasks import TASK_DATA_MOCK
+
+from models.models import Tasks
+from repository.loaders import Loaders
+
+LIST_ID = UUID("fbaa20cf-91aa-49db-bae9-105bc052421c")
+
+
+@pytest.mark.asyncio
+async def test_task_by_id_batch(db: AsyncMock):
+	tasks = [Tasks(**task) for task in TASK_DATA_MOCK]
+	missing = UUID("00000000-0000-0000-0000-000000000000")
+	with patch(
+		"repository.loaders.tasks_repository.get_entities_by_ids",
+		return_value=tasks,
+	) as mock_get:
+		loaders = Loaders(db)
+		first, second, same, none = await asyncio.gather(
+			loaders.task_by_id.load(TASK_DATA_MOCK[0]["id"]),
+			loaders.task_by_id.load(str(TASK_DATA_MOCK[1]["id"])),
+			loaders.task_by_id.load(TASK_DATA_MOCK[1]["id"]),
+			loaders.task_by_id.load(missing),
+		)
+		# Cached for the rest of the request.
+		await loaders.task_by_id.load(TASK_DATA_MOCK[0]["id"])
+
+	mock_get.assert_awaited_once()
+	assert mock_get.await_args.args[0] == [
+		TASK_DATA_MOCK[0]["id"],
+		TASK_DATA_MOCK[1]["id"],
+		missing,
+	]
+	assert first is tasks[0]
+	assert second is same is tasks[1]
+	assert none is None
+
+
+@pytest.mark.asyncio
+async def test_tasks_by_list_id(db: AsyncMock):
+	task = Tasks(**{**TASK_DATA_MOCK[0], "task_list_id": LIST_ID})
+	other = UUID("00000000-0000-0000-0000-000000000000")
+	with patch(
+		"repository.loaders.tasks_repository.get_entities_by_ids",
+		return_value=[task],
+	) as mock_get:
+		loaders = Loaders(db)
+		tasks, empty = await loaders.tasks_by_list_id.load_many([LIST_ID, other])
+		# The tasks of the list are primed in the loader by id.
+		assert await loaders.task_by_id.load(task.id) is task
+
+	mock_get.assert_awaited_once()
+	assert mock_get.await_args.kwargs["column"] is Tasks.task_list_id
+	assert tasks == [task]
+	assert empty == []
+
+
+@pytest.mark.asyncio
+async def test_clear_all(db: AsyncMock):
+	with patch(
+		"repository.loaders.tasks_repository.get_entities_by_ids",
+		return_value=[],
+	) as mock_get:
+		loaders = Loaders(db)
+		await loaders.tasks_by_list_id.load(LIST_ID)
+		loaders.clear_all()
+		await loaders.tasks_by_list_id.load(LIST_ID)
+	assert mock_get.await_count == 2
@@ -1,30 +1,89 @@
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import strawberry
 from mock_tasks import TASK_DATA_MOCK
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from strawberry.types.nodes import SelectedField
 
+from models.base import Base
 from models.models import TaskList, Tasks
+from repository.loaders import Loaders
 from repository.query import (
 	PaginationWindow,
 	capitalize_enum_name,
-	get_count,
+	get_connection_window,
+	get_connection_window_task_list,
 	get_pagination_windows,
 	get_pagination_windows_task_list,
+	get_task_stats,
 )
-from schema.grapql_schemas import ListTaskType, TasksType
-from schema.tasks import TaskGQLResponse
+from repository.repository import Repository
+from repository.tasks import tasks_list_repository, tasks_repository
+from schema.grapql_schemas import (
+	CountModeGQLEnum,
+	ListTaskType,
+	SortDirectionGQLEnum,
+	StatusGQLEnum,
+	TaskFilter,
+	TaskListSort,
+	TaskListSortColumnGQLEnum,
+	TasksType,
+)
+from schema.tasks import ListTaskGQLResponse, Priority, Status, TaskGQLResponse
+from settings.filter_settings import FilterPolicy
+from utils.db.count import CountMode
+from utils.db.filter_planner import FilterPlanner
+from utils.exceptions import InvalidParameter
+from utils.graphql.filters import operators_input
 
 
-@pytest.mark.asyncio
-async def test_get_count(db):
-	mock_result = Mock()
-	mock_result.scalars.return_value.all.return_value = [1]
-	db.execute.return_value = mock_result
-	count = await get_count(db=db, model_db=Tasks)
-	assert count == 1
-	db.execute.assert_awaited_once()
+class SyncSession:
+	"""Run the statements of the repository in a sync session, it allows to
+	check the real SQL against sqlite in memory."""
+
+	def __init__(self, session: Session) -> None:
+		self.session = session
+
+	async def execute(self, statement, *args, **kwargs):
+		return self.session.execute(statement, *args, **kwargs)
+
+	async def scalar(self, statement, *args, **kwargs):
+		return self.session.scalar(statement, *args, **kwargs)
+
+
+@pytest.fixture
+def sqlite_db():
+	"""Sync sqlite session with 3 task lists of 2 tasks each, and a list with
+	the statements executed."""
+	engine = create_engine("sqlite://")
+	Base.metadata.create_all(engine)
+	statements: list[str] = []
+	with Session(engine) as session:
+		for number in range(3):
+			task_list = TaskList(name=f"List {number}", created_at=datetime.now(UTC))
+			task_list.tasks = [
+				Tasks(
+					title=f"Task {number}-{task}",
+					description="Description test",
+					status=Status.NEW,
+					priority=Priority.LOW,
+					created_at=datetime.now(UTC),
+				)
+				for task in range(2)
+			]
+			session.add(task_list)
+		session.commit()
+		session.expunge_all()
+		event.listen(
+			engine,
+			"before_cursor_execute",
+			lambda conn, cursor, statement, *args: statements.append(statement),
+		)
+		yield SyncSession(session), statements
+	engine.dispose()
 
 
 @pytest.mark.asyncio
@@ -34,7 +93,6 @@ async def test_capitalize_enum_name():
 
 
 @pytest.mark.asyncio
-@patch("repository.query.get_count", return_value=1)
 async def test_get_pagination_windows(db):
 	info = MagicMock(spec=strawberry.Info)
 	info.context.db = db
@@ -42,6 +100,7 @@ async def test_get_pagination_windows(db):
 	mock_task_repository.get_entity_pagination.return_value = (
 		[Tasks(**TASK_DATA_MOCK[0])],
 		1,
+		1,
 	)
 	pagination: PaginationWindow[TasksType] = PaginationWindow(
 		items=[TasksType(**TASK_DATA_MOCK[0])],
@@ -63,6 +122,88 @@ async def test_get_pagination_windows(db):
 
 	assert pagination.total_items == return_pagination.total_items
 	assert pagination.items[0].id == return_pagination.items[0].id
+	assert (
+		mock_task_repository.get_entity_pagination.call_args.kwargs["with_counts"]
+		is True
+	)
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_without_counts(db):
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = [
+		SelectedField(
+			name="tasks",
+			directives={},
+			arguments={},
+			selections=[
+				SelectedField(
+					name="items",
+					directives={},
+					arguments={},
+					selections=[],
+				)
+			],
+		)
+	]
+	mock_task_repository = AsyncMock()
+	mock_task_repository.get_entity_pagination.return_value = (
+		[Tasks(**TASK_DATA_MOCK[0])],
+		None,
+		None,
+	)
+
+	return_pagination = await get_pagination_windows(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=TaskGQLResponse,  # type: ignore
+		model=mock_task_repository,
+		filter="",
+		model_db=Tasks,  # type: ignore
+		info=info,
+	)
+
+	assert return_pagination.items[0].id == TASK_DATA_MOCK[0]["id"]
+	assert (
+		mock_task_repository.get_entity_pagination.call_args.kwargs["with_counts"]
+		is False
+	)
+
+
+@pytest.mark.asyncio
+@patch("repository.query.count_provider.count", return_value=1000)
+async def test_get_pagination_windows_estimate(mock_count, db):
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	mock_task_repository = AsyncMock()
+	mock_task_repository.get_entity_pagination.return_value = (
+		[Tasks(**TASK_DATA_MOCK[0])],
+		1,
+		None,
+	)
+
+	return_pagination = await get_pagination_windows(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=TaskGQLResponse,  # type: ignore
+		model=mock_task_repository,
+		filter="",
+		model_db=Tasks,  # type: ignore
+		info=info,
+		count_mode=CountMode.ESTIMATE,
+	)
+
+	assert return_pagination.total_items == 1000
+	assert return_pagination.count_mode == CountModeGQLEnum.ESTIMATE
+	assert (
+		mock_task_repository.get_entity_pagination.call_args.kwargs["with_total"]
+		is False
+	)
+	mock_count.assert_awaited_once_with(db, Tasks, CountMode.ESTIMATE)
+
 
 @pytest.mark.asyncio
 async def test_get_pagination_windows_more_than_100(db):
@@ -83,7 +224,6 @@ async def test_get_pagination_windows_more_than_100(db):
 	assert str(exc.value) == "limit (1000) must be between 0-100"
 
 @pytest.mark.asyncio
-@patch("repository.query.get_count", return_value=1)
 async def test_get_pagination_windows_task_list(db):
 	info = MagicMock(spec=strawberry.Info)
 	info.context.db = db
@@ -100,6 +240,7 @@ async def test_get_pagination_windows_task_list(db):
 			)
 		],
 		1,
+		1,
 	)
 	pagination: PaginationWindow[ListTaskType] = PaginationWindow(
 		items=[
@@ -147,3 +288,373 @@ async def test_get_pagination_windows_task_list_more_than_100(db):
 			info=info,
 		)
 	assert str(exc.value) == "limit (1000) must be between 0-100"
+
+
+@pytest.mark.asyncio
+async def test_get_connection_window(db):
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	mock_task_repository = AsyncMock()
+	mock_task_repository.keyset_columns = Repository(Tasks).keyset_columns
+	mock_task_repository.get_entity_keyset.return_value = (
+		[Tasks(**task) for task in TASK_DATA_MOCK],
+		True,
+	)
+
+	connection = await get_connection_window(
+		order_by="asc",
+		limit=2,
+		schema=TaskGQLResponse,  # type: ignore
+		model=mock_task_repository,
+		filter="",
+		model_db=Tasks,  # type: ignore
+		info=info,
+	)
+
+	assert [edge.node.id for edge in connection.edges] == [
+		task["id"] for task in TASK_DATA_MOCK
+	]
+	assert connection.page_info.has_next_page is True
+	assert connection.page_info.has_previous_page is False
+	assert connection.page_info.end_cursor == connection.edges[-1].cursor
+	next_page = mock_task_repository.get_entity_keyset.call_args.kwargs
+	assert next_page["after"] is None and next_page["before"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_task_list_statements(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+
+	return_pagination = await get_pagination_windows_task_list(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=ListTaskGQLResponse,  # type: ignore
+		model=tasks_list_repository,
+		filter="",
+		model_db=TaskList,  # type: ignore
+		info=info,
+	)
+
+	assert len(statements) == 2
+	assert "JOIN" not in statements[0]
+	assert return_pagination.total_items == 3
+	assert [len(item.tasks) for item in return_pagination.items] == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_related_filters(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = []
+
+	task_lists = await get_pagination_windows_task_list(
+		order_by="asc",
+		limit=10,
+		schema=ListTaskGQLResponse,  # type: ignore
+		model=tasks_list_repository,
+		# Both tasks of each list match, the lists aren't repeated.
+		filter='[["tasks.description", "=", "Description test"], ["tasks.title", "!=", "Task 0-0"]]',
+		model_db=TaskList,  # type: ignore
+		info=info,
+	)
+	tasks = await get_pagination_windows(
+		order_by="asc",
+		limit=10,
+		schema=TaskGQLResponse,  # type: ignore
+		model=tasks_repository,
+		filter='[["task_list.name", "=", "List 2"]]',
+		model_db=Tasks,  # type: ignore
+		info=info,
+	)
+
+	assert sorted(item.name for item in task_lists.items) == ["List 0", "List 1", "List 2"]
+	assert task_lists.pagination_items == 3
+	assert "EXISTS" in statements[0]
+	assert "JOIN" not in statements[0]
+	assert sorted(item.title for item in tasks.items) == ["Task 2-0", "Task 2-1"]
+	assert tasks.pagination_items == 2
+
+
+@pytest.mark.asyncio
+async def test_get_windows_sort(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = []
+	sort = [
+		TaskListSort(
+			column=TaskListSortColumnGQLEnum.NAME, direction=SortDirectionGQLEnum.DESC
+		)
+	]
+	window = {
+		"limit": 2,
+		"schema": ListTaskGQLResponse,
+		"model": tasks_list_repository,
+		"model_db": TaskList,
+		"info": info,
+		"sort": sort,
+	}
+
+	page = await get_pagination_windows_task_list(offset=1, **window)  # type: ignore
+	first = await get_connection_window_task_list(**window)  # type: ignore
+	second = await get_connection_window_task_list(
+		after=first.page_info.end_cursor,
+		**window,  # type: ignore
+	)
+
+	assert [item.name for item in page.items] == ["List 1", "List 0"]
+	assert "ORDER BY task_list.name DESC, task_list.id DESC" in statements[0]
+	assert [edge.node.name for edge in first.edges] == ["List 2", "List 1"]
+	assert [edge.node.name for edge in second.edges] == ["List 0"]
+	assert second.page_info.has_next_page is False
+
+
+@pytest.mark.asyncio
+async def test_get_task_stats(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+
+	stats = await get_task_stats(info, group_by=["status", "task_list_id"])
+	filtered = await get_task_stats(
+		info, group_by=["status"], filter='[["title", "like", "Task 1-%"]]'
+	)
+
+	assert len(statements) == 2
+	assert "GROUP BY tasks.status, tasks.task_list_id" in statements[0]
+	assert [bucket.count for bucket in stats.buckets] == [2, 2, 2]
+	assert {bucket.status for bucket in stats.buckets} == {StatusGQLEnum.NEW}
+	assert len({bucket.task_list_id for bucket in stats.buckets}) == 3
+	assert stats.buckets[0].priority is None
+	assert stats.total == 6
+	assert filtered.total == 2
+	with pytest.raises(InvalidParameter):
+		await get_task_stats(info, group_by=["nope"])
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_task_list_without_tasks(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.context.loaders = Loaders(db)
+	info.selected_fields = [
+		SelectedField(
+			name="task_list",
+			directives={},
+			arguments={},
+			selections=[
+				SelectedField(
+					name="items",
+					directives={},
+					arguments={},
+					selections=[
+						SelectedField(
+							name="name", directives={}, arguments={}, selections=[]
+						)
+					],
+				),
+				SelectedField(
+					name="total_items", directives={}, arguments={}, selections=[]
+				),
+			],
+		)
+	]
+
+	return_pagination = await get_pagination_windows_task_list(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=ListTaskGQLResponse,  # type: ignore
+		model=tasks_list_repository,
+		filter="",
+		model_db=TaskList,  # type: ignore
+		info=info,
+	)
+
+	# The tasks weren't selected, only the page is queried.
+	assert len(statements) == 1
+	assert return_pagination.total_items == 3
+	assert [item.tasks for item in return_pagination.items] == [[], [], []]
+
+
+def selected(name, *selections):
+	return SelectedField(
+		name=name, directives={}, arguments={}, selections=list(selections)
+	)
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_projection(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = [
+		selected("tasks", selected("items", selected("id"), selected("title")))
+	]
+
+	return_pagination = await get_pagination_windows(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=TaskGQLResponse,  # type: ignore
+		model=tasks_repository,
+		filter="",
+		model_db=Tasks,  # type: ignore
+		info=info,
+	)
+
+	assert len(statements) == 1
+	assert "title" in statements[0]
+	assert "description" not in statements[0]
+	assert "priority" not in statements[0]
+	assert {item.title for item in return_pagination.items} == {
+		f"Task {number}-{task}" for number in range(3) for task in range(2)
+	}
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_facets(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = [
+		selected(
+			"tasks",
+			selected("items", selected("id")),
+			selected("facets", selected("column"), selected("buckets")),
+		)
+	]
+
+	return_pagination = await get_pagination_windows(
+		limit=1,
+		schema=TaskGQLResponse,  # type: ignore
+		model=tasks_repository,
+		filter='[["title", "like", "Task 1-%"]]',
+		model_db=Tasks,  # type: ignore
+		info=info,
+	)
+
+	status, priority = return_pagination.facets
+	# The facets count the filtered dataset, not the page.
+	assert status.column == "status"
+	assert [(b.value, b.count) for b in status.buckets] == [
+		("NEW", 2),
+		("ACTIVE", 0),
+		("COMPLETED", 0),
+		("BLOCKED", 0),
+		("ERROR", 0),
+	]
+	assert {b.value: b.count for b in priority.buckets}["LOW"] == 2
+	assert len(statements) == 2
+	assert "count(*) FILTER (WHERE tasks.status = ?)" in statements[1]
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_where(sqlite_db):
+	db, _ = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = []
+	string_filter = operators_input(str)
+
+	return_pagination = await get_pagination_windows(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=TaskGQLResponse,  # type: ignore
+		model=tasks_repository,
+		filter='[["description", "=", "Description test"]]',
+		where=TaskFilter(
+			or_=[
+				TaskFilter(title=string_filter(like="Task 1-%")),
+				TaskFilter(title=string_filter(eq="Task 2-0")),
+			]
+		),
+		model_db=Tasks,  # type: ignore
+		info=info,
+	)
+
+	assert sorted(item.title for item in return_pagination.items) == [
+		"Task 1-0",
+		"Task 1-1",
+		"Task 2-0",
+	]
+	assert return_pagination.pagination_items == 3
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_explain(sqlite_db):
+	db, _ = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.context.explain = []
+	info.field_name = "tasks"
+	info.selected_fields = []
+	planner = FilterPlanner(policy=FilterPolicy.REJECT, explain=True)
+	cost = {"node_type": "Index Scan", "total_cost": 8.2, "plan_rows": 1}
+
+	with (
+		patch("repository.query.filter_planner", planner),
+		patch.object(planner, "explain_cost", AsyncMock(return_value=cost)),
+	):
+		await get_pagination_windows(
+			order_by="asc",
+			limit=10,
+			schema=TaskGQLResponse,  # type: ignore
+			model=tasks_repository,
+			filter='[["status", "=", "NEW"]]',
+			model_db=Tasks,  # type: ignore
+			info=info,
+		)
+		with pytest.raises(InvalidParameter):
+			await get_pagination_windows(
+				order_by="asc",
+				limit=10,
+				schema=TaskGQLResponse,  # type: ignore
+				model=tasks_repository,
+				filter='[["title", ">", "Task"]]',
+				model_db=Tasks,  # type: ignore
+				info=info,
+			)
+
+	assert info.context.explain == [{"field": "tasks", **cost}]
+
+
+@pytest.mark.asyncio
+async def test_get_pagination_windows_task_list_projection(sqlite_db):
+	db, statements = sqlite_db
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.context.loaders = MagicMock()
+	info.selected_fields = [
+		selected(
+			"task_list",
+			selected("items", selected("name"), selected("tasks", selected("title"))),
+		)
+	]
+
+	return_pagination = await get_pagination_windows_task_list(
+		order_by="asc",
+		limit=10,
+		offset=0,
+		schema=ListTaskGQLResponse,  # type: ignore
+		model=tasks_list_repository,
+		filter="",
+		model_db=TaskList,  # type: ignore
+		info=info,
+	)
+
+	assert len(statements) == 2
+	assert "created_at" not in statements[0]
+	assert "description" not in statements[1]
+	assert {
+		item.name: sorted(task.title for task in item.tasks)
+		for item in return_pagination.items
+	} == {f"List {n}": [f"Task {n}-0", f"Task {n}-1"] for n in range(3)}
+	# Partial tasks aren't primed in the loaders.
+	info.context.loaders.task_by_id.prime_many.assert_not_called()
@@ -2,10 +2,16 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 from mock_tasks import TASK_DATA_MOCK
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.models import Tasks
+from models.models import TaskList, Tasks
+from repository.repository import Repository, eager_options, projection
 from schema.tasks import Status
+from schema.tasks import Tasks as TaskSchema
+from utils.db.cursor import encode_entity_cursor
+from utils.db.sort import SortSpec
+from utils.exceptions import EntityDoesNotExistError, InvalidParameter
 
 TEST_TASKS = [
 	Tasks(**TASK_DATA_MOCK[0]),
@@ -42,17 +48,45 @@ async def test_get_entity(repo, mock_db):
 
 @pytest.mark.asyncio
 async def test_get_entity_pagination(repo, mock_db):
-	mock_db.scalar.return_value = 2
+	mock_db.execute.return_value.all.return_value = [
+		(task, 2, 5) for task in TEST_TASKS
+	]
 	result = await repo.get_entity_pagination(
 		db=mock_db, limit=5, offset=0, order_by="asc", filter=()
 	)
 
-	mock_db.execute.assert_awaited()
-	assert result == (TEST_TASKS, 2)
+	mock_db.execute.assert_awaited_once()
+	assert result == (TEST_TASKS, 2, 5)
 
 	stmt = mock_db.execute.call_args[0][0]
 	sql_text = str(stmt)
 	assert "OFFSET" in sql_text and "LIMIT" in sql_text
+	assert "count(*) OVER ()" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_get_entity_pagination_without_counts(repo, mock_db):
+	result = await repo.get_entity_pagination(
+		db=mock_db, limit=5, offset=0, order_by="asc", filter=(), with_counts=False
+	)
+
+	mock_db.execute.assert_awaited_once()
+	assert result == (TEST_TASKS, None, None)
+	assert "count" not in str(mock_db.execute.call_args[0][0])
+
+
+@pytest.mark.asyncio
+async def test_get_entity_pagination_empty_page(repo, mock_db):
+	mock_db.execute.return_value.all.return_value = []
+	mock_db.execute.return_value.one.return_value = (2, 5)
+	result = await repo.get_entity_pagination(
+		db=mock_db, limit=5, offset=10, order_by="asc", filter=()
+	)
+
+	assert result == ([], 2, 5)
+	assert mock_db.execute.await_count == 2
+	count_sql = str(mock_db.execute.call_args[0][0])
+	assert "ORDER BY" not in count_sql
 
 
 @pytest.mark.asyncio
@@ -68,30 +102,359 @@ async def test_get_entity_by_id(repo, mock_db):
 	assert "id" in str(stmt)
 
 
+@pytest.mark.asyncio
+async def test_get_entities_by_ids(repo, mock_db):
+	ids = [task.id for task in TEST_TASKS]
+	result = await repo.get_entities_by_ids(ids, db=mock_db)
+
+	mock_db.execute.assert_awaited_once()
+	assert result == TEST_TASKS
+
+	stmt = mock_db.execute.call_args[0][0]
+	sql_text = str(stmt.compile(dialect=postgresql.dialect()))
+	assert "tasks.id = ANY (%(ids)s::UUID[])" in sql_text
+	assert stmt.compile().params["ids"] == ids
+
+
+@pytest.mark.asyncio
+async def test_get_entities_by_ids_column(repo, mock_db):
+	await repo.get_entities_by_ids([TEST_TASKS[0].id], db=mock_db, column=Tasks.task_list_id)
+
+	stmt = mock_db.execute.call_args[0][0]
+	assert "tasks.task_list_id = ANY" in str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_create_entity_without_commit(repo, mock_db):
+	result = await repo.create_entity(
+		TaskSchema(title="Task", description="Test"), db=mock_db, commit=False
+	)
+
+	assert result.title == "Task"
+	mock_db.add.assert_called_once_with(result)
+	mock_db.flush.assert_awaited_once()
+	mock_db.commit.assert_not_awaited()
+	mock_db.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_entities(repo, mock_db):
+	schemas = [TaskSchema(title=f"Task {n}", description="Test") for n in range(5)]
+	mock_db.execute.side_effect = [
+		[Mock(_mapping=schema.model_dump()) for schema in schemas[:2]],
+		[Mock(_mapping=schema.model_dump()) for schema in schemas[2:4]],
+		[Mock(_mapping=schema.model_dump()) for schema in schemas[4:]],
+	]
+
+	result = await repo.create_entities(schemas, db=mock_db, chunk_size=2)
+
+	assert [task.title for task in result] == [schema.title for schema in schemas]
+	assert mock_db.execute.await_count == 3
+	mock_db.commit.assert_awaited_once()
+	mock_db.add.assert_not_called()
+	sql_text = str(mock_db.execute.call_args_list[0][0][0])
+	assert "VALUES" in sql_text and "RETURNING" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_update_entities(repo, mock_db):
+	mock_db.execute.return_value = [
+		Mock(_mapping={**TASK_DATA_MOCK[0], "status": Status.COMPLETED})
+	]
+
+	result = await repo.update_entities(
+		db=mock_db,
+		entity_schema={"status": Status.COMPLETED},
+		filter=(Tasks.status == Status.ACTIVE,),
+	)
+
+	assert result[0].status == Status.COMPLETED
+	mock_db.execute.assert_awaited_once()
+	mock_db.commit.assert_awaited_once()
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert sql_text.startswith("UPDATE tasks SET status")
+	assert "WHERE tasks.status" in sql_text and "RETURNING" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_delete_entities(repo, mock_db):
+	mock_db.execute.return_value = [Mock(_mapping=TASK_DATA_MOCK[0])]
+
+	result = await repo.delete_entities(
+		db=mock_db, filter=(Tasks.status == Status.COMPLETED,), commit=False
+	)
+
+	assert result[0].id == TASK_DATA_MOCK[0]["id"]
+	mock_db.commit.assert_not_awaited()
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert sql_text.startswith("DELETE FROM tasks WHERE tasks.status")
+	assert "RETURNING" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_bulk_without_filter(repo, mock_db):
+	with pytest.raises(InvalidParameter):
+		await repo.update_entities(
+			db=mock_db, entity_schema={"status": Status.COMPLETED}, filter=()
+		)
+	with pytest.raises(InvalidParameter):
+		await repo.delete_entities(db=mock_db, filter=())
+	mock_db.execute.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_update_entity(repo, mock_db):
+	mock_db.execute.return_value.one_or_none.return_value = Mock(
+		_mapping={**TASK_DATA_MOCK[0], "status": Status.COMPLETED}
+	)
 	result = await repo.update_entity(
 		db=mock_db,
 		entity_id="6aa51c81-b757-4baa-928a-afa23b97e7a8",
 		entity_schema={"status": Status.COMPLETED},
-		filter=(),
+		filter=(Tasks.title == "Test",),
 	)
-	update_tasks = TEST_TASKS[0].__dict__
-	update_tasks["status"] = Status.COMPLETED
-	mock_db.execute.assert_awaited()
-	assert result.status == update_tasks["status"]
+	# One round trip, the row comes back with RETURNING.
+	mock_db.execute.assert_awaited_once()
+	mock_db.commit.assert_awaited_once()
+	assert result.status == Status.COMPLETED
+	assert result.id == TASK_DATA_MOCK[0]["id"]
 
-	stmt = mock_db.execute.call_args[0][0]
-	assert "id" in str(stmt)
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert "WHERE tasks.id = :id_1 AND tasks.title = :title_1" in sql_text
+	assert "RETURNING" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_update_entity_not_found(repo, mock_db):
+	mock_db.execute.return_value.one_or_none.return_value = None
+	with pytest.raises(EntityDoesNotExistError):
+		await repo.update_entity(
+			db=mock_db,
+			entity_id="6aa51c81-b757-4baa-928a-afa23b97e7a8",
+			entity_schema={"status": Status.COMPLETED},
+		)
+	mock_db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_entity_with_previous(repo, mock_db):
+	updated = {**TASK_DATA_MOCK[0], "status": Status.COMPLETED}
+	keys = list(Tasks.__table__.c.keys())
+	mock_db.execute.return_value.one_or_none.return_value = tuple(
+		[updated[key] for key in keys] + [TASK_DATA_MOCK[0][key] for key in keys]
+	)
+	result, previous = await repo.update_entity_with_previous(
+		db=mock_db,
+		entity_id=TASK_DATA_MOCK[0]["id"],
+		entity_schema={"status": Status.COMPLETED},
+	)
+	mock_db.execute.assert_awaited_once()
+	assert result.status == Status.COMPLETED
+	assert previous.status == TASK_DATA_MOCK[0]["status"]
+
+	sql_text = str(
+		mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+	)
+	assert sql_text.startswith("WITH previous AS")
+	assert "FOR UPDATE" in sql_text
+	assert "FROM previous WHERE tasks.id = previous.id RETURNING" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_update_entities_with_previous(repo, mock_db):
+	updated = {**TASK_DATA_MOCK[0], "status": Status.COMPLETED}
+	keys = list(Tasks.__table__.c.keys())
+	mock_db.execute.return_value = [
+		tuple([updated[key] for key in keys] + [TASK_DATA_MOCK[0][key] for key in keys])
+	]
+	[(result, previous)] = await repo.update_entities_with_previous(
+		db=mock_db,
+		entity_schema={"status": Status.COMPLETED},
+		filter=(Tasks.status == Status.NEW,),
+	)
+	mock_db.execute.assert_awaited_once()
+	mock_db.commit.assert_awaited_once()
+	assert result.status == Status.COMPLETED
+	assert previous.status == TASK_DATA_MOCK[0]["status"]
+
+	sql_text = str(
+		mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+	)
+	assert sql_text.startswith("WITH previous AS")
+	assert "WHERE tasks.status = %(status_1)s FOR UPDATE" in sql_text
+	assert "FROM previous WHERE tasks.id = previous.id RETURNING" in sql_text
 
 
 @pytest.mark.asyncio
 async def test_delete_entity(repo, mock_db):
-	mock_db.execute.return_value.rowcount.return_value = 1
+	mock_db.execute.return_value.one_or_none.return_value = (TASK_DATA_MOCK[0]["id"],)
 	result = await repo.delete_entity(
 		db=mock_db,
 		entity_id="6aa51c81-b757-4baa-928a-afa23b97e7a8",
 		filter=(),
 	)
-	mock_db.execute.assert_awaited()
+	# No select before the delete.
+	mock_db.execute.assert_awaited_once()
+	mock_db.commit.assert_awaited_once()
 	assert result is None
+
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert "DELETE FROM tasks" in sql_text and "RETURNING tasks.id" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_delete_entity_not_found(repo, mock_db):
+	mock_db.execute.return_value.one_or_none.return_value = None
+	with pytest.raises(EntityDoesNotExistError):
+		await repo.delete_entity(
+			db=mock_db,
+			entity_id="6aa51c81-b757-4baa-928a-afa23b97e7a8",
+			filter=(),
+		)
+	mock_db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delete_entity_returning(repo, mock_db):
+	columns = projection(Tasks, ["title"])
+	mock_db.execute.return_value.one_or_none.return_value = tuple(
+		TASK_DATA_MOCK[0].get(column.key) for column in columns
+	)
+	result = await repo.delete_entity(
+		db=mock_db,
+		entity_id=TASK_DATA_MOCK[0]["id"],
+		filter=(),
+		returning=["title"],
+	)
+
+	assert isinstance(result, Tasks)
+	assert result.id == TASK_DATA_MOCK[0]["id"]
+	assert result.title == TASK_DATA_MOCK[0]["title"]
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert "tasks.title" in sql_text.split("RETURNING")[1]
+	assert "tasks.description" not in sql_text
+
+
+@pytest.mark.asyncio
+async def test_get_entity_keyset(repo, mock_db):
+	result = await repo.get_entity_keyset(
+		db=mock_db, limit=1, order_by="asc", filter=()
+	)
+
+	mock_db.execute.assert_awaited_once()
+	assert result == ([TEST_TASKS[0]], True)
+
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert "OFFSET" not in sql_text and "LIMIT" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_get_entity_keyset_after_cursor(repo, mock_db):
+	cursor = encode_entity_cursor(
+		repo.keyset_columns([Tasks.created_at]), TEST_TASKS[0]
+	)
+	result = await repo.get_entity_keyset(
+		db=mock_db,
+		limit=5,
+		order_by="desc",
+		filter=(),
+		after=cursor,
+		sort_columns=[Tasks.created_at],
+	)
+
+	assert result == (TEST_TASKS, False)
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert "(tasks.created_at, tasks.id) <" in sql_text
+	assert "ORDER BY tasks.created_at DESC, tasks.id DESC" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_get_entity_keyset_before_cursor(repo, mock_db):
+	cursor = encode_entity_cursor(repo.keyset_columns(), TEST_TASKS[1])
+	items, has_more = await repo.get_entity_keyset(
+		db=mock_db, limit=5, order_by="asc", filter=(), before=cursor
+	)
+
+	assert items == TEST_TASKS[::-1]
+	assert has_more is False
+	sql_text = str(mock_db.execute.call_args[0][0])
+	assert "tasks.id <" in sql_text
+	assert "ORDER BY tasks.id DESC" in sql_text
+
+
+@pytest.mark.asyncio
+async def test_get_entity_pagination_sort(mock_db):
+	repo = Repository(Tasks, sortable=("priority",))
+	mock_db.execute.return_value.all.return_value = []
+	mock_db.execute.return_value.one.return_value = (0, 0)
+	await repo.get_entity_pagination(
+		db=mock_db,
+		limit=5,
+		offset=0,
+		order_by=[SortSpec("priority", "desc", "last")],
+		filter=(),
+	)
+
+	sql_text = str(mock_db.execute.call_args_list[0][0][0])
+	assert "ORDER BY tasks.priority DESC NULLS LAST, tasks.id DESC" in sql_text
+	with pytest.raises(InvalidParameter):
+		await repo.get_entity_pagination(
+			db=mock_db, limit=5, offset=0, order_by=[SortSpec("title")], filter=()
+		)
+
+
+@pytest.mark.asyncio
+async def test_get_entity_keyset_mixed_sort(mock_db):
+	repo = Repository(Tasks, sortable=("priority", "created_at", "updated_at"))
+	order_by = [SortSpec("priority", "desc"), SortSpec("created_at")]
+	cursor = encode_entity_cursor(repo.keyset_columns(order_by=order_by), TEST_TASKS[0])
+	await repo.get_entity_keyset(
+		db=mock_db, limit=5, order_by=order_by, filter=(), before=cursor
+	)
+
+	sql_text = str(mock_db.execute.call_args[0][0])
+	# The row value can't mix directions, the seek is expanded.
+	assert (
+		"tasks.priority > :priority_1 OR tasks.priority = :priority_2 AND tasks.created_at < :created_at_1"
+		" OR tasks.priority = :priority_3 AND tasks.created_at = :created_at_2 AND tasks.id < :id_1"
+	) in sql_text
+	assert "ORDER BY tasks.priority ASC, tasks.created_at DESC, tasks.id DESC" in sql_text
+	with pytest.raises(InvalidParameter):
+		await repo.get_entity_keyset(
+			db=mock_db, limit=5, order_by=[SortSpec("updated_at")], filter=()
+		)
+
+
+@pytest.mark.asyncio
+async def test_get_entity_keyset_invalid_cursor(repo, mock_db):
+	with pytest.raises(InvalidParameter):
+		await repo.get_entity_keyset(
+			db=mock_db, limit=5, order_by="asc", filter=(), after="not-a-cursor"
+		)
+	mock_db.execute.assert_not_awaited()
+
+
+def test_eager_options():
+	assert len(eager_options(TaskList, {"tasks": "selectin"})) == 1
+	with pytest.raises(InvalidParameter):
+		eager_options(TaskList, {"name": "selectin"})
+	with pytest.raises(InvalidParameter):
+		eager_options(TaskList, {"tasks": "lazy"})  # type: ignore
+
+
+def test_projection():
+	# The keys are always loaded, the names that aren't columns are ignored.
+	assert projection(Tasks, ["title", "tasks", "__typename"]) == [
+		Tasks.id,
+		Tasks.task_list_id,
+		Tasks.title,
+	]
+	assert len(eager_options(TaskList, {"tasks": "selectin"}, ["name", "tasks.title"])) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_entity_facets_not_enum(repo, mock_db):
+	with pytest.raises(InvalidParameter):
+		await repo.get_entity_facets(db=mock_db, columns=["title"], filter=())
+	mock_db.execute.assert_not_awaited()
+	assert await repo.get_entity_facets(db=mock_db, columns=[], filter=()) == {}
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import strawberry
+from mock_tasks import TASK_DATA_MOCK
+from sqlalchemy.dialects import postgresql
+
+from models.models import Tasks
+from repository.query import get_search_window
+from repository.search import search_tasks
+from utils.db.dynamic_filter import get_filters
+from utils.exceptions import InvalidParameter
+
+
+def compiled(db: AsyncMock) -> str:
+	return str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(db: AsyncMock):
+	tasks = [Tasks(**task) for task in TASK_DATA_MOCK]
+	db.execute.return_value.all = MagicMock(
+		return_value=[(tasks[0], 0.5), (tasks[1], 0.25)]
+	)
+
+	result, has_more = await search_tasks(
+		db, "database", limit=1, filter=get_filters('[["status", "=", "NEW"]]', Tasks)
+	)
+
+	assert [task for task, _ in result] == [tasks[0]]
+	assert has_more
+	sql = compiled(db)
+	assert "tasks.search_vector @@ websearch_to_tsquery(%(websearch_to_tsquery_1)s" in sql
+	assert "tasks.status = %(status_1)s" in sql
+	assert "ORDER BY ts_rank_cd(" in sql and "DESC, tasks.id DESC" in sql
+	assert "LIMIT %(param_1)s" in sql
+
+	# The cursor seeks from the rank and the id of the last task.
+	db.execute.return_value.all.return_value = [(tasks[1], 0.25)]
+	result, has_more = await search_tasks(db, "database", limit=1, after=result[0][1])
+
+	assert [task for task, _ in result] == [tasks[1]]
+	assert not has_more
+	assert "(ts_rank_cd(tasks.search_vector" in compiled(db)
+	params = db.execute.call_args[0][0].compile(dialect=postgresql.dialect()).params
+	assert 0.5 in params.values() and tasks[0].id in params.values()
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_invalid_cursor(db: AsyncMock):
+	with pytest.raises(InvalidParameter):
+		await search_tasks(db, "database", limit=1, after="invalid")
+
+
+@pytest.mark.asyncio
+async def test_get_search_window(db: AsyncMock):
+	tasks = [Tasks(**task) for task in TASK_DATA_MOCK]
+	db.execute.return_value.all = MagicMock(return_value=[(tasks[0], 0.5)])
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	info.selected_fields = []
+
+	connection = await get_search_window(info=info, query="database", limit=10)
+
+	assert [edge.node.id for edge in connection.edges] == [tasks[0].id]
+	assert not connection.page_info.has_next_page
+	assert connection.page_info.end_cursor == connection.edges[0].cursor
+
+
+@pytest.mark.asyncio
+async def test_get_search_window_empty_query(db: AsyncMock):
+	info = MagicMock(spec=strawberry.Info)
+	info.context.db = db
+	with pytest.raises(InvalidParameter):
+		await get_search_window(info=info, query="  ", limit=10)
+	db.execute.assert_not_awaited()
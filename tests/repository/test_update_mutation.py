@@ -1,5 +1,6 @@
 from enum import Enum
 from unittest.mock import AsyncMock, Mock, patch
+from uuid import UUID
 
 import pytest
 from mock_task_list import MOCK_TASK_LIST
@@ -8,13 +9,21 @@ from mock_tasks import TASK_DATA_MOCK
 from models.models import TaskList, Tasks
 from repository.update_mutation import (
 	convert_enum,
+	get_patch_values,
 	list_tasks_update,
 	update_task_in_task_list,
 	update_tasks,
+	update_tasks_bulk,
+	update_tasks_where,
+)
+from schema.grapql_schemas import (
+	ListTasksUpdate,
+	StatusGQLEnum,
+	TasksPatchGQL,
+	TasksUpdateGQL,
 )
-from schema.grapql_schemas import ListTasksUpdate, StatusGQLEnum, TasksUpdateGQL
 from schema.tasks import Status
-from utils.fastapi.email.email_sender import fm
+from utils.exceptions import EntityDoesNotExistError, InvalidParameter
 
 TASK_ID = "6ebdc61a-a2cf-4621-844e-a613cf15bbaf"
 USER_ID = "8d2b2513-5fc4-45da-b36f-cf68567dc835"
@@ -58,13 +67,14 @@ async def test_update_task(strawberry_context):
 	data_to_return["status"] = Status.ACTIVE
 	data_to_return["title"] = "Test 2"
 	with patch(
-		"repository.update_mutation.tasks_repository.update_entity",
-		return_value=Tasks(**data_to_return),
-	):
+		"repository.update_mutation.tasks_repository.update_entity_with_previous",
+		return_value=(Tasks(**data_to_return), Tasks(**TASK_DATA_MOCK[0])),
+	) as mock_update:
 		task = await update_tasks(
 			id=TASK_ID, tasks=data_to_update, info=strawberry_context
 		)
 	assert task.status == data_to_return["status"].value
+	mock_update.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -82,24 +92,57 @@ async def test_update_task_with_user(strawberry_context):
 	data_to_return["user"] = USER_ID
 	with (
 		patch(
-			"repository.update_mutation.tasks_repository.update_entity",
-			return_value=Tasks(**data_to_return),
+			"repository.update_mutation.tasks_repository.update_entity_with_previous",
+			return_value=(Tasks(**data_to_return), Tasks(**TASK_DATA_MOCK[0])),
 		),
 		patch(
-			"repository.update_mutation.user_repository.get_entity_by_id",
-			return_value=Mock(email="test@example.com"),
-		),
-		patch(
-			"repository.update_mutation.tasks_repository.get_entity_by_id",
-			return_value=Tasks(**TASK_DATA_MOCK[0]),
-		),
+			"repository.loaders.user_repository.get_entities_by_ids",
+			return_value=[Mock(id=UUID(USER_ID), email="test@example.com")],
+		) as mock_get_users,
+		patch("repository.update_mutation.send_email_for_task") as mock_send_email,
 	):
-		fm.config.SUPPRESS_SEND = 1
 		task = await update_tasks(
 			id=TASK_ID, tasks=data_to_update, info=strawberry_context
 		)
 	assert task.status == data_to_return["status"].value
 	assert str(task.user) == data_to_return["user"]
+	mock_get_users.assert_awaited_once()
+	mock_send_email.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_task_same_user(strawberry_context):
+	data_to_update = TasksUpdateGQL(
+		**{"status": StatusGQLEnum.ACTIVE, "user": TASK_DATA_MOCK[0]["user"]}
+	)
+	with (
+		patch(
+			"repository.update_mutation.tasks_repository.update_entity_with_previous",
+			return_value=(Tasks(**TASK_DATA_MOCK[0]), Tasks(**TASK_DATA_MOCK[0])),
+		),
+		patch(
+			"repository.loaders.user_repository.get_entities_by_ids",
+			return_value=[Mock(id=TASK_DATA_MOCK[0]["user"], email="test@example.com")],
+		),
+		patch("repository.update_mutation.send_email_for_task") as mock_send_email,
+	):
+		await update_tasks(id=TASK_ID, tasks=data_to_update, info=strawberry_context)
+	# The user didn't change, nobody is notified.
+	mock_send_email.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_task_user_not_found(strawberry_context):
+	data_to_update = TasksUpdateGQL(**{"user": USER_ID})
+	with (
+		patch(
+			"repository.update_mutation.tasks_repository.update_entity_with_previous"
+		) as mock_update,
+		patch("repository.loaders.user_repository.get_entities_by_ids", return_value=[]),
+		pytest.raises(EntityDoesNotExistError),
+	):
+		await update_tasks(id=TASK_ID, tasks=data_to_update, info=strawberry_context)
+	mock_update.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -107,8 +150,9 @@ async def test_update_task_with_user(strawberry_context):
 	"repository.update_mutation.tasks_list_repository.update_entity",
 	return_value=TaskList(**MOCK_TASK_LIST),
 )
+@patch("repository.loaders.tasks_repository.get_entities_by_ids", return_value=[])
 async def test_list_tasks_updates(
-	mock_result_data, db_with: AsyncMock, strawberry_context
+	mock_get_entities, mock_result_data, db_with: AsyncMock, strawberry_context
 ):
 	db_cm, session_mock = db_with
 	update_name = ListTasksUpdate(name="List Test 2")
@@ -127,14 +171,125 @@ async def test_list_tasks_updates_with_tasks(
 	mock_result_data, db: AsyncMock, strawberry_context
 ):
 	task_to_return = TASK_DATA_MOCK[0].copy()
-	task_to_return["tasks_list_id"] = MOCK_TASK_LIST["id"]
-	db.refresh.return_value = Tasks(**TASK_DATA_MOCK[0])
-	with patch(
-		"repository.update_mutation.update_task_in_task_list",
-		return_value=None,
+	task_to_return["task_list_id"] = MOCK_TASK_LIST["id"]
+	with (
+		patch(
+			"repository.update_mutation.update_task_in_task_list",
+			return_value=None,
+		),
+		patch(
+			"repository.loaders.tasks_repository.get_entities_by_ids",
+			return_value=[Tasks(**task_to_return)],
+		),
 	):
 		update_name = ListTasksUpdate(name="List Test 2", tasks=[task_to_return["id"]])
 		return_data = await list_tasks_update(
 			id=MOCK_TASK_LIST["id"], info=strawberry_context, list_tasks=update_name
 		)
 		assert return_data.id == MOCK_TASK_LIST["id"]
+		assert return_data.tasks[0].id == task_to_return["id"]
+
+
+def test_get_patch_values():
+	values = get_patch_values(
+		TasksPatchGQL(status=StatusGQLEnum.COMPLETED, description=None)
+	)
+	assert set(values) == {"status", "description", "updated_at"}
+	assert values["status"] == Status.COMPLETED
+	assert values["description"] is None
+	with pytest.raises(InvalidParameter):
+		get_patch_values(TasksPatchGQL())
+	with pytest.raises(InvalidParameter):
+		get_patch_values(TasksPatchGQL(status=None))
+
+
+@pytest.mark.asyncio
+@patch(
+	"repository.update_mutation.tasks_repository.update_entities",
+	return_value=[Tasks(**task) for task in TASK_DATA_MOCK],
+)
+async def test_update_tasks_bulk(mock_update_entities, strawberry_context):
+	ids = [task["id"] for task in TASK_DATA_MOCK]
+	result = await update_tasks_bulk(
+		ids=ids,
+		patch=TasksPatchGQL(status=StatusGQLEnum.COMPLETED),
+		info=strawberry_context,
+	)
+
+	assert result.affected_rows == 2
+	assert result.ids == ids
+	mock_update_entities.assert_awaited_once()
+	kwargs = mock_update_entities.await_args.kwargs
+	assert kwargs["entity_schema"]["status"] == Status.COMPLETED
+	assert "tasks.id IN" in str(kwargs["filter"][0])
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_bulk_without_ids(strawberry_context):
+	with pytest.raises(InvalidParameter):
+		await update_tasks_bulk(
+			ids=[],
+			patch=TasksPatchGQL(status=StatusGQLEnum.COMPLETED),
+			info=strawberry_context,
+		)
+
+
+@pytest.mark.asyncio
+@patch("common.send_email.send_email_for_task")
+@patch(
+	"repository.update_mutation.tasks_repository.update_entities_with_previous",
+	return_value=[
+		# Only the first task changes of user.
+		(Tasks(**{**task, "user": UUID(USER_ID)}), Tasks(**previous))
+		for task, previous in zip(
+			TASK_DATA_MOCK,
+			[TASK_DATA_MOCK[0], {**TASK_DATA_MOCK[1], "user": UUID(USER_ID)}],
+			strict=True,
+		)
+	],
+)
+async def test_update_tasks_where_with_user(
+	mock_update_entities, mock_send_email, strawberry_context
+):
+	with patch(
+		"repository.loaders.user_repository.get_entities_by_ids",
+		return_value=[Mock(id=UUID(USER_ID), email="test@example.com")],
+	):
+		result = await update_tasks_where(
+			filter='[["status", "=", "active"]]',
+			patch=TasksPatchGQL(user=UUID(USER_ID)),
+			info=strawberry_context,
+		)
+
+	assert result.affected_rows == 2
+	mock_send_email.assert_awaited_once()
+	assert mock_send_email.await_args.kwargs["task"].id == TASK_DATA_MOCK[0]["id"]
+
+
+@pytest.mark.asyncio
+@patch("repository.update_mutation.tasks_repository.update_entities_with_previous")
+async def test_update_tasks_where_user_not_found(
+	mock_update_entities, strawberry_context
+):
+	with (
+		patch("repository.loaders.user_repository.get_entities_by_ids", return_value=[]),
+		pytest.raises(EntityDoesNotExistError),
+	):
+		await update_tasks_where(
+			filter='[["status", "=", "active"]]',
+			patch=TasksPatchGQL(user=UUID(USER_ID)),
+			info=strawberry_context,
+		)
+	mock_update_entities.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("repository.update_mutation.tasks_repository.update_entities")
+async def test_update_tasks_where_unknown_column(mock_update_entities, strawberry_context):
+	with pytest.raises(InvalidParameter):
+		await update_tasks_where(
+			filter='[["status", "=", "active"], ["titel", "=", "x"]]',
+			patch=TasksPatchGQL(status=StatusGQLEnum.COMPLETED),
+			info=strawberry_context,
+		)
+	mock_update_entities.assert_not_awaited()
@@ -10,6 +10,7 @@ from strawberry.schema import Schema
 from strawberry.schema.config import StrawberryConfig
 
 from models.models import TaskList, Tasks, Users
+from repository.loaders import Loaders
 from routes.graphql_route import Mutation, Query
 from utils.fastapi.email.email_sender import fm
 from mock_user import MOCK_USER
@@ -30,6 +31,7 @@ schema = Schema(
 class DbContext(BaseContext):
 	def __init__(self, db: AsyncSession):
 		self.db = db
+		self.loaders = Loaders(db)
 		# Await to retrieve the session instance, not the generator itself
 
 
@@ -83,10 +85,7 @@ async def test_query_route_tasks_success(mock_auth, db: AsyncMock):
     }
     """
 	mock_result = Mock()
-	mock_result.scalars.return_value.all.side_effect = [
-		[Tasks(**task) for task in TASK_DATA_MOCK],
-		[2],
-	]
+	mock_result.all.return_value = [(Tasks(**task), 2, 2) for task in TASK_DATA_MOCK]
 	db.execute.return_value = mock_result
 
 	result = await schema.execute(query=query, context_value=await get_context(db))
@@ -94,6 +93,84 @@ async def test_query_route_tasks_success(mock_auth, db: AsyncMock):
 	assert result.data["tasks"]["total_items"] == 2
 
 
+@pytest.mark.asyncio
+@patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
+async def test_query_route_tasks_without_counts(mock_auth, db: AsyncMock):
+	query = """
+    query MyQuery {
+    tasks(limit: 10) {
+    items {
+        id
+        title
+    }
+    }
+    }
+    """
+	mock_result = Mock()
+	mock_result.scalars.return_value.all.return_value = [
+		Tasks(**task) for task in TASK_DATA_MOCK
+	]
+	db.execute.return_value = mock_result
+
+	result = await schema.execute(query=query, context_value=await get_context(db))
+	assert not result.errors, result.errors
+	assert len(result.data["tasks"]["items"]) == 2
+	db.execute.assert_awaited_once()
+	assert "count" not in str(db.execute.call_args[0][0])
+
+
+@pytest.mark.asyncio
+@patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
+@patch("repository.create_mutation.tasks_repository.create_entity")
+async def test_query_route_tasks_cached(mock_create_entity, mock_auth, db: AsyncMock):
+	query = """
+    query MyQuery($limit: Int!) {
+    tasks(limit: $limit) {
+    items {
+        id
+        title
+    }
+    }
+    }
+    """
+	mutation = """
+    mutation MyMutation {
+    create_mutations {
+    create_tasks(tasks: {title: "Test Task", description: "Some test description"}) {
+        id
+    }
+    }
+    }"""
+	mock_result = Mock()
+	mock_result.scalars.return_value.all.return_value = [
+		Tasks(**task) for task in TASK_DATA_MOCK
+	]
+	db.execute.return_value = mock_result
+	mock_create_entity.return_value = Tasks(**TASK_DATA_MOCK[0])
+
+	first = await schema.execute(
+		query=query, variable_values={"limit": 10}, context_value=await get_context(db)
+	)
+	second = await schema.execute(
+		query=query, variable_values={"limit": 10}, context_value=await get_context(db)
+	)
+	assert not second.errors, second.errors
+	assert second.data == first.data
+	db.execute.assert_awaited_once()
+
+	# Other arguments are other key, the mutation invalidates the cached pages.
+	await schema.execute(
+		query=query, variable_values={"limit": 5}, context_value=await get_context(db)
+	)
+	assert db.execute.await_count == 2
+	result = await schema.execute(query=mutation, context_value=await get_context(db))
+	assert not result.errors, result.errors
+	await schema.execute(
+		query=query, variable_values={"limit": 10}, context_value=await get_context(db)
+	)
+	assert db.execute.await_count == 3
+
+
 @pytest.mark.asyncio
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
 async def test_query_route_list_tasks_without_tasks(mock_auth, db: AsyncMock):
@@ -109,17 +186,18 @@ async def test_query_route_list_tasks_without_tasks(mock_auth, db: AsyncMock):
     }
     """
 	mock_result = Mock()
-	mock_result.scalars.return_value.all.side_effect = [
-		[
+	mock_result.all.return_value = [
+		(
 			TaskList(
 				tasks=[],
 				id="0f115d4b-9fe3-4cfd-8339-7e5e49597167",
 				name="List Test",
 				created_at=datetime.now(UTC),
 				updated_at=None,
-			)
-		],
-		[1],
+			),
+			1,
+			1,
+		)
 	]
 	db.execute.return_value = mock_result
 
@@ -150,21 +228,23 @@ query MyQuery {
 }
     """
 	mock_result = Mock()
-	mock_result.scalars.return_value.all.side_effect = [
-		[
+	mock_result.all.return_value = [
+		(
 			TaskList(
 				tasks=[Tasks(**task) for task in TASK_DATA_MOCK],
 				id="0f115d4b-9fe3-4cfd-8339-7e5e49597167",
 				name="List Test",
 				created_at=datetime.now(UTC),
 				updated_at=None,
-			)
-		],
-		[1],
+			),
+			1,
+			1,
+		)
 	]
 	db.execute.return_value = mock_result
-	db.refresh.side_effect = [Tasks(**task) for task in TASK_DATA_MOCK]
 	result = await schema.execute(query=query, context_value=await get_context(db))
+	db.execute.assert_awaited_once()
+	db.refresh.assert_not_awaited()
 	assert (
 		result.data["task_list"]["items"][0]["id"]
 		== "0f115d4b-9fe3-4cfd-8339-7e5e49597167"
@@ -176,6 +256,41 @@ query MyQuery {
 	)
 
 
+@pytest.mark.asyncio
+@patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
+async def test_query_route_tasks_connection(mock_auth, db: AsyncMock):
+	query = """
+    query MyQuery {
+    tasks_connection(limit: 1) {
+    edges {
+        cursor
+        node {
+        id
+        title
+        }
+    }
+    page_info {
+        has_next_page
+        end_cursor
+    }
+    }
+    }
+    """
+	mock_result = Mock()
+	mock_result.scalars.return_value.all.return_value = [
+		Tasks(**task) for task in TASK_DATA_MOCK
+	]
+	db.execute.return_value = mock_result
+
+	result = await schema.execute(query=query, context_value=await get_context(db))
+	assert not result.errors, result.errors
+	connection = result.data["tasks_connection"]
+	assert len(connection["edges"]) == 1
+	assert connection["edges"][0]["node"]["title"] == TASK_DATA_MOCK[0]["title"]
+	assert connection["page_info"]["has_next_page"] is True
+	assert connection["page_info"]["end_cursor"] == connection["edges"][0]["cursor"]
+
+
 # ######################## MUTATIONS #################################
 # ######################## CREATE #################################
 # region Create
@@ -208,10 +323,40 @@ async def test_mutation_route_create_task(mock_create_entity, mock_auth, db: Asy
 	assert not result.errors, result.errors
 
 
+@pytest.mark.asyncio
+@patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
+@patch("repository.create_mutation.tasks_repository.create_entities")
+async def test_mutation_route_create_tasks_bulk(
+	mock_create_entities, mock_auth, db: AsyncMock
+):
+	query = """
+	mutation MyMutation {
+	create_mutations {
+	create_tasks_bulk(
+		tasks: [
+			{status: NEW, priority: CRITICAL, title: "Test Task", description: "First"},
+			{status: NEW, priority: LOW, title: "Other Task", description: "Second"}
+		]
+	) {
+		id
+		title
+	}
+	}
+	}"""
+
+	tasks = [{**task, "user": None} for task in TASK_DATA_MOCK]
+	mock_create_entities.return_value = [Tasks(**task) for task in tasks]
+	result = await schema.execute(query=query, context_value=await get_context(db))
+	assert not result.errors, result.errors
+	created = result.data["create_mutations"]["create_tasks_bulk"]
+	assert [task["id"] for task in created] == [str(task["id"]) for task in tasks]
+	mock_create_entities.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
 @patch("repository.create_mutation.tasks_repository.create_entity")
-@patch("repository.create_mutation.user_repository.get_entity_by_id")
+@patch("repository.loaders.user_repository.get_entities_by_ids")
 async def test_mutation_route_create_task_user(
 	mock_get_user, mock_create_entity, mock_auth, db: AsyncMock
 ):
@@ -235,7 +380,7 @@ async def test_mutation_route_create_task_user(
 
 	fake_task = Tasks(**TASK_DATA_MOCK[0])
 	mock_create_entity.return_value = fake_task
-	mock_get_user.return_value = Users(**MOCK_USER)
+	mock_get_user.return_value = [Users(**MOCK_USER)]
 	fm.config.SUPPRESS_SEND = 1
 	result = await schema.execute(
 		query=query,
@@ -249,8 +394,9 @@ async def test_mutation_route_create_task_user(
 @pytest.mark.asyncio
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
 @patch("repository.create_mutation.tasks_list_repository.create_entity")
+@patch("repository.loaders.tasks_repository.get_entities_by_ids", return_value=[])
 async def test_mutation_route_create_list_task(
-	mock_create_entity, mock_auth, db: AsyncMock
+	mock_get_tasks, mock_create_entity, mock_auth, db: AsyncMock
 ):
 	query = """
 	mutation MyMutation {
@@ -280,7 +426,7 @@ async def test_mutation_route_create_list_task(
 
 @pytest.mark.asyncio
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
-@patch("repository.update_mutation.tasks_repository.update_entity")
+@patch("repository.update_mutation.tasks_repository.update_entity_with_previous")
 async def test_mutation_route_update_task(mock_update_entity, mock_auth, db: AsyncMock):
 	query = """
 	mutation MyMutation {
@@ -296,7 +442,7 @@ async def test_mutation_route_update_task(mock_update_entity, mock_auth, db: Asy
 }"""
 
 	fake_task = Tasks(**TASK_DATA_MOCK[0])
-	mock_update_entity.return_value = fake_task
+	mock_update_entity.return_value = (fake_task, fake_task)
 	result = await schema.execute(
 		query=query,
 		context_value=await get_context(db),
@@ -307,11 +453,10 @@ async def test_mutation_route_update_task(mock_update_entity, mock_auth, db: Asy
 
 @pytest.mark.asyncio
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
-@patch("repository.update_mutation.tasks_repository.update_entity")
-@patch("repository.update_mutation.tasks_repository.get_entity_by_id")
-@patch("repository.update_mutation.user_repository.get_entity_by_id")
+@patch("repository.update_mutation.tasks_repository.update_entity_with_previous")
+@patch("repository.loaders.user_repository.get_entities_by_ids")
 async def test_mutation_route_update_tasks_with_user(
-	mock_get_entity, mock_get_task_entity, mock_update_entity, mock_auth, db: AsyncMock
+	mock_get_entity, mock_update_entity, mock_auth, db: AsyncMock
 ):
 	query = """
 	mutation MyMutation {
@@ -326,26 +471,29 @@ async def test_mutation_route_update_tasks_with_user(
     }
   }
 }"""
-	mock_get_task_entity.return_value = Tasks(**TASK_DATA_MOCK[0])
 	update_tasks = TASK_DATA_MOCK[0].copy()
 	update_tasks["user"] = UUID("eca3933f-b9b8-4a18-b32f-4be052ce58ef")
-	mock_get_entity.return_value = Users(**MOCK_USER)
+	mock_get_entity.return_value = [
+		Users(**{**MOCK_USER, "id": UUID("eca3933f-b9b8-4a18-b32f-4be052ce58ef")})
+	]
 	fm.config.SUPPRESS_SEND = 1
 	fake_task = Tasks(**update_tasks)
-	mock_update_entity.return_value = fake_task
+	mock_update_entity.return_value = (fake_task, Tasks(**TASK_DATA_MOCK[0]))
 	result = await schema.execute(
 		query=query,
 		context_value=await get_context(db),
 	)
 	assert not result.errors, result.errors
 	assert mock_update_entity.called
+	mock_get_entity.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
 @patch("repository.update_mutation.tasks_list_repository.update_entity")
+@patch("repository.loaders.tasks_repository.get_entities_by_ids", return_value=[])
 async def test_mutation_route_update_task_list(
-	mock_update_entity, mock_auth, db: AsyncMock
+	mock_get_tasks, mock_update_entity, mock_auth, db: AsyncMock
 ):
 	query = """
 	mutation MyMutation {
@@ -376,8 +524,9 @@ async def test_mutation_route_update_task_list(
 @patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
 @patch("repository.update_mutation.tasks_list_repository.update_entity")
 @patch("repository.update_mutation.update_task_in_task_list", return_value=None)
+@patch("repository.loaders.tasks_repository.get_entities_by_ids")
 async def test_mutation_route_update_task_list_tasks(
-	mock_update_tasks, mock_update_entity, mock_auth, db: AsyncMock
+	mock_get_tasks, mock_update_tasks, mock_update_entity, mock_auth, db: AsyncMock
 ):
 	query = """
 	mutation MyMutation {
@@ -401,12 +550,47 @@ async def test_mutation_route_update_task_list_tasks(
 	update_tasks["name"] = "Update test"
 	fake_task = TaskList(**update_tasks)
 	mock_update_entity.return_value = fake_task
+	mock_get_tasks.return_value = [
+		Tasks(**{**TASK_DATA_MOCK[0], "task_list_id": MOCK_TASK_LIST["id"]})
+	]
 	result = await schema.execute(
 		query=query,
 		context_value=await get_context(db),
 	)
 	assert not result.errors, result.errors
 	assert mock_update_entity.called
+	tasks = result.data["upadate_mutation"]["list_tasks_update"]["tasks"]
+	assert tasks == [{"id": str(TASK_DATA_MOCK[0]["id"])}]
+
+
+@pytest.mark.asyncio
+@patch("routes.graphql_route.IsAuthenticated.has_permission", return_value=True)
+@patch("repository.update_mutation.tasks_repository.update_entities")
+async def test_mutation_route_update_tasks_where(
+	mock_update_entities, mock_auth, db: AsyncMock
+):
+	query = """
+	mutation MyMutation {
+	upadate_mutation {
+	update_tasks_where(
+		filter: "[[\\"status\\", \\"=\\", \\"active\\"]]",
+		patch: {status: COMPLETED, description: null}
+	) {
+		affected_rows
+		ids
+	}
+	}
+}"""
+
+	mock_update_entities.return_value = [Tasks(**TASK_DATA_MOCK[0])]
+	result = await schema.execute(query=query, context_value=await get_context(db))
+	assert not result.errors, result.errors
+	assert result.data["upadate_mutation"]["update_tasks_where"] == {
+		"affected_rows": 1,
+		"ids": [str(TASK_DATA_MOCK[0]["id"])],
+	}
+	values = mock_update_entities.await_args.kwargs["entity_schema"]
+	assert set(values) == {"status", "description", "updated_at"}
 
 
 # ######################## MUTATIONS #################################
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+import pytest
+
+from models.models import Tasks
+from utils.db.count import CountMode, CountProvider
+
+
+@pytest.mark.asyncio
+async def test_count_exact(db):
+	db.scalar.return_value = 10
+	provider = CountProvider()
+	assert await provider.count(db, Tasks, CountMode.EXACT) == 10
+	assert "count(*)" in str(db.scalar.call_args[0][0])
+
+
+@pytest.mark.asyncio
+async def test_count_estimate(db):
+	db.scalar.return_value = 1_000_000
+	provider = CountProvider()
+	assert await provider.count(db, Tasks, CountMode.ESTIMATE) == 1_000_000
+	assert "reltuples" in str(db.scalar.call_args[0][0])
+	assert db.scalar.call_args[0][1] == {"table": "tasks"}
+
+
+@pytest.mark.asyncio
+async def test_count_estimate_not_analyzed(db):
+	db.scalar.side_effect = [-1, 7]
+	provider = CountProvider()
+	assert await provider.count(db, Tasks, CountMode.ESTIMATE) == 7
+	assert db.scalar.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_count_cached(db):
+	db.scalar.return_value = 10
+	provider = CountProvider(ttl=60)
+	assert await provider.count(db, Tasks, CountMode.CACHED) == 10
+	provider.adjust(Tasks, 2)
+	assert await provider.count(db, Tasks, CountMode.CACHED) == 12
+	provider.adjust(Tasks, -20)
+	assert await provider.count(db, Tasks, CountMode.CACHED) == 0
+	db.scalar.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_count_cached_expired(db):
+	db.scalar.side_effect = [10, 11]
+	provider = CountProvider(ttl=60)
+	with patch("utils.db.count.monotonic", return_value=0):
+		assert await provider.count(db, Tasks, CountMode.CACHED) == 10
+	with patch("utils.db.count.monotonic", return_value=61):
+		assert await provider.count(db, Tasks, CountMode.CACHED) == 11
@@ -0,0 +1,30 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from models.models import Tasks
+from schema.tasks import Status
+from utils.db.cursor import decode_cursor, encode_cursor
+from utils.exceptions import InvalidParameter
+
+TASK_ID = UUID("6aa51c81-b757-4baa-928a-afa23b97e7a5")
+
+
+def test_cursor_round_trip():
+	columns = [Tasks.created_at, Tasks.status, Tasks.id]
+	values = (datetime(2025, 8, 8, tzinfo=UTC), Status.ACTIVE, TASK_ID)
+	cursor = encode_cursor(columns, values)
+	assert decode_cursor(cursor, columns) == values
+
+
+def test_cursor_other_sort():
+	cursor = encode_cursor([Tasks.id], [TASK_ID])
+	with pytest.raises(InvalidParameter):
+		decode_cursor(cursor, [Tasks.created_at, Tasks.id])
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "eyJrIjogWyJpZCJdfQ=="])
+def test_cursor_invalid(cursor: str):
+	with pytest.raises(InvalidParameter):
+		decode_cursor(cursor, [Tasks.id])
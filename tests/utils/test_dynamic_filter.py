@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from models.models import TaskList, Tasks
+from utils.db.dynamic_filter import FilterCache, filter_cache, get_filters
+from utils.exceptions import InvalidParameter
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+	filter_cache.clear()
+	yield
+	filter_cache.clear()
+
+
+def test_get_filters():
+	filter_ = get_filters(
+		json.dumps(
+			[
+				["status", "=", "completed"],
+				["title", "like", "%test%"],
+				["priority", "btw", [1, 3]],
+				["unknown", "=", 1],
+			]
+		),
+		Tasks,
+	)
+
+	assert len(filter_) == 3
+	assert "tasks.status = :status_1" in str(filter_[0])
+	assert "tasks.title LIKE :title_1" in str(filter_[1])
+	assert "tasks.priority BETWEEN" in str(filter_[2])
+
+
+def test_get_filters_trigram():
+	ilike, similar, threshold = get_filters(
+		json.dumps(
+			[
+				["title", "ilike", "%bug%"],
+				["title", "similar", "bug"],
+				["description", "similar", ["bug", 0.5]],
+			]
+		),
+		Tasks,
+	)
+
+	assert str(ilike) == "lower(tasks.title) LIKE lower(:title_1)"
+	assert str(similar) == "tasks.title % :title_1"
+	assert str(threshold) == (
+		"(tasks.description % :description_1) "
+		"AND similarity(tasks.description, :similarity_1) >= :similarity_2"
+	)
+
+
+def test_get_filters_relationships():
+	name, tasks = get_filters(
+		json.dumps(
+			[
+				["tasks.status", "=", "new"],
+				["name", "=", "List"],
+				["tasks.priority", "=", 1],
+				["tasks.unknown", "=", 1],
+			]
+		),
+		TaskList,
+	)
+	(task_list,) = get_filters(json.dumps([["task_list.name", "=", "List"]]), Tasks)
+
+	assert str(name) == "task_list.name = :name_1"
+	# The conditions of the same relationship match the same task.
+	assert str(tasks).split("WHERE ")[1] == (
+		"task_list.id = tasks.task_list_id "
+		"AND tasks.status = :status_1 AND tasks.priority = :priority_1)"
+	)
+	assert str(tasks).startswith("EXISTS (SELECT 1")
+	assert str(task_list).startswith("EXISTS (SELECT 1")
+	assert "task_list.name = :name_1" in str(task_list)
+
+
+def test_get_filters_empty():
+	assert get_filters("", Tasks) == ()
+
+
+def test_get_filters_unknown_column():
+	filters = '[["status", "=", "completed"], ["titel", "=", "x"], ["task_list.nme", "=", "x"]]'
+	assert len(get_filters(filters, Tasks)) == 1
+	with pytest.raises(InvalidParameter, match="titel, task_list.nme"):
+		get_filters(filters, Tasks, strict=True)
+
+
+def test_get_filters_dates():
+	created_at, title = get_filters(
+		json.dumps([["created_at", ">=", "2025-01-01"], ["title", "=", "2025-01-01"]]),
+		Tasks,
+	)
+
+	# Only the strings compared with date columns are converted.
+	assert created_at.right.value == datetime(2025, 1, 1)
+	assert title.right.value == "2025-01-01"
+
+
+def test_get_filters_same_shape_uses_cache():
+	first = get_filters(json.dumps([["status", "=", "new"]]), Tasks)
+	second = get_filters(json.dumps([["status", "=", "completed"]]), Tasks)
+	get_filters(json.dumps([["status", "!=", "new"]]), Tasks)
+
+	assert first[0].right.value == "new"
+	assert second[0].right.value == "completed"
+	assert filter_cache.info() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 256}
+
+
+def test_filter_cache_lru():
+	cache = FilterCache(maxsize=2)
+	status = cache.get(Tasks, (("status", "="),))
+	cache.get(Tasks, (("title", "="),))
+	# status is the most recent one, title is evicted.
+	assert cache.get(Tasks, (("status", "="),)) is status
+	cache.get(Tasks, (("priority", "="),))
+
+	assert cache.info()["size"] == 2
+	cache.get(Tasks, (("title", "="),))
+	assert cache.info()["misses"] == 4
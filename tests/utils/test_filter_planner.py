@@ -0,0 +1,147 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from models.models import TaskList, Tasks
+from settings.filter_settings import FilterPolicy
+from utils.db.dynamic_filter import get_filters
+from utils.db.filter_planner import (
+	Explain,
+	FilterPlanner,
+	indexed_columns,
+	plan_filters,
+	trigram_columns,
+)
+from utils.exceptions import InvalidParameter
+from utils.graphql.extensions import ExplainExtension
+
+UNINDEXED = '[["title", ">", "bug"]]'
+
+
+def test_indexed_columns():
+	# Only the leading column of the composite indexes.
+	assert indexed_columns(Tasks.__table__) == {
+		"id",
+		"task_list_id",
+		"user",
+		"status",
+		"priority",
+		"created_at",
+	}
+	assert indexed_columns(TaskList.__table__) == {"id", "name", "created_at"}
+
+
+def test_trigram_columns():
+	assert trigram_columns(Tasks.__table__) == {"title", "description"}
+	assert trigram_columns(TaskList.__table__) == {"name"}
+
+
+@pytest.mark.parametrize(
+	("filter_", "indexed", "reason"),
+	[
+		('[["status", "=", "new"]]', True, None),
+		('[["created_at", ">=", "2025-01-01"]]', True, None),
+		('[["task_list.name", "in", ["a"]]]', True, None),
+		('[["title", ">", "bug"]]', False, "the column has no index"),
+		('[["status", "!=", "new"]]', False, "the operator can't use an index"),
+		('[["status", "like", "%a"]]', False, "like with a leading wildcard"),
+		# The trigram indexes serve the wildcards on both sides and the similarity.
+		('[["title", "like", "%bug%"]]', True, None),
+		('[["description", "ilike", "%bug"]]', True, None),
+		('[["task_list.name", "similar", "bugs"]]', True, None),
+		('[["status", "similar", "new"]]', False, "the column has no trigram index"),
+		# The EXISTS of a relationship follows the conditions of the related table.
+		('[["task_list.created_at", ">", "2025-01-01"]]', True, None),
+		('[["task_list.name", ">", "a"]]', True, None),
+	],
+)
+def test_plan_filters(filter_, indexed, reason):
+	(plan,) = plan_filters(get_filters(filter_, Tasks))
+	assert plan.indexed is indexed
+	assert plan.reason == reason
+
+
+def test_plan_filters_exists():
+	(plan,) = plan_filters(get_filters('[["tasks.title", ">", "bug"]]', TaskList))
+	assert plan.indexed is False
+	assert plan.column == "title"
+	(plan,) = plan_filters([TaskList.tasks.any()])
+	assert plan.reason == "the condition can't use an index"
+
+
+def test_plan_filters_and_or():
+	indexed_and = sa.and_(Tasks.status == "new", Tasks.title > "bug")
+	unindexed_or = sa.or_(Tasks.status == "new", Tasks.title > "bug")
+
+	assert [plan.indexed for plan in plan_filters([indexed_and, unindexed_or])] == [
+		True,
+		False,
+	]
+
+
+def test_check_allow_and_warn():
+	filter_ = get_filters(UNINDEXED, Tasks)
+	assert FilterPlanner(FilterPolicy.ALLOW).check(filter_) == []
+	(plan,) = FilterPlanner(FilterPolicy.WARN).check(filter_)
+	assert plan.column == "title"
+
+
+def test_check_reject():
+	planner = FilterPlanner(FilterPolicy.REJECT)
+	with pytest.raises(InvalidParameter) as exc:
+		planner.check(get_filters(UNINDEXED, Tasks), limit=10)
+	assert "tasks.title" in str(exc.value)
+	planner.check(get_filters('[["status", "=", "new"]]', Tasks))
+
+
+def test_check_implicit_and():
+	# The top-level conditions are an AND, the same as a nested one.
+	top_level = get_filters('[["status", "=", "new"], ["title", ">", "bug"]]', Tasks)
+	nested = [sa.and_(*top_level)]
+	for policy in (FilterPolicy.REJECT, FilterPolicy.REQUIRE_LIMIT):
+		planner = FilterPlanner(policy)
+		assert [plan.indexed for plan in planner.check(top_level)] == [True, False]
+		assert [plan.indexed for plan in planner.check(nested)] == [True]
+		with pytest.raises(InvalidParameter):
+			planner.check(
+				get_filters('[["title", ">", "bug"], ["title", "<", "fix"]]', Tasks)
+			)
+
+
+def test_check_require_limit():
+	planner = FilterPlanner(FilterPolicy.REQUIRE_LIMIT)
+	planner.check(get_filters(UNINDEXED, Tasks), limit=10)
+	with pytest.raises(InvalidParameter):
+		planner.check(get_filters(UNINDEXED, Tasks))
+
+
+def test_explain_compile():
+	sql = str(
+		Explain(sa.select(Tasks.id).where(Tasks.status == "new")).compile(
+			dialect=postgresql.dialect()
+		)
+	)
+	assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT tasks.id")
+
+
+@pytest.mark.asyncio
+async def test_explain_cost(db):
+	plan = [{"Plan": {"Node Type": "Seq Scan", "Total Cost": 35.5, "Plan Rows": 3}}]
+	db.execute.return_value.scalar_one = MagicMock(return_value=json.dumps(plan))
+
+	cost = await FilterPlanner(explain=True).explain_cost(db, sa.select(Tasks))
+
+	assert cost == {"node_type": "Seq Scan", "total_cost": 35.5, "plan_rows": 3}
+	assert isinstance(db.execute.call_args[0][0], Explain)
+
+
+def test_explain_extension():
+	extension = ExplainExtension()
+	extension.execution_context = MagicMock()
+	extension.execution_context.context.explain = []
+	assert extension.get_results() == {}
+	extension.execution_context.context.explain = [{"field": "tasks"}]
+	assert extension.get_results() == {"explain": [{"field": "tasks"}]}
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from graphql import parse, validate
+from sqlalchemy.dialects import postgresql
+
+from main import schema
+from models.models import Tasks
+from schema.grapql_schemas import PriorityGQLEnum, StatusGQLEnum, TaskFilter
+from schema.tasks import Status
+from utils.graphql.filters import build_where, operators_input, range_input
+
+
+def to_sql(conditions):
+	return [
+		str(c.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+		for c in conditions
+	]
+
+
+def test_operators_input_is_shared():
+	assert operators_input(str) is operators_input(str)
+	assert operators_input(str).__name__ == "StringFilter"
+	assert operators_input(StatusGQLEnum).__name__ == "StatusFilter"
+
+
+def test_build_where_empty():
+	assert build_where(None, Tasks) == ()
+	assert build_where(TaskFilter(), Tasks) == ()
+
+
+def test_build_where():
+	string_filter = operators_input(str)
+	datetime_filter = operators_input(datetime)
+	where = TaskFilter(
+		status=operators_input(StatusGQLEnum)(in_=[StatusGQLEnum.NEW, StatusGQLEnum.ACTIVE]),
+		priority=operators_input(PriorityGQLEnum)(eq=PriorityGQLEnum.HIGH),
+		created_at=datetime_filter(
+			between=range_input(datetime)(start=datetime(2025, 1, 1), end=datetime(2025, 2, 1))
+		),
+		or_=[TaskFilter(title=string_filter(like="a_")), TaskFilter(title=string_filter(eq="b"))],
+		not_=TaskFilter(description=string_filter(eq="x")),
+	)
+
+	status, priority, created_at, or_, not_ = build_where(where, Tasks)
+
+	# The GraphQL enums are converted to the enums of the columns.
+	assert status.right.value == [Status.NEW, Status.ACTIVE]
+	assert "tasks.priority = 'HIGH'" in to_sql([priority])[0]
+	assert "BETWEEN '2025-01-01 00:00:00' AND '2025-02-01 00:00:00'" in to_sql([created_at])[0]
+	assert to_sql([or_])[0] == "tasks.title LIKE 'a_' OR tasks.title = 'b'"
+	assert to_sql([not_])[0] == "tasks.description != 'x'"
+
+
+def test_build_where_trigram():
+	string_filter = operators_input(str)
+	where = TaskFilter(title=string_filter(ilike="%bug%", similar="bugs"))
+
+	assert to_sql(build_where(where, Tasks)) == [
+		"tasks.title ILIKE '%%bug%%'",
+		"tasks.title %% 'bugs'",
+	]
+
+
+def test_where_is_validated():
+	query = "{ tasks(limit: 1, where: %s) { items { id } } }"
+
+	assert not validate(
+		schema._schema,
+		parse(query % '{ status: { in: [NEW] }, or: [{ title: { like: "a%" } }] }'),
+	)
+	# Unknown columns and operators that the type doesn't have are rejected.
+	assert validate(schema._schema, parse(query % "{ nope: { eq: 1 } }"))
+	assert validate(schema._schema, parse(query % '{ status: { like: "n%" } }'))
@@ -0,0 +1,40 @@
+from unittest.mock import patch
+
+from utils.cache.local_cache import LocalCache
+
+
+def test_local_cache_lru_by_bytes():
+	cache = LocalCache(max_bytes=10)
+	cache.set("a", b"1234", ("tasks",))
+	cache.set("b", b"1234", ("tasks",))
+	assert cache.get("a") == b"1234"
+	cache.set("c", b"1234", ("task_list",))
+	assert cache.get("b") is None
+	assert cache.info() == {"hits": 1, "misses": 1, "size": 2, "bytes": 8, "max_bytes": 10}
+	assert not cache.set("big", b"12345678901")
+	assert cache.bytes == 8
+
+
+def test_local_cache_ttl():
+	cache = LocalCache(ttl=60)
+	with patch("utils.cache.local_cache.time.monotonic", return_value=0):
+		cache.set("a", b"1", ("tasks",))
+		cache.set("b", b"1", ("tasks",), ttl=120)
+	with patch("utils.cache.local_cache.time.monotonic", return_value=90):
+		assert cache.get("a") is None
+		assert cache.get("b") == b"1"
+	assert cache.bytes == 1
+
+
+def test_local_cache_invalidate_tags():
+	cache = LocalCache()
+	cache.set("a", b"1", ("tasks",))
+	cache.set("b", b"1", ("tasks", "task_list"))
+	cache.set("c", b"1", ("task_list",))
+	generation = cache.generation
+	assert cache.invalidate_tags(["tasks"]) == 2
+	assert cache.get("a") is None and cache.get("b") is None
+	assert cache.get("c") == b"1"
+	# Read before the invalidation, it could be stale.
+	assert not cache.set("a", b"1", ("tasks",), generation=generation)
+	assert cache.set("a", b"1", ("tasks",), generation=cache.generation)
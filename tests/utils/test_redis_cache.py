@@ -0,0 +1,169 @@
+import asyncio
+import pickle
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+from strawberry.types.nodes import SelectedField
+
+from schema.grapql_schemas import StatusGQLEnum
+from utils.cache.redis_cache import (
+	INVALIDATION_CHANNEL,
+	cache_resolver,
+	generation_keys,
+	invalidate_cache,
+	invalidate_tag,
+	listen_invalidations,
+	local_cache,
+	resolver_cache_key,
+	tags_version,
+)
+from utils.fastapi.observability.metrics import (
+	RESOLVER_CACHE_HITS,
+	RESOLVER_CACHE_INVALIDATIONS,
+	RESOLVER_CACHE_MISSES,
+)
+
+
+def resolver_info(arguments=None, *selections):
+	info = Mock()
+	info.field_name = "tasks"
+	info.selected_fields = [
+		SelectedField(
+			name="tasks",
+			directives={},
+			arguments=arguments or {},
+			selections=[
+				SelectedField(name=name, directives={}, arguments={}, selections=[])
+				for name in selections or ("id",)
+			],
+		)
+	]
+	return info
+
+
+def counter(metric, **labels):
+	return metric.labels(**labels)._value.get()
+
+
+def test_resolver_cache_key():
+	key = resolver_cache_key(resolver_info({"limit": 10, "status": StatusGQLEnum.NEW}))
+	assert key.startswith("resolver:tasks:")
+	assert key == resolver_cache_key(resolver_info({"status": StatusGQLEnum.NEW, "limit": 10}))
+	assert key != resolver_cache_key(resolver_info({"limit": 5, "status": StatusGQLEnum.NEW}))
+	assert key != resolver_cache_key(
+		resolver_info({"limit": 10, "status": StatusGQLEnum.NEW}, "id", "title")
+	)
+
+
+@pytest.mark.asyncio
+async def test_cache_resolver_hit_and_invalidation(fake_redis):
+	resolver = AsyncMock(return_value={"items": [1, 2]})
+	cached = cache_resolver(tags=("tasks",))(resolver)
+	local_hits = counter(RESOLVER_CACHE_HITS, resolver="tasks", tier="local")
+	redis_hits = counter(RESOLVER_CACHE_HITS, resolver="tasks", tier="redis")
+	misses = counter(RESOLVER_CACHE_MISSES, resolver="tasks")
+	invalidations = counter(RESOLVER_CACHE_INVALIDATIONS, tag="tasks")
+
+	info = resolver_info({"limit": 10})
+	assert await cached(info=info) == {"items": [1, 2]}
+	assert await cached(info=info) == {"items": [1, 2]}
+	# Other worker, without the result in its local cache.
+	local_cache.clear()
+	assert await cached(info=info) == {"items": [1, 2]}
+	assert await cached(info=info) == {"items": [1, 2]}
+	resolver.assert_awaited_once()
+	assert (await fake_redis.get(resolver_cache_key(info))).startswith(b"0\n")
+
+	# The result isn't deleted, it belongs to an older generation of the tag.
+	await invalidate_cache("tasks")
+	assert await fake_redis.get("tag:tasks:generation") == b"1"
+	assert local_cache.get(resolver_cache_key(info)) is None
+	await cached(info=info)
+	assert resolver.await_count == 2
+	assert (await fake_redis.get(resolver_cache_key(info))).startswith(b"1\n")
+	assert counter(RESOLVER_CACHE_HITS, resolver="tasks", tier="local") == local_hits + 2
+	assert counter(RESOLVER_CACHE_HITS, resolver="tasks", tier="redis") == redis_hits + 1
+	assert counter(RESOLVER_CACHE_MISSES, resolver="tasks") == misses + 2
+	assert counter(RESOLVER_CACHE_INVALIDATIONS, tag="tasks") == invalidations + 1
+
+
+@pytest.mark.asyncio
+async def test_cache_resolver_invalidated_while_resolving(fake_redis):
+	async def resolver(info):
+		await invalidate_cache("tasks")
+		return [1]
+
+	cached = cache_resolver(tags=("tasks",))(resolver)
+	await cached(info=resolver_info())
+	assert local_cache.info()["size"] == 0
+	# Written with the generation read before the invalidation.
+	assert (await fake_redis.get(resolver_cache_key(resolver_info()))).startswith(b"0\n")
+	assert await cached(info=resolver_info()) == [1]
+	assert await fake_redis.get("tag:tasks:generation") == b"2"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tag(fake_redis):
+	fake_redis.pipeline = Mock(wraps=fake_redis.pipeline)
+	assert await invalidate_tag(("tasks", "task_list"), fake_redis) == [1, 1]
+	assert await invalidate_tag(("tasks",), fake_redis) == [2]
+	fake_redis.pipeline.assert_called_with(transaction=True)
+	assert await fake_redis.mget(*generation_keys(("tasks", "task_list"))) == [b"2", b"1"]
+	assert tags_version([b"2", None]) == b"2.0"
+
+
+@pytest.mark.asyncio
+async def test_listen_invalidations(fake_redis):
+	listener = asyncio.create_task(listen_invalidations())
+	while not fake_redis.subscribers:
+		await asyncio.sleep(0)
+	local_cache.set("resolver:tasks:1", b"tasks", ("tasks",))
+	local_cache.set("resolver:task_list:1", b"lists", ("task_list",))
+	# Published by the invalidate_tag of another worker.
+	await fake_redis.publish(INVALIDATION_CHANNEL, "tasks")
+	await asyncio.sleep(0)
+	listener.cancel()
+	with pytest.raises(asyncio.CancelledError):
+		await listener
+	assert not fake_redis.subscribers
+	assert local_cache.get("resolver:tasks:1") is None
+	assert local_cache.get("resolver:task_list:1") == b"lists"
+
+
+@pytest.mark.asyncio
+async def test_cache_resolver_redis_down(fake_redis):
+	resolver = AsyncMock(return_value=[1])
+	cached = cache_resolver(tags=("tasks",))(resolver)
+	with (
+		patch.object(fake_redis, "mget", side_effect=ConnectionError("down")),
+		patch.object(fake_redis, "pipeline", side_effect=ConnectionError("down")),
+	):
+		assert await cached(info=resolver_info()) == [1]
+		assert await cached(info=resolver_info()) == [1]
+		await invalidate_cache("tasks")
+	assert resolver.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_resolver_disabled(fake_redis):
+	resolver = AsyncMock(return_value=[1])
+	cached = cache_resolver(tags=("tasks",))(resolver)
+	with patch("utils.cache.redis_cache.settings.enabled", False):
+		await cached(info=resolver_info())
+		await cached(info=resolver_info())
+	assert resolver.await_count == 2
+	assert fake_redis.values == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_resolver_never_unpickles(fake_redis):
+	resolver = AsyncMock(return_value=[1])
+	cached = cache_resolver(tags=("tasks",))(resolver)
+	# Written by someone else in Redis, it would run code if it was unpickled.
+	await fake_redis.set(
+		resolver_cache_key(resolver_info()), b"0\n" + pickle.dumps(Mock)
+	)
+	assert await cached(info=resolver_info()) == [1]
+	resolver.assert_awaited_once()
+	assert await fake_redis.get(resolver_cache_key(resolver_info())) == b"0\n[1]"
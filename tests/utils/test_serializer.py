@@ -0,0 +1,76 @@
+import json
+from uuid import uuid4
+
+import pytest
+
+from repository.query import Facet, FacetBucket, PaginationWindow, Queries
+from schema.grapql_schemas import (
+	CountModeGQLEnum,
+	ListTaskType,
+	PriorityGQLEnum,
+	StatusGQLEnum,
+	TasksType,
+)
+from schema.tasks import ListTaskGQLResponse, Status, TaskGQLResponse, Tasks
+from utils.cache.redis_cache import resolver_return_type
+from utils.cache.serializer import dump_result, load_result
+
+
+def test_load_result_tasks_window():
+	task = TaskGQLResponse(
+		id=uuid4(), title="bug", description="fix it", status=Status.ACTIVE
+	)
+	# A projected task only has the selected columns.
+	projected = TaskGQLResponse.model_construct(id=uuid4(), title="release")
+	window = PaginationWindow(
+		items=[task, projected],
+		pagination_items=2,
+		total_items=10,
+		remaining_elements=8,
+		count_mode=CountModeGQLEnum.CACHED,
+		facets=[Facet(column="status", buckets=[FacetBucket(value="ACTIVE", count=1)])],
+	)
+
+	result = load_result(resolver_return_type(Queries.all_tasks), dump_result(window))
+
+	assert isinstance(result, PaginationWindow)
+	assert result.count_mode is CountModeGQLEnum.CACHED
+	assert result.facets[0].buckets[0].count == 1
+	first, second = result.items
+	assert isinstance(first, TasksType)
+	assert (first.id, first.status, first.priority) == (
+		task.id,
+		StatusGQLEnum.ACTIVE,
+		PriorityGQLEnum.LOW,
+	)
+	assert first.created_at == task.created_at
+	assert (second.id, second.title, second.description) == (
+		projected.id,
+		"release",
+		None,
+	)
+
+
+def test_load_result_task_list_window():
+	task_list = ListTaskGQLResponse(
+		id=uuid4(), name=" bugs", tasks=[Tasks(title="bug", description="fix it")]
+	)
+	window = PaginationWindow(
+		items=[task_list], pagination_items=1, total_items=1, remaining_elements=0
+	)
+
+	result = load_result(
+		resolver_return_type(Queries.all_tasks_list), dump_result(window)
+	)
+
+	(item,) = result.items
+	assert isinstance(item, ListTaskType)
+	assert item.id == task_list.id
+	assert item.tasks[0].title == "bug"
+	assert item.tasks[0].status is StatusGQLEnum.NEW
+
+
+def test_dump_result_is_json():
+	assert json.loads(dump_result({"items": [1, 2]})) == {"items": [1, 2]}
+	with pytest.raises(TypeError):
+		dump_result(object())
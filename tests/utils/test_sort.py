@@ -0,0 +1,47 @@
+import pytest
+
+from models.models import Tasks
+from utils.db.sort import SortKey, SortSpec, resolve_sort
+from utils.exceptions import InvalidParameter
+
+
+def test_resolve_sort_direction():
+	assert resolve_sort(Tasks, "desc", sort_columns=[Tasks.created_at]) == [
+		SortKey(Tasks.created_at, True),
+		SortKey(Tasks.id, True),
+	]
+	with pytest.raises(ValueError):
+		resolve_sort(Tasks, "up")  # type: ignore
+
+
+def test_resolve_sort_specs():
+	keys = resolve_sort(
+		Tasks,
+		[SortSpec("priority", "desc", "first"), SortSpec("created_at")],
+		sortable=("priority", "created_at"),
+	)
+
+	# The id follows the direction of the last key.
+	assert keys[-1] == SortKey(Tasks.id, False)
+	assert [str(key.order()) for key in keys] == [
+		"tasks.priority DESC NULLS FIRST",
+		"tasks.created_at ASC",
+		"tasks.id ASC",
+	]
+	# Backwards the directions and the NULLs are inverted.
+	assert str(keys[0].order(reverse=True)) == "tasks.priority ASC NULLS LAST"
+	assert resolve_sort(Tasks, [SortSpec("id", "desc")]) == [SortKey(Tasks.id, True)]
+
+
+@pytest.mark.parametrize(
+	"specs",
+	[
+		[SortSpec("title")],
+		[SortSpec("priority"), SortSpec("priority", "desc")],
+		[SortSpec("priority", "up")],  # type: ignore
+		[SortSpec("priority", nulls="middle")],  # type: ignore
+	],
+)
+def test_resolve_sort_invalid(specs):
+	with pytest.raises(InvalidParameter):
+		resolve_sort(Tasks, specs, sortable=("priority",))